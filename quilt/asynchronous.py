@@ -0,0 +1,146 @@
+import asyncio
+from collections import deque
+from inspect import isawaitable
+from .exc import MatchError
+
+
+def _discard(awaitables):
+    """Closes the coroutines, or cancels the futures, which will never be awaited."""
+    for awaitable in awaitables:
+        close = getattr(awaitable, 'close', None) or getattr(awaitable, 'cancel', None)
+        if close is not None:
+            close()
+
+
+async def _all(awaitables):
+    """Awaits the awaitables concurrently and returns True if every one of them results in a true value. Returns False
+    as soon as one does not, cancelling the rest."""
+    if len(awaitables) == 1:
+        return bool(await awaitables[0])
+
+    pending = set(asyncio.ensure_future(awaitable) for awaitable in awaitables)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.result():
+                    return False
+        return True
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _arguments(iterable):
+    """Yields the argument tuples of an iterable or an asynchronous iterable."""
+    if hasattr(iterable, '__aiter__'):
+        async for args in iterable:
+            yield tuple(args)
+    else:
+        for args in iterable:
+            yield tuple(args)
+
+
+class AsyncProxy(object):
+    """Coroutine function dispatching like the wrapped DefProxy, or ProxyCache bound to an instance, but awaiting
+    anything awaitable along the way.
+
+    A Guard on an argument, typically a PlaceholderGuard bound to an async def, may return an awaitable. The awaitable
+    Guards of a clause are awaited concurrently once all of its other Guards have passed, and the first one failing
+    cancels the others. Guards returning plain values are validated as usual without ever touching the event loop.
+    Awaitables nested within an AndGuard, OrGuard or ReverseGuard are not recognized. The matched function is awaited
+    if it returns an awaitable.
+
+    AsyncProxy should not be constructed on its own, see DefProxy.asynchronous and FunctionProxy.asynchronous.
+
+    :param proxy: The wrapped DefProxy or ProxyCache
+    :param instance: The instance member functions are bound to, defaults to None
+    :param owner: The class member functions are bound to, defaults to None
+    """
+
+    def __init__(self, proxy, instance=None, owner=None):
+        self.proxy = proxy
+        self.instance = instance
+        self.owner = owner
+
+    def __str__(self):
+        return self.__print__(str)
+
+    def __repr__(self):
+        return self.__print__(repr)
+
+    def __print__(self, f):
+        return 'AsyncProxy(proxy=' + f(self.proxy) + ', instance=' + f(self.instance) + ', owner=' + f(self.owner) + ')'
+
+    @property
+    def bound(self):
+        return self.instance is not None or self.owner is not None
+
+    async def match(self, args, kwargs):
+        """Returns the first GuardedFunction which validates the arguments or None if there is none."""
+        for guarded_func in self.proxy.candidates(args, kwargs):
+            if await self._validate(guarded_func, args, kwargs):
+                return guarded_func
+        return None
+
+    async def _validate(self, guarded_func, args, kwargs):
+        instance, owner, bound = self.instance, self.owner, self.bound
+        if not hasattr(guarded_func, 'arg_guards'):
+            if bound:
+                result = guarded_func.validate_instance(instance, owner, *args, **kwargs)
+            else:
+                result = guarded_func.validate(*args, **kwargs)
+            return bool(await result) if isawaitable(result) else bool(result)
+
+        awaitables = []
+        for value, guard in guarded_func.guard_pairs(args, kwargs):
+            result = guard.validate_instance(value, instance, owner) if bound else guard.validate(value)
+            if isawaitable(result):
+                awaitables.append(result)
+            elif not result:
+                _discard(awaitables)
+                return False
+
+        return await _all(awaitables) if awaitables else True
+
+    async def __call__(self, *args, **kwargs):
+        guarded_func = await self.match(args, kwargs)
+        if guarded_func is not None:
+            func = guarded_func.underlying_func
+        elif self.proxy._fallback is not None:
+            func = self.proxy._fallback
+        else:
+            raise MatchError(*args, **kwargs)
+
+        if self.bound:
+            func = func.__get__(self.instance, self.owner)
+        result = func(*args, **kwargs)
+
+        return await result if isawaitable(result) else result
+
+    def map(self, iterable, limit=8):
+        """Returns an asynchronous generator dispatching every argument tuple of the iterable, which may itself be
+        asynchronous, and yielding the results in the same order. At most limit calls are in flight at any time. An
+        exception, a MatchError included, is raised in its turn and cancels the calls still in flight. Raises ValueError
+        straight away if limit is not positive.
+
+        :param iterable: An iterable or asynchronous iterable of positional argument tuples
+        :param limit: The maximum number of concurrent calls
+        """
+        if limit <= 0:
+            raise ValueError('map requires a limit of one or more concurrent calls')
+
+        return self._map(iterable, limit)
+
+    async def _map(self, iterable, limit):
+        in_flight = deque()
+        try:
+            async for args in _arguments(iterable):
+                if len(in_flight) >= limit:
+                    yield await in_flight.popleft()
+                in_flight.append(asyncio.ensure_future(self(*args)))
+            while in_flight:
+                yield await in_flight.popleft()
+        finally:
+            for task in in_flight:
+                task.cancel()
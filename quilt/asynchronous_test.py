@@ -0,0 +1,154 @@
+import asyncio
+from unittest import TestCase
+from quilt.guard import *
+from quilt.proxy import defpattern, pattern
+from quilt.exc import MatchError
+
+
+def _run(awaitable):
+    return asyncio.run(asyncio.wait_for(awaitable, 1))
+
+
+class TestAsyncDef(TestCase):
+    def test_sync(self):
+        @defpattern(lt(0))
+        def foo(x):
+            return 'negative'
+
+        @foo.pattern(gte(0))
+        async def foo(x):
+            return 'positive'
+
+        handler = foo.asynchronous()
+        self.assertEquals(_run(handler(-1)), 'negative')
+        self.assertEquals(_run(handler(1)), 'positive')
+        self.assertRaises(MatchError, lambda: _run(handler('a')))
+
+    def test_fallback(self):
+        @defpattern(0)
+        def foo(x):
+            return 'zero'
+
+        @foo.fallback
+        async def foo(x):
+            return 'other'
+
+        self.assertEquals(_run(foo.asynchronous()(1)), 'other')
+
+    def test_awaitable_guard(self):
+        @defpattern(1)
+        def foo(x, y):
+            return 'flagged'
+
+        @foo.y
+        async def enabled(value):
+            await asyncio.sleep(0)
+            return value == 'on'
+
+        @foo.pattern(1)
+        def foo(x, y):
+            return 'default'
+
+        handler = foo.asynchronous()
+        self.assertEquals(_run(handler(1, 'on')), 'flagged')
+        self.assertEquals(_run(handler(1, y='off')), 'default')
+
+    def test_concurrent_guards(self):
+        @defpattern()
+        def foo(x, y):
+            return 'both'
+
+        async def run():
+            ready = asyncio.Event()
+
+            @foo.x
+            async def first(value):
+                await ready.wait()
+                return True
+
+            @foo.y
+            async def second(value):
+                ready.set()
+                return True
+
+            return await foo.asynchronous()(1, 2)
+
+        self.assertEquals(_run(run()), 'both')
+
+    def test_failure_cancels(self):
+        cancelled = []
+
+        @defpattern()
+        def foo(x, y):
+            return 'matched'
+
+        @foo.x
+        async def slow(value):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(value)
+                raise
+
+        @foo.y
+        async def fails(value):
+            await asyncio.sleep(0)
+            return False
+
+        self.assertRaises(MatchError, lambda: _run(foo.asynchronous()(1, 2)))
+        self.assertEquals(cancelled, [1])
+
+    def test_map(self):
+        in_flight = []
+
+        @defpattern(lt(0))
+        async def foo(x):
+            return 'negative'
+
+        @foo.pattern(gte(0))
+        async def foo(x):
+            in_flight.append(x)
+            await asyncio.sleep(0.01 * (5 - x))
+            result = (x, len(in_flight))
+            in_flight.remove(x)
+            return result
+
+        async def collect():
+            return [result async for result in foo.asynchronous().map([(x,) for x in range(5)] + [(-1,)], limit=2)]
+
+        results = _run(collect())
+        self.assertEquals([x for x, _ in results[:-1]], list(range(5)))
+        self.assertTrue(all(count <= 2 for _, count in results[:-1]))
+        self.assertEquals(results[-1], 'negative')
+
+    def test_map_limit(self):
+        @defpattern(gte(0))
+        async def foo(x):
+            return x
+
+        self.assertRaises(ValueError, lambda: foo.asynchronous().map([(1,)], limit=0))
+        self.assertRaises(ValueError, lambda: foo.asynchronous().map([(1,)], limit=-1))
+
+
+class Flags(object):
+    def __init__(self, flags):
+        self.flags = flags
+
+    @pattern()
+    def handle(self, name):
+        return 'enabled'
+
+    @handle.name
+    async def enabled(self, value):
+        await asyncio.sleep(0)
+        return value in self.flags
+
+    @handle.pattern()
+    def handle(self, name):
+        return 'disabled'
+
+
+class TestAsyncMember(TestCase):
+    def test_bound(self):
+        self.assertEquals(_run(Flags({'a'}).handle.asynchronous()('a')), 'enabled')
+        self.assertEquals(_run(Flags({'a'}).handle.asynchronous()('b')), 'disabled')
@@ -0,0 +1,78 @@
+"""Benchmarks for Quilt. Every module of this package exposes a run function returning a list of Result. Run all of
+them with ``python -m quilt.bench``, see ``python -m quilt.bench --help`` for saving and comparing runs as JSON."""
+import json
+from collections import namedtuple
+from timeit import Timer
+
+
+Result = namedtuple('Result', ['name', 'value', 'unit', 'baseline'])
+
+
+def measure(func, repeat=5):
+    """Returns the best time in seconds of a single call to the zero argument callable."""
+    timer = Timer(func)
+    number, _ = timer.autorange()
+
+    return min(timer.repeat(repeat, number)) / number
+
+
+def timed(name, seconds, baseline=None):
+    """Returns the Result of a timing, optionally along with the timing of a hand-written equivalent."""
+    return Result(name, seconds, 's', baseline)
+
+
+def sized(name, size):
+    """Returns the Result of a memory footprint in bytes."""
+    return Result(name, size, 'B', None)
+
+
+def ratio(name, value, baseline):
+    """Returns the Result of the ratio of two timings, such as that of a pattern method to a plain bound method."""
+    return Result(name, value / baseline, 'x', None)
+
+
+def _format(value, unit):
+    if unit == 's':
+        return format(value * 1e9, '12.1f') + ' ns'
+    elif unit == 'x':
+        return format(value, '12.2f') + ' x '
+    return format(value, '12.1f') + ' B '
+
+
+def report(title, results, previous=None):
+    """Prints a table of Result, along with the ratio to their baseline and to the value of the same name in a previous
+    run.
+
+    :param title: The name of the benchmark module
+    :param results: The list of Result
+    :param previous: A dict of values of a previous run by name, defaults to None
+    """
+    print(title)
+    width = max(len(result.name) for result in results)
+    for result in results:
+        line = '  ' + result.name.ljust(width) + '  ' + _format(result.value, result.unit)
+        if result.baseline:
+            line += '  ' + format(result.value / result.baseline, '7.2f') + 'x baseline'
+        if previous and previous.get(result.name):
+            line += '  ' + format(result.value / previous[result.name], '7.2f') + 'x previous'
+        print(line)
+
+
+def save(path, suites):
+    """Writes the results of every benchmark module to a JSON file.
+
+    :param path: The path of the JSON file
+    :param suites: A dict of lists of Result by name of benchmark module
+    """
+    with open(path, 'w') as f:
+        json.dump(dict((title, [result._asdict() for result in results]) for title, results in suites.items()), f,
+                  indent=2, sort_keys=True)
+
+
+def load(path):
+    """Reads a JSON file written by save and returns a dict of dicts of values by name, by name of benchmark module."""
+    with open(path) as f:
+        suites = json.load(f)
+
+    return dict((title, dict((result['name'], result['value']) for result in results))
+                for title, results in suites.items())
@@ -0,0 +1,32 @@
+from argparse import ArgumentParser
+from . import report, save, load, methods, dispatch, guards, memory, startup
+
+
+benchmarks = {
+    'methods': lambda: methods.run(options.repeat),
+    'dispatch': lambda: dispatch.run(sizes, options.repeat),
+    'guards': lambda: guards.run(options.repeat),
+    'memory': lambda: memory.run(sizes),
+    'startup': lambda: startup.run(sizes, options.repeat),
+}
+
+parser = ArgumentParser(prog='python -m quilt.bench', description='Runs the Quilt benchmarks.')
+parser.add_argument('suites', nargs='*', choices=sorted(benchmarks) + ['all'], default='all',
+                    help='the benchmarks to run, defaults to all of them')
+parser.add_argument('--sizes', default=','.join(map(str, dispatch.SIZES)),
+                    help='comma separated numbers of clauses, defaults to %(default)s')
+parser.add_argument('--repeat', type=int, default=5, help='timings taken of each benchmark, the best is kept')
+parser.add_argument('--save', metavar='PATH', help='writes the results to a JSON file')
+parser.add_argument('--compare', metavar='PATH', help='compares the results to those of a JSON file written by --save')
+options = parser.parse_args()
+
+sizes = [int(size) for size in options.sizes.split(',')]
+previous = load(options.compare) if options.compare else {}
+
+suites = {}
+for title in list(benchmarks) if 'all' in options.suites else options.suites:
+    suites[title] = benchmarks[title]()
+    report(title, suites[title], previous.get(title))
+
+if options.save:
+    save(options.save, suites)
@@ -0,0 +1,159 @@
+"""Times dispatch through defpattern, pattern methods and a pattern __init__ with many clauses, hitting the first
+clause, hitting the last clause and matching nothing, each against a hand-written chain of if statements. Also times
+small dispatchers of one to three comparisons, too few clauses to be indexed."""
+from . import measure, report, timed
+from ..proxy import defpattern, pattern
+from ..guard import lt, ge, gt
+from ..exc import MatchError
+
+
+SIZES = (1, 10, 100, 1000, 10000)
+
+
+def _function(i):
+    def clause(x):
+        return i
+    return clause
+
+
+def _method(i):
+    def clause(self, x):
+        return i
+    return clause
+
+
+def _constructor(i):
+    def __init__(self, x):
+        self.x = i
+    return __init__
+
+
+def build(n, decorator, clause):
+    """Returns a proxy of n clauses, clause i matching the value i."""
+    proxy = decorator(0)(clause(0))
+    for i in range(1, n):
+        proxy.pattern(i)(clause(i))
+
+    return proxy
+
+
+def build_function(n):
+    return build(n, defpattern, _function)
+
+
+def build_methods(n):
+    return type('Methods', (object,), {'method': build(n, pattern, _method)})
+
+
+def build_constructors(n):
+    return type('Constructors', (object,), {'__init__': build(n, pattern, _constructor)})
+
+
+def _baseline(n, arguments, body):
+    """Compiles a function testing each of the n values in turn. A flat run of if statements stands in for if/elif,
+    which the compiler can not nest 10000 deep."""
+    lines = ['def baseline(' + arguments + '):']
+    for i in range(n):
+        lines.append('    if x == ' + str(i) + ':')
+        lines.extend('        ' + line.format(i) for line in body)
+    lines.append('    raise MatchError(x)')
+    namespace = {'MatchError': MatchError}
+    exec('\n'.join(lines), namespace)
+
+    return namespace['baseline']
+
+
+def baseline_function(n):
+    return _baseline(n, 'x', ['return {0}'])
+
+
+def baseline_methods(n):
+    return type('Methods', (object,), {'method': _baseline(n, 'self, x', ['return {0}'])})
+
+
+def baseline_constructors(n):
+    return type('Constructors', (object,), {'__init__': _baseline(n, 'self, x', ['self.x = {0}', 'return'])})
+
+
+def _missing(func, x):
+    def call():
+        try:
+            func(x)
+        except MatchError:
+            pass
+    return call
+
+
+def _cases(n, func):
+    return [('first', lambda: func(0)), ('last', lambda: func(n - 1)), ('miss', _missing(func, -1))]
+
+
+def small():
+    """Returns the list of (name, DefProxy, baseline, value) of the small dispatchers, each called with the value."""
+    @defpattern(1)
+    def value(x):
+        return 'one'
+
+    def baseline_value(x):
+        if x == 1:
+            return 'one'
+        raise MatchError(x)
+
+    @defpattern(gt(0))
+    def positive(x):
+        return 'positive'
+
+    def baseline_positive(x):
+        if x > 0:
+            return 'positive'
+        raise MatchError(x)
+
+    @defpattern(lt(0))
+    def tiers(x):
+        return 'negative'
+
+    @tiers.pattern(lt(10))
+    def tiers(x):
+        return 'small'
+
+    @tiers.pattern(ge(10))
+    def tiers(x):
+        return 'large'
+
+    def baseline_tiers(x):
+        if x < 0:
+            return 'negative'
+        elif x < 10:
+            return 'small'
+        elif x >= 10:
+            return 'large'
+        raise MatchError(x)
+
+    return [
+        ('defpattern, one ValueGuard', value, baseline_value, 1),
+        ('defpattern, one gt', positive, baseline_positive, 1),
+        ('defpattern, 3 tiers, first', tiers, baseline_tiers, -1),
+        ('defpattern, 3 tiers, last', tiers, baseline_tiers, 10),
+    ]
+
+
+def run(sizes=SIZES, repeat=5):
+    results = []
+    for n in sizes:
+        kinds = [
+            ('defpattern', build_function(n), baseline_function(n)),
+            ('pattern method', build_methods(n)().method, baseline_methods(n)().method),
+            ('pattern __init__', build_constructors(n), baseline_constructors(n)),
+        ]
+        for kind, func, baseline in kinds:
+            for (case, call), (_, plain) in zip(_cases(n, func), _cases(n, baseline)):
+                name = kind + ', ' + str(n) + ' clauses, ' + case
+                results.append(timed(name, measure(call, repeat), measure(plain, repeat)))
+    for name, func, baseline, x in small():
+        results.append(timed(name, measure(lambda: func(x), repeat), measure(lambda: baseline(x), repeat)))
+
+    return results
+
+
+if __name__ == '__main__':
+    report('dispatch', run())
@@ -0,0 +1,70 @@
+"""Times the validation of a single passing value by every Guard, against the equivalent hand-written expression."""
+import operator
+import re
+from . import measure, report, timed
+from ..guard import *
+
+
+class Point(object):
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def _bound(value):
+    return value > 0
+
+
+def guards():
+    """Returns the list of (name, Guard, value, baseline) where baseline is a function of the value validating it the
+    way the Guard does."""
+    word = re.compile('qu+ilt')
+    bound = PlaceholderGuard()
+    bound(_bound)
+
+    return [
+        ('ValueGuard', ValueGuard(1), 1, lambda v: v == 1),
+        ('lt', lt(10), 1, lambda v: v < 10),
+        ('lte', lte(10), 1, lambda v: v <= 10),
+        ('gt', gt(0), 1, lambda v: v > 0),
+        ('gte', gte(0), 1, lambda v: v >= 0),
+        ('not_equal_to', not_equal_to(2), 1, lambda v: v != 2),
+        ('one_of', one_of(1, 2, 3), 1, lambda v: v in (1, 2, 3)),
+        ('not_one_of', not_one_of(4, 5, 6), 1, lambda v: v not in (4, 5, 6)),
+        ('contains', contains(1, 2), [1, 2, 3], lambda v: 1 in v and 2 in v),
+        ('not_contains', not_contains(4), [1, 2, 3], lambda v: 4 not in v),
+        ('has_n_of', has_n_of(2, 1, 2, 4), [1, 2, 3], lambda v: sum(x in v for x in (1, 2, 4)) >= 2),
+        ('has_length', has_length(3), [1, 2, 3], lambda v: len(v) == 3),
+        ('longer_than', longer_than(2), [1, 2, 3], lambda v: len(v) > 2),
+        ('shorter_than', shorter_than(4), [1, 2, 3], lambda v: len(v) < 4),
+        ('not_longer_than', not_longer_than(3), [1, 2, 3], lambda v: len(v) <= 3),
+        ('not_shorter_than', not_shorter_than(3), [1, 2, 3], lambda v: len(v) >= 3),
+        ('empty', empty(), [], lambda v: len(v) == 0),
+        ('not_empty', not_empty(), [1], lambda v: len(v) > 0),
+        ('type_of', type_of(int), 1, lambda v: isinstance(v, int)),
+        ('close_to', close_to(1.0, 0.01), 1.001, lambda v: 0.99 < v < 1.01),
+        ('not_none', not_none(), 1, lambda v: v is not None),
+        ('regex', regex('qu+ilt'), 'quuilt', lambda v: word.match(v) is not None),
+        ('begins_with', begins_with('qu'), 'quilt', lambda v: v.startswith('qu')),
+        ('ends_with', ends_with('lt'), 'quilt', lambda v: v.endswith('lt')),
+        ('has_attribute', has_attribute('x'), Point(1, 2), lambda v: hasattr(v, 'x')),
+        ('PatternGuard', PatternGuard([ValueGuard(1, arg_name='x'), OperatorGuard(operator.gt, 0, arg_name='y')]),
+         Point(1, 2), lambda v: v.x == 1 and v.y > 0),
+        ('AndGuard', gt(0).and_(lt(10)), 1, lambda v: v > 0 and v < 10),
+        ('OrGuard', lt(0).or_(gt(0)), 1, lambda v: v < 0 or v > 0),
+        ('PlaceholderGuard, unbound', PlaceholderGuard(), 1, lambda v: True),
+        ('PlaceholderGuard, bound', bound, 1, _bound),
+    ]
+
+
+def run(repeat=5):
+    results = []
+    for name, guard, value, baseline in guards():
+        validate = guard.validate
+        results.append(timed(name, measure(lambda: validate(value), repeat), measure(lambda: baseline(value), repeat)))
+
+    return results
+
+
+if __name__ == '__main__':
+    report('guards', run())
@@ -0,0 +1,43 @@
+"""Measures the time taken to declare proxies of many clauses and the memory each clause takes, with tracemalloc."""
+import tracemalloc
+from time import perf_counter
+from . import report, timed, sized
+from .dispatch import SIZES, build_function, build_methods, build_constructors
+
+
+def _decoration(build, n):
+    """Returns the seconds per clause taken to build a proxy of n clauses."""
+    start = perf_counter()
+    build(n)
+
+    return (perf_counter() - start) / n
+
+
+def _footprint(build, n):
+    """Returns the bytes per clause allocated, and still held, by a proxy of n clauses."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        proxy = build(n)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del proxy
+
+    return float(after - before) / n
+
+
+def run(sizes=SIZES):
+    results = []
+    for n in sizes:
+        for kind, build in [('defpattern', build_function), ('pattern method', build_methods),
+                            ('pattern __init__', build_constructors)]:
+            name = kind + ', ' + str(n) + ' clauses, '
+            results.append(timed(name + 'decoration per clause', _decoration(build, n)))
+            results.append(sized(name + 'memory per clause', _footprint(build, n)))
+
+    return results
+
+
+if __name__ == '__main__':
+    report('memory', run())
@@ -0,0 +1,63 @@
+"""Compares method calls on classes using pattern against plain bound methods, reporting how many times the cost of a
+plain bound method each pattern method costs."""
+from . import measure, report, timed, ratio
+from ..proxy import pattern
+from ..guard import lt, gt
+
+
+class Plain(object):
+    def __init__(self, x=0):
+        self.x = x
+
+    def method(self, x):
+        return x
+
+
+class Patterned(object):
+    @pattern(x=0)
+    def __init__(self, x=0):
+        self.x = x
+
+    @__init__.pattern(x=gt(0))
+    def __init__(self, x=0):
+        self.x = x
+
+    @pattern()
+    def method(self, x):
+        return x
+
+    @pattern(lt(0))
+    def last(self, x):
+        return -x
+
+    @last.pattern(0)
+    def last(self, x):
+        return 0
+
+    @last.pattern(gt(0))
+    def last(self, x):
+        return x
+
+
+def run(repeat=5):
+    plain = Plain()
+    patterned = Patterned()
+    method = measure(lambda: plain.method(1), repeat)
+    init = measure(lambda: Plain(1), repeat)
+    one = measure(lambda: patterned.method(1), repeat)
+    third = measure(lambda: patterned.last(1), repeat)
+
+    return [
+        timed('plain bound method', method),
+        timed('pattern, one clause', one, method),
+        timed('pattern, third clause', third, method),
+        timed('attribute access only', measure(lambda: patterned.method, repeat)),
+        timed('plain __init__', init),
+        timed('pattern __init__, second clause', measure(lambda: Patterned(1), repeat), init),
+        ratio('pattern, one clause to plain bound method', one, method),
+        ratio('pattern, third clause to plain bound method', third, method),
+    ]
+
+
+if __name__ == '__main__':
+    report('methods', run())
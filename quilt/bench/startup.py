@@ -0,0 +1,70 @@
+"""Times importing a module declaring many patterned clauses, and the first call finalizing them, in fresh
+interpreters, against a module declaring the same number of plain functions."""
+import os
+import shutil
+import subprocess
+import sys
+from tempfile import mkdtemp
+from . import report, timed
+from .dispatch import SIZES
+
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_TIMER = '''
+from time import perf_counter
+start = perf_counter()
+import {module}
+imported = perf_counter()
+{call}
+print(imported - start, perf_counter() - imported)
+'''
+
+
+def _patterned(n):
+    lines = ['from quilt.proxy import defpattern', '', '', '@defpattern(0)', 'def foo(x):', '    return 0']
+    for i in range(1, n):
+        lines.extend(['', '', '@foo.pattern(' + str(i) + ')', 'def foo(x):', '    return ' + str(i)])
+    return '\n'.join(lines) + '\n'
+
+
+def _plain(n):
+    lines = []
+    for i in range(n):
+        lines.extend(['def foo_' + str(i) + '(x):', '    return ' + str(i), '', ''])
+    return '\n'.join(lines) + '\n'
+
+
+def _time(directory, module, call, repeat):
+    """Returns the best (import, first call) seconds of importing the module in a fresh interpreter."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([directory, _ROOT]), PYTHONDONTWRITEBYTECODE='1')
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c', _TIMER.format(module=module, call=call)], env=env)
+        runs.append(tuple(float(value) for value in output.split()))
+    return min(runs)
+
+
+def run(sizes=SIZES, repeat=5):
+    directory = mkdtemp()
+    try:
+        results = []
+        for n in sizes:
+            patterned, plain = 'patterned_' + str(n), 'plain_' + str(n)
+            with open(os.path.join(directory, patterned + '.py'), 'w') as f:
+                f.write(_patterned(n))
+            with open(os.path.join(directory, plain + '.py'), 'w') as f:
+                f.write(_plain(n))
+
+            imported, called = _time(directory, patterned, patterned + '.foo(' + str(n - 1) + ')', repeat)
+            baseline, _ = _time(directory, plain, plain + '.foo_0(0)', repeat)
+            name = 'defpattern, ' + str(n) + ' clauses, '
+            results.append(timed(name + 'import', imported, baseline))
+            results.append(timed(name + 'first call', called))
+        return results
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    report('startup', run())
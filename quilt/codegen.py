@@ -0,0 +1,174 @@
+import linecache
+import operator
+from itertools import count
+from .exc import MatchError
+from .guard import ReverseGuard, AndGuard, OrGuard, OperatorGuard, ValueGuard, OneOfGuard, LengthGuard, TypeOfGuard, \
+    NotNoneGuard, BeginsWithGuard, EndsWithGuard, HasAttributeGuard, PlaceholderGuard
+
+
+_OPERATORS = {
+    operator.lt: '<',
+    operator.le: '<=',
+    operator.gt: '>',
+    operator.ge: '>=',
+    operator.eq: '==',
+    operator.ne: '!=',
+}
+
+_compiled_ids = count()
+
+
+class _Source(object):
+    """Accumulates the lines and the namespace of the generated dispatch function."""
+
+    def __init__(self):
+        self.lines = []
+        self.namespace = {'MatchError': MatchError}
+        self.names = {}
+        self.delegated = 0
+
+    def constant(self, prefix, value):
+        """Returns the name under which the value is found in the namespace, adding it if needed."""
+        key = (prefix, id(value))
+        if key not in self.names:
+            self.names[key] = prefix + str(len(self.namespace))
+            self.namespace[self.names[key]] = value
+
+        return self.names[key]
+
+    def emit(self, line, indent=1):
+        self.lines.append('    ' * indent + line)
+
+    def guard(self, guard, value):
+        """Returns a Python expression validating the value expression against the Guard or None if the Guard always
+        validates.
+
+        Guards are matched on their exact type. Subclasses may redefine validate. Anything not recognized is called
+        through its validate method, which is counted in delegated.
+        """
+        guard_type = type(guard)
+        if guard_type is PlaceholderGuard:
+            if guard.wrapped_func is None:
+                return None
+        elif guard_type is ReverseGuard:
+            inner = self.guard(guard.inner, value)
+            return 'False' if inner is None else '(not ' + inner + ')'
+        elif guard_type is AndGuard:
+            first, second = self.guard(guard.first, value), self.guard(guard.second, value)
+            if first is None or second is None:
+                return first if second is None else second
+            return '(' + first + ' and ' + second + ')'
+        elif guard_type is OrGuard:
+            first, second = self.guard(guard.first, value), self.guard(guard.second, value)
+            if first is None or second is None:
+                return None
+            return '(' + first + ' or ' + second + ')'
+        elif guard_type is ValueGuard:
+            return '(' + self.constant('value', guard.value) + ' == ' + value + ')'
+        elif guard_type is OperatorGuard and guard.op in _OPERATORS:
+            return '(' + value + ' ' + _OPERATORS[guard.op] + ' ' + self.constant('value', guard.value) + ')'
+        elif guard_type is LengthGuard and guard.op in _OPERATORS:
+            return '(len(' + value + ') ' + _OPERATORS[guard.op] + ' ' + self.constant('length', guard.length) + ')'
+        elif guard_type is OneOfGuard:
+            values = guard.iterable if guard.values is None else guard.values
+            return '(' + value + ' in ' + self.constant('values', values) + ')'
+        elif guard_type is TypeOfGuard:
+            return 'isinstance(' + value + ', ' + self.constant('type', guard.obj_type) + ')'
+        elif guard_type is NotNoneGuard:
+            return '(' + value + ' is not None)'
+        elif guard_type is BeginsWithGuard:
+            return value + '.startswith(' + self.constant('phrase', guard.phrase) + ')'
+        elif guard_type is EndsWithGuard:
+            return value + '.endswith(' + self.constant('phrase', guard.phrase) + ')'
+        elif guard_type is HasAttributeGuard:
+            return 'hasattr(' + value + ', ' + self.constant('attr', guard.attr) + ')'
+
+        self.delegated += 1
+        return self.constant('guard', guard) + '.validate(' + value + ')'
+
+    def step(self, guard, value, skip):
+        """Returns the (test, retry) pair of Python expressions validating the value expression against the Guard,
+        unless the skip expression holds, or None if the Guard always validates. The retry validates the value through
+        the Guard itself should the test raise TypeError or AttributeError. Guards calling any validate method are never
+        inlined, and have no retry, so that nothing they call is ever called twice."""
+        delegated = self.delegated
+        test = self.guard(guard, value)
+        if test is None:
+            return None
+
+        retry = self.constant('guard', guard) + '.validate(' + value + ')'
+        if self.delegated != delegated:
+            return '(' + skip + ' or ' + retry + ')', None
+        return '(' + skip + ' or ' + test + ')', retry
+
+    def clause(self, clause):
+        """Returns the list of (test, retry) pairs validating the call arguments against each Guard of the clause in
+        turn, in the order GuardedFunction.validate does, see step."""
+        if not hasattr(clause, 'arg_guards'):
+            return [(self.constant('clause', clause) + '.validate(*args, **kwargs)', None)]
+
+        steps = []
+        for i, guard in enumerate(clause.arg_guards):
+            steps.append(self.step(guard, 'args[' + str(i) + ']', 'n <= ' + str(i)))
+        for name, guard in clause.kwarg_guards.items():
+            key = self.constant('name', name)
+            steps.append(self.step(guard, 'kwargs[' + key + ']', 'not kwargs or ' + key + ' not in kwargs'))
+
+        return [step for step in steps if step is not None]
+
+
+def compile_clauses(clauses, name='dispatch', fallback=None):
+    """Generates a single dispatch function for an ordered collection of GuardedFunction.
+
+    The Guards of every clause are inlined as straight-line comparisons, Guards that always validate are dropped and
+    the first clause whose Guards validate is called. The Guards are validated one at a time in the order of a
+    DefProxy. Should an inlined comparison raise TypeError or AttributeError, which some Guards report as a failed
+    validation, that Guard alone is validated again through its own validate method. Guards which call into any
+    validate method, such as a bound PlaceholderGuard, are called through their own validate method and never inlined,
+    so that they are called exactly as many times as by a DefProxy.
+
+    The generated function is a snapshot of the clauses. Clauses appended afterwards and PlaceholderGuard that were
+    unbound at the time are not seen by it.
+
+    :param clauses: An ordered collection of GuardedFunction
+    :param name: The name given to the generated function
+    :param fallback: The function called when no clause matches instead of raising a MatchError, defaults to None
+    """
+    source = _Source()
+    source.lines.append('def dispatch(*args, **kwargs):')
+    source.emit('n = len(args)')
+    for clause in clauses:
+        steps = source.clause(clause)
+        func = source.constant('func', clause.underlying_func)
+        if not steps:
+            source.emit('return ' + func + '(*args, **kwargs)')
+            break
+        indent = 1
+        for test, retry in steps:
+            if retry is None:
+                source.emit('matched = ' + test, indent)
+            else:
+                source.emit('try:', indent)
+                source.emit('matched = ' + test, indent + 1)
+                source.emit('except (TypeError, AttributeError):', indent)
+                source.emit('matched = ' + retry, indent + 1)
+            source.emit('if matched:', indent)
+            indent += 1
+        source.emit('return ' + func + '(*args, **kwargs)', indent)
+    else:
+        if fallback is None:
+            source.emit('raise MatchError(*args, **kwargs)')
+        else:
+            source.emit('return ' + source.constant('fallback', fallback) + '(*args, **kwargs)')
+
+    text = '\n'.join(source.lines) + '\n'
+    filename = '<quilt compiled ' + name + ' ' + str(next(_compiled_ids)) + '>'
+    exec(compile(text, filename, 'exec'), source.namespace)
+    linecache.cache[filename] = (len(text), None, text.splitlines(True), filename)
+
+    dispatch = source.namespace['dispatch']
+    dispatch.__name__ = name
+    dispatch.__qualname__ = name
+    dispatch.__source__ = text
+
+    return dispatch
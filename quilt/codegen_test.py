@@ -0,0 +1,178 @@
+from unittest import TestCase
+from quilt.guard import *
+from quilt.codegen import compile_clauses
+from quilt.proxy import defpattern
+from quilt.exc import MatchError
+
+
+def _outcome(f, *args, **kwargs):
+    try:
+        return f(*args, **kwargs)
+    except Exception as e:
+        return type(e)
+
+
+class TestCompile(TestCase):
+    def setUp(self):
+        @defpattern(lt(0))
+        def foo(x, y):
+            return 'negative'
+
+        @foo.pattern(0, y=not_none())
+        def foo(x, y):
+            return 'zero'
+
+        @foo.pattern(one_of(1, 2), has_length(2))
+        def foo(x, y):
+            return 'pair'
+
+        @foo.pattern(type_of(str), begins_with('a').or_(ends_with('z')))
+        def foo(x, y):
+            return 'string'
+
+        @foo.pattern(gte(10).and_(ne(11)))
+        def foo(x, y):
+            return 'large'
+
+        @foo.pattern(close_to(5.0, 0.5))
+        def foo(x, y):
+            return 'about five'
+
+        self.foo = foo
+        self.compiled = foo.compile()
+
+    def tearDown(self):
+        self.foo = None
+        self.compiled = None
+
+    def test_name(self):
+        self.assertEquals(self.compiled.__name__, 'foo')
+
+    def test_same_outcome(self):
+        values = [-1, 0, 1, 2, 5.2, 10, 11, 12, 'a', 'abc', 'xyz', 'q', None, [1, 2], (1,), object()]
+        for x in values:
+            for y in values:
+                self.assertEquals(_outcome(self.compiled, x, y), _outcome(self.foo, x, y))
+                self.assertEquals(_outcome(self.compiled, x, y=y), _outcome(self.foo, x, y=y))
+                self.assertEquals(_outcome(self.compiled, x=x, y=y), _outcome(self.foo, x=x, y=y))
+
+    def test_miss(self):
+        self.assertRaises(MatchError, lambda: self.compiled(3, None))
+
+    def test_snapshot(self):
+        @self.foo.pattern(3)
+        def foo(x, y):
+            return 'three'
+
+        self.assertEquals(self.foo(3, None), 'three')
+        self.assertRaises(MatchError, lambda: self.compiled(3, None))
+        self.assertEquals(self.foo.compile()(3, None), 'three')
+
+
+class TestDifferential(TestCase):
+    def test_same_outcome(self):
+        @defpattern(regex('a+'))
+        def foo(x):
+            return 'regex'
+
+        @foo.pattern(begins_with('b'))
+        def foo(x):
+            return 'prefix'
+
+        @foo.pattern(has_length(3))
+        def foo(x):
+            return 'three long'
+
+        @foo.pattern(gt(5).or_(one_of(None, 0)))
+        def foo(x):
+            return 'large'
+
+        @foo.pattern(not_none())
+        def foo(x):
+            return 'anything'
+
+        compiled = foo.compile()
+        for x in ['aa', 'ba', 'xyz', 'x', b'aa', b'b', 7, 4, None, 0, [1, 2, 3], (1,), object()]:
+            self.assertEquals(_outcome(compiled, x), _outcome(foo, x))
+            self.assertEquals(_outcome(compiled, x=x), _outcome(foo, x=x))
+
+    def test_exceptions(self):
+        @defpattern(regex('a'), gt(0))
+        def foo(x, y):
+            return 'first'
+
+        @foo.pattern(not_none(), lt(0))
+        def foo(x, y):
+            return 'second'
+
+        compiled = foo.compile()
+        for args in [('a', 1), ('a', 'b'), (b'a', 1), (1, 1), ('b', -1), ('b', 'c'), (None, 1)]:
+            self.assertEquals(_outcome(compiled, *args), _outcome(foo, *args))
+
+    def test_bound_placeholder_called_once(self):
+        calls = []
+        holder = PlaceholderGuard()
+
+        @holder
+        def counted(value):
+            calls.append(value)
+            return True
+
+        @defpattern(holder, gt(0))
+        def foo(x, y):
+            return 'positive'
+
+        @foo.pattern(not_none(), not_none())
+        def foo(x, y):
+            return 'other'
+
+        compiled = foo.compile()
+        self.assertEquals(compiled('x', 'y'), 'other')
+        self.assertEquals(calls, ['x'])
+        self.assertEquals(foo('x', 'y'), 'other')
+        self.assertEquals(calls, ['x', 'x'])
+
+
+class TestCompileClauses(TestCase):
+    def test_unbound_placeholder_dropped(self):
+        @defpattern(1)
+        def foo(x, y):
+            return x + y
+
+        self.assertNotIn('args[1]', foo.compile().__source__)
+
+    def test_bound_placeholder(self):
+        @defpattern(1)
+        def foo(x, y):
+            return x + y
+
+        @foo.y
+        def positive(value):
+            return value > 0
+
+        compiled = foo.compile()
+        self.assertEquals(compiled(1, 1), 2)
+        self.assertRaises(MatchError, lambda: compiled(1, -1))
+
+    def test_duck_clause(self):
+        class Yo(object):
+            def __init__(self):
+                self.underlying_func = lambda x: 1
+
+            def validate(self, x):
+                return True
+
+        self.assertEquals(compile_clauses([Yo()])(4), 1)
+
+    def test_fallback_exceptions(self):
+        @defpattern(lt(3))
+        def foo(x):
+            return 'less'
+
+        @foo.pattern(begins_with('a'))
+        def foo(x):
+            return 'a'
+
+        compiled = foo.compile()
+        self.assertEquals(compiled('abc'), 'a')
+        self.assertRaises(MatchError, lambda: compiled(object()))
@@ -1,5 +1,39 @@
 import operator
 import re
+import sys
+from numbers import Real
+
+
+numpy = None
+
+
+_COMPARISONS = frozenset([operator.lt, operator.le, operator.gt, operator.ge, operator.eq, operator.ne])
+
+
+def _is_array(values):
+    """Returns a boolean indicating if the values are a NumPy array. Nothing can be one before numpy is imported, so it
+    is only looked up among the imported modules and importing Quilt never imports numpy."""
+    global numpy
+    if numpy is None:
+        numpy = sys.modules.get('numpy')
+        if numpy is None:
+            return False
+
+    return isinstance(values, numpy.ndarray)
+
+
+def _comparable(array, value):
+    """Returns a boolean indicating if comparing the value against a NumPy array agrees with comparing it against each
+    element as a Python object. Object arrays never do since their elements compare as arbitrary Python objects."""
+    kind = array.dtype.kind
+    if kind in 'biuf':
+        return isinstance(value, Real)
+    elif kind == 'U':
+        return isinstance(value, str)
+    elif kind == 'S':
+        return isinstance(value, bytes)
+
+    return False
 
 
 class Guard(object):
@@ -15,6 +49,8 @@ class Guard(object):
     :param arg_pos: the position of the argument within the argument list, defaults to None
     """
 
+    __slots__ = ('arg_name', 'arg_pos', '__weakref__')
+
     def __init__(self, arg_name=None, arg_pos=None):
         self.arg_name = arg_name
         self.arg_pos = arg_pos
@@ -70,16 +106,57 @@ class Guard(object):
         """Validates the passed in value using the instance and class of the parent object."""
         return self.validate(value)
 
+    def validate_many(self, values):
+        """Returns the outcome of validate for each of the values, as a list or, for a one dimensional NumPy array, as a
+        NumPy boolean array.
+
+        The built-in Guards validate the whole batch at once where they can, with NumPy for arrays and with batched
+        builtins otherwise. As with the clause index only the exact built-in types do so. Subclasses are free to change
+        the meaning of validate and are validated one value at a time unless they override validate_many themselves.
+        Arrays which can not be validated as a whole are validated element by element, each element being the NumPy
+        scalar validate would see when iterating the array.
+        """
+        batched = type(self) in _BATCHED
+        if _is_array(values):
+            mask = self._validate_array(values) if batched else None
+            if mask is None:
+                results = self.validate_many(list(values))
+                mask = numpy.fromiter(map(bool, results), dtype=bool, count=len(results))
+            return mask
+
+        if not isinstance(values, (list, tuple)):
+            values = list(values)
+        if batched:
+            try:
+                results = self._validate_list(values)
+            except (TypeError, AttributeError):
+                results = None
+            if results is not None:
+                return results
+
+        return [self.validate(value) for value in values]
+
+    def _validate_array(self, array):
+        """Returns the NumPy boolean array of validate over the NumPy array or None if it can not be done as a whole."""
+        return None
+
+    def _validate_list(self, values):
+        """Returns the list of validate over the list of values or None if there is no batched version. Raising a
+        TypeError or AttributeError falls back to validating one value at a time."""
+        return None
+
 
 class ReverseGuard(Guard):
     """A Guard that invalidates the opposite of all values that the wrapped Guard would validate.
 
-    The arg_name and arg_pos parameters are assigned the same values as the wrapped Guard. Disguises itself as the
-    wrapped Guard, passing attribute access and assignment transparently between the two.
+    The arg_name and arg_pos parameters are assigned the same values as the wrapped Guard. The wrapped Guard is held as
+    inner.
 
     :param guard: A Guard
     """
 
+    __slots__ = ('inner',)
+
     def __init__(self, guard):
         super(ReverseGuard, self).__init__(guard.arg_name, guard.arg_pos)
         self.inner = guard
@@ -87,9 +164,11 @@ class ReverseGuard(Guard):
     def validate(self, value):
         return not self.inner.validate(value)
 
-    @property
-    def __class__(self):
-        return self.inner.__class__
+    def _validate_array(self, array):
+        return ~self.inner.validate_many(array)
+
+    def _validate_list(self, values):
+        return [not result for result in self.inner.validate_many(values)]
 
     @property
     def __name__(self):
@@ -98,9 +177,6 @@ class ReverseGuard(Guard):
     def __print__(self, f):
         return 'Reversed' + f(self.inner)
 
-    def __getattr__(self, item):
-        return getattr(self.inner, item)
-
 
 class AndGuard(Guard):
     """A Guard that validates if and only if both contained Guards validate the supplied value.
@@ -112,6 +188,8 @@ class AndGuard(Guard):
     :param second: The second contained Guard
     """
 
+    __slots__ = ('first', 'second')
+
     def __init__(self, first, second):
         super(AndGuard, self).__init__(first.arg_name or second.arg_name, first.arg_pos or second.arg_pos)
         self.first = first
@@ -120,6 +198,17 @@ class AndGuard(Guard):
     def validate(self, value):
         return self.first.validate(value) and self.second.validate(value)
 
+    def _validate_array(self, array):
+        mask = numpy.array(self.first.validate_many(array), dtype=bool)
+        rows = numpy.flatnonzero(mask)
+        mask[rows] = self.second.validate_many(array[rows])
+        return mask
+
+    def _validate_list(self, values):
+        first = self.first.validate_many(values)
+        second = iter(self.second.validate_many([value for value, result in zip(values, first) if result]))
+        return [next(second) if result else result for result in first]
+
     @property
     def __name__(self):
         return 'And[' + self.first.__name__ + ',' + self.second.__name__ + ']'
@@ -139,6 +228,8 @@ class OrGuard(Guard):
     :param second: The second contained Guard
     """
 
+    __slots__ = ('first', 'second')
+
     def __init__(self, first, second):
         super(OrGuard, self).__init__(first.arg_name or second.arg_name, first.arg_pos or second.arg_pos)
         self.first = first
@@ -147,6 +238,17 @@ class OrGuard(Guard):
     def validate(self, value):
         return self.first.validate(value) or self.second.validate(value)
 
+    def _validate_array(self, array):
+        mask = numpy.array(self.first.validate_many(array), dtype=bool)
+        rows = numpy.flatnonzero(~mask)
+        mask[rows] = self.second.validate_many(array[rows])
+        return mask
+
+    def _validate_list(self, values):
+        first = self.first.validate_many(values)
+        second = iter(self.second.validate_many([value for value, result in zip(values, first) if not result]))
+        return [result if result else next(second) for result in first]
+
     @property
     def __name__(self):
         return 'Or[' + self.first.__name__ + ',' + self.second.__name__ + ']'
@@ -166,6 +268,8 @@ class OperatorGuard(Guard):
     :param arg_pos: the position of the argument within the argument list, defaults to None
     """
 
+    __slots__ = ('op', 'value')
+
     def __init__(self, op, value, arg_name=None, arg_pos=None):
         super(OperatorGuard, self).__init__(arg_name, arg_pos)
         self.op = op
@@ -181,6 +285,15 @@ class OperatorGuard(Guard):
         except (TypeError, AttributeError):
             return False
 
+    def _validate_array(self, array):
+        if self.op in _COMPARISONS and _comparable(array, self.value):
+            return self.op(array, self.value)
+        return None
+
+    def _validate_list(self, values):
+        op, other = self.op, self.value
+        return [op(value, other) for value in values]
+
 
 class ValueGuard(Guard):
     """A Guard that validates if the supplied value is the same as the value held by the Guard.
@@ -190,6 +303,8 @@ class ValueGuard(Guard):
     :param arg_pos: the position of the argument within the argument list, defaults to None
     """
 
+    __slots__ = ('value',)
+
     def __init__(self, value, arg_name=None, arg_pos=None):
         super(ValueGuard, self).__init__(arg_name, arg_pos)
         self.value = value
@@ -205,6 +320,13 @@ class ValueGuard(Guard):
     def validate(self, value):
         return self.value == value
 
+    def _validate_array(self, array):
+        return array == self.value if _comparable(array, self.value) else None
+
+    def _validate_list(self, values):
+        other = self.value
+        return [other == value for value in values]
+
 
 def less_than(value):
     return OperatorGuard(operator.lt, value)
@@ -249,24 +371,72 @@ def not_equal_to(value):
 ne = not_equal_to
 
 
+def _frozen(iterable):
+    """Returns the items of a list, tuple or set as a frozenset or None if any of them is unhashable or repeated."""
+    if not isinstance(iterable, (list, tuple, set, frozenset)):
+        return None
+    try:
+        frozen = frozenset(iterable)
+    except TypeError:
+        return None
+
+    return frozen if len(frozen) == len(iterable) else None
+
+
+def _set_of(value):
+    """Returns the items of a set, dict, list or tuple as something supporting set operations or None if that is not
+    possible. Strings are never treated as sets since their containment test looks for substrings."""
+    if isinstance(value, (set, frozenset)):
+        return value
+    elif isinstance(value, dict):
+        return value.keys()
+    elif isinstance(value, (list, tuple)):
+        try:
+            return set(value)
+        except TypeError:
+            return None
+
+    return None
+
+
 class OneOfGuard(Guard):
     """A Guard that validates by if the supplied value is one of several user specified values.
 
+    A list, tuple or set of hashable values is frozen into a frozenset on construction so that validating takes
+    constant time. Any other collection, or a value which can not be hashed, is searched in full.
+
     :param iterable: A list, set, dict or some other iterable collection that can be traversed multiple times.
     :param arg_name: the name of the argument, defaults to None
     :param arg_pos: the position of the argument within the argument list, defaults to None
     """
 
+    __slots__ = ('iterable', 'values')
+
     def __init__(self, iterable, arg_name=None, arg_pos=None):
         super(OneOfGuard, self).__init__(arg_name, arg_pos)
         self.iterable = iterable
+        self.values = _frozen(iterable)
 
     def validate(self, value):
+        if self.values is not None:
+            try:
+                return value in self.values
+            except TypeError:
+                pass
         try:
             return value in self.iterable
         except TypeError:
             return False
 
+    def _validate_array(self, array):
+        if self.values is not None and all(_comparable(array, value) for value in self.values):
+            return numpy.isin(array, list(self.values))
+        return None
+
+    def _validate_list(self, values):
+        collection = self.iterable if self.values is None else self.values
+        return [value in collection for value in values]
+
     @property
     def __name__(self):
         return 'OneOfGuard'
@@ -290,16 +460,26 @@ def not_one_of(*args):
 class ContainsGuard(Guard):
     """A Guard that validates a given iterable contains all of the supplied collection.
 
+    A list, tuple or set of hashable values is frozen into a frozenset on construction. Sets, dicts, and lists or tuples
+    of hashable items are then validated with a single subset test. Anything else is searched item by item.
+
     :param iterable: A list, set, dict or some other iterable set that can be traversed multiple times.
     :param arg_name: the name of the argument, defaults to None
     :param arg_pos: the position of the argument within the argument list, defaults to None
     """
 
+    __slots__ = ('iterable', 'values')
+
     def __init__(self, iterable, arg_name=None, arg_pos=None):
         super(ContainsGuard, self).__init__(arg_name, arg_pos)
         self.iterable = iterable
+        self.values = _frozen(iterable)
 
     def validate(self, value):
+        if self.values is not None:
+            items = _set_of(value)
+            if items is not None:
+                return self.values.issubset(items)
         try:
             return all(x in value for x in self.iterable)
         except TypeError:
@@ -317,18 +497,28 @@ class ContainsGuard(Guard):
 class ContainsNOfGuard(Guard):
     """A Guard that validates a given iterable contains N of the supplied collection.
 
+    A list, tuple or set of distinct hashable values is frozen into a frozenset on construction. Sets, dicts, and lists
+    or tuples of hashable items are then validated by counting the intersection. Anything else is searched item by item.
+
     :param iterable: A list, set or some other iterable collection that can be traversed multiple times.
     :param number: The number of elements that should be contained in the validated iterable
     :param arg_name: the name of the argument, defaults to None
     :param arg_pos: the position of the argument within the argument list, defaults to None
     """
 
+    __slots__ = ('number', 'iterable', 'values')
+
     def __init__(self, iterable, number, arg_name=None, arg_pos=None):
         super(ContainsNOfGuard, self).__init__(arg_name, arg_pos)
         self.iterable = iterable
         self.number = number
+        self.values = _frozen(iterable)
 
     def validate(self, value):
+        if self.values is not None and self.number > 0:
+            items = _set_of(value)
+            if items is not None:
+                return len(self.values.intersection(items)) >= self.number
         try:
             count = 0
             for x in self.iterable:
@@ -368,9 +558,9 @@ contains_all_of = contains
 
 def has_n_of(num, *args):
     if len(args) == 1 and hasattr(args[0], '__iter__'):
-        return ContainsNOfGuard(num, args[0])
+        return ContainsNOfGuard(args[0], num)
     else:
-        return ContainsNOfGuard(num, args)
+        return ContainsNOfGuard(args, num)
 
 
 contains_n_of = has_n_of
@@ -386,6 +576,8 @@ class LengthGuard(Guard):
     :param arg_pos: the position of the argument within the argument list, defaults to None
     """
 
+    __slots__ = ('length', 'op')
+
     def __init__(self, length, op, arg_name=None, arg_pos=None):
         super(LengthGuard, self).__init__(arg_name, arg_pos)
         self.length = length
@@ -397,6 +589,15 @@ class LengthGuard(Guard):
         except TypeError:
             return False
 
+    def _validate_array(self, array):
+        if array.dtype.kind in 'US' and self.op in _COMPARISONS and isinstance(self.length, Real):
+            return self.op(numpy.char.str_len(array), self.length)
+        return None
+
+    def _validate_list(self, values):
+        op, length = self.op, self.length
+        return [op(len(value), length) for value in values]
+
     @property
     def __name__(self):
         return 'LengthGuard'
@@ -445,6 +646,8 @@ class TypeOfGuard(Guard):
     :param arg_pos: the position of the argument within the argument list, defaults to None
     """
 
+    __slots__ = ('obj_type',)
+
     def __init__(self, obj_type, arg_name=None, arg_pos=None):
         super(TypeOfGuard, self).__init__(arg_name, arg_pos)
         self.obj_type = obj_type
@@ -476,6 +679,8 @@ class CloseToGuard(Guard):
     :param arg_pos: the position of the argument within the argument list, defaults to None
     """
 
+    __slots__ = ('value', 'epsilon', 'op')
+
     def __init__(self, value, epsilon, op=None, arg_name=None, arg_pos=None):
         super(CloseToGuard, self).__init__(arg_name, arg_pos)
         self.value = value
@@ -488,6 +693,16 @@ class CloseToGuard(Guard):
         except (AttributeError, TypeError):
             return False
 
+    def _validate_array(self, array):
+        if self.op is operator.sub and _comparable(array, self.value) and _comparable(array, self.epsilon):
+            return (self.value - self.epsilon < array) & (array - self.epsilon < self.value)
+        return None
+
+    def _validate_list(self, values):
+        op, target, epsilon = self.op, self.value, self.epsilon
+        lowest = op(target, epsilon)
+        return [lowest < value and op(value, epsilon) < target for value in values]
+
     @property
     def __name__(self):
         return 'CloseToGuard'
@@ -507,12 +722,20 @@ class NotNoneGuard(Guard):
     :param arg_pos: the position of the argument within the argument list, defaults to None
     """
 
+    __slots__ = ()
+
     def __init__(self, arg_name=None, arg_pos=None):
         super(NotNoneGuard, self).__init__(arg_name, arg_pos)
 
     def validate(self, value):
         return value is not None
 
+    def _validate_array(self, array):
+        return numpy.ones(len(array), dtype=bool) if array.dtype.kind != 'O' else None
+
+    def _validate_list(self, values):
+        return [value is not None for value in values]
+
     @property
     def __name__(self):
         return 'NotNoneGuard'
@@ -537,6 +760,8 @@ class RegexGuard(Guard):
     :param arg_pos: the position of the argument within the argument list, defaults to None
     """
 
+    __slots__ = ('phrase', 'regex', 'beginning', 'pos')
+
     def __init__(self, phrase, flag=0, pos=0, beginning=True, arg_name=None, arg_pos=None):
         super(RegexGuard, self).__init__(arg_name, arg_pos)
         self.regex = re.compile(phrase, flag)
@@ -557,6 +782,10 @@ class RegexGuard(Guard):
         except AttributeError:
             return False
 
+    def _validate_list(self, values):
+        find, pos = self.regex.match if self.beginning else self.regex.search, self.pos
+        return [find(value, pos) is not None for value in values]
+
     def __print__(self, f):
         return self.__name__ + '(phrase=' + self.phrase + ', pos=' + f(self.pos) + ', arg_name=' + f(self.arg_name) + \
             ', arg_pos=' + f(self.arg_pos) + ')'
@@ -576,6 +805,8 @@ class BeginsWithGuard(Guard):
     :param arg_pos: the position of the argument within the argument list, defaults to None
     """
 
+    __slots__ = ('phrase',)
+
     def __init__(self, phrase, arg_name=None, arg_pos=None):
         super(BeginsWithGuard, self).__init__(arg_name, arg_pos)
         self.phrase = phrase
@@ -590,6 +821,15 @@ class BeginsWithGuard(Guard):
         except AttributeError:
             return False
 
+    def _validate_array(self, array):
+        if array.dtype.kind in 'US' and _comparable(array, self.phrase):
+            return numpy.char.startswith(array, self.phrase)
+        return None
+
+    def _validate_list(self, values):
+        phrase = self.phrase
+        return [value.startswith(phrase) for value in values]
+
     def __print__(self, f):
         return 'BeginsWithGuard(phrase=' + self.phrase + ', arg_name=' + f(self.arg_name) + ', arg_pos=' + \
             f(self.arg_pos) + ')'
@@ -606,6 +846,8 @@ class EndsWithGuard(Guard):
     :param arg_pos: the position of the argument within the argument list, defaults to None
     """
 
+    __slots__ = ('phrase',)
+
     def __init__(self, phrase, arg_name=None, arg_pos=None):
         super(EndsWithGuard, self).__init__(arg_name, arg_pos)
         self.phrase = phrase
@@ -620,6 +862,15 @@ class EndsWithGuard(Guard):
         except AttributeError:
             return False
 
+    def _validate_array(self, array):
+        if array.dtype.kind in 'US' and _comparable(array, self.phrase):
+            return numpy.char.endswith(array, self.phrase)
+        return None
+
+    def _validate_list(self, values):
+        phrase = self.phrase
+        return [value.endswith(phrase) for value in values]
+
     def __print__(self, f):
         return 'EndsWithGuard(phrase=' + self.phrase + ', arg_name=' + f(self.arg_name) + ', arg_pos=' + \
             f(self.arg_pos) + ')'
@@ -631,6 +882,8 @@ ends_with = EndsWithGuard
 
 
 class HasAttributeGuard(Guard):
+    __slots__ = ('attr',)
+
     def __init__(self, attr, arg_name=None, arg_pos=None):
         super(HasAttributeGuard, self).__init__(arg_name, arg_pos)
         self.attr = attr
@@ -659,6 +912,8 @@ class PatternGuard(Guard):
     :param arg_pos: the position of the argument within the argument list, defaults to None
     """
 
+    __slots__ = ('guards',)
+
     def __init__(self, kwarg_guards, arg_name=None, arg_pos=None):
         super(PatternGuard, self).__init__(arg_name, arg_pos)
         self.guards = kwarg_guards or []
@@ -683,11 +938,19 @@ class PlaceholderGuard(Guard):
     treat it as a decorator much like you would when binding a property's accessor. Bound member functions will only be
     able to access state from an object if the 'validate_instance' method is used.
 
+    Every binding through the decorator increments the class wide bindings counter which lets anything caching the
+    outcome of validation tell that it has gone stale. The decorator returns the function unchanged so that a bound
+    PlaceholderGuard can be pickled, with its function pickled by reference.
+
     :param wrapped_func: The bound function
     :param arg_name: the name of the argument, defaults to None
     :param arg_pos: the position of the argument within the argument list, defaults to None
     """
 
+    __slots__ = ('wrapped_func',)
+
+    bindings = 0
+
     def __init__(self, wrapped_func=None, arg_name=None, arg_pos=None):
         super(PlaceholderGuard, self).__init__(arg_name, arg_pos)
         self.wrapped_func = wrapped_func
@@ -715,5 +978,34 @@ class PlaceholderGuard(Guard):
         else:
             return True
 
+    def _validate_array(self, array):
+        return numpy.ones(len(array), dtype=bool) if not self.wrapped_func else None
+
+    def _validate_list(self, values):
+        return [True] * len(values) if not self.wrapped_func else None
+
     def __call__(self, func):
-        self.wrapped_func = func
\ No newline at end of file
+        self.wrapped_func = func
+        PlaceholderGuard.bindings += 1
+
+        return func
+
+
+_BATCHED = frozenset([ReverseGuard, AndGuard, OrGuard, OperatorGuard, ValueGuard, OneOfGuard, LengthGuard, CloseToGuard,
+                      NotNoneGuard, RegexGuard, BeginsWithGuard, EndsWithGuard, PlaceholderGuard])
+
+
+def nested_guards(guard):
+    """Yields the Guard followed by every Guard nested within it, depth first."""
+    yield guard
+    if type(guard) is ReverseGuard:
+        children = [guard.inner]
+    elif isinstance(guard, (AndGuard, OrGuard)):
+        children = [guard.first, guard.second]
+    elif isinstance(guard, PatternGuard):
+        children = guard.guards
+    else:
+        children = []
+    for child in children:
+        for nested in nested_guards(child):
+            yield nested
@@ -1,8 +1,13 @@
 __author__ = 'Owein'
 
-from unittest import TestCase
+from unittest import TestCase, skipIf
 from quilt.guard import *
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class _Yo(Guard):
     def __init__(self, name):
@@ -157,6 +162,17 @@ class TestOneOfGuard(TestCase):
         self.assertTrue(g.validate([1]))
         self.assertFalse(g.validate(0))
 
+    def test_frozen(self):
+        g = one_of(1, 2, 3)
+        self.assertEquals(g.values, frozenset([1, 2, 3]))
+        self.assertTrue(g.validate(2.0))
+        self.assertFalse(g.validate([2]))
+
+    def test_not_frozen(self):
+        self.assertIsNone(one_of('abc').values)
+        self.assertIsNone(one_of([1], 2).values)
+        self.assertTrue(one_of('abc').validate('bc'))
+
 
 class TestContainsGuard(TestCase):
     def test_empty(self):
@@ -183,6 +199,45 @@ class TestContainsGuard(TestCase):
         self.assertTrue(g.validate([1,2,3]))
         self.assertFalse(g.validate([2,3]))
 
+    def test_sets_and_dicts(self):
+        g = contains(1, 2)
+        self.assertTrue(g.validate({1, 2, 3}))
+        self.assertTrue(g.validate({1: 'a', 2: 'b'}))
+        self.assertFalse(g.validate(frozenset([2, 3])))
+
+    def test_unhashable_items(self):
+        g = contains(1, 2)
+        self.assertTrue(g.validate([[0], 1, 2]))
+        self.assertFalse(g.validate([[0], 1]))
+
+    def test_string(self):
+        g = contains('ab', 'c')
+        self.assertTrue(g.validate('xabc'))
+        self.assertFalse(g.validate(['xab', 'c']))
+
+
+class TestContainsNOfGuard(TestCase):
+    def test_several_args(self):
+        g = has_n_of(2, 1, 2, 3)
+        self.assertTrue(g.validate([1, 3]))
+        self.assertTrue(g.validate({2, 3, 4}))
+        self.assertFalse(g.validate((3, 4)))
+
+    def test_one_iter(self):
+        g = has_n_of(1, [1, 2])
+        self.assertTrue(g.validate([2]))
+        self.assertFalse(g.validate([]))
+
+    def test_repeated(self):
+        g = has_n_of(2, [1, 1])
+        self.assertIsNone(g.values)
+        self.assertTrue(g.validate([1]))
+
+    def test_unhashable_items(self):
+        g = has_n_of(2, 1, 2)
+        self.assertTrue(g.validate([[0], 1, 2]))
+        self.assertFalse(g.validate(5))
+
 
 class TestCloseToGuard(TestCase):
     def test_equals(self):
@@ -301,3 +356,76 @@ class TestPlaceholderGuard(TestCase):
         self.assertFalse(g.validate(4))
         self.assertTrue(g.validate(0))
 
+
+class TestValidateMany(TestCase):
+    def test_default(self):
+        self.assertEquals(_Yo('x').validate_many([1, None]), [True, True])
+
+    def test_operator(self):
+        self.assertEquals(lt(2).validate_many([1, 2, 'a']), [True, False, False])
+
+    def test_one_of(self):
+        self.assertEquals(one_of(1, 2).validate_many(iter([1, [1], 3])), [True, False, False])
+
+    def test_length(self):
+        self.assertEquals(has_length(1).validate_many(['a', 'ab', 1]), [True, False, False])
+
+    def test_strings(self):
+        values = ['abc', 'bca', None]
+        self.assertEquals(regex('b').validate_many(values[:2]), [False, True])
+        self.assertEquals(begins_with('a').validate_many(values), [True, False, False])
+        self.assertEquals(ends_with('a').validate_many(values), [False, True, False])
+
+    def test_not_none(self):
+        self.assertEquals(not_none().validate_many([0, None]), [True, False])
+
+    def test_combined(self):
+        g = gt(0).and_(not_equal_to(2)).or_(ValueGuard(-1))
+        self.assertEquals(g.validate_many([-1, 0, 1, 2]), [True, False, True, False])
+
+    def test_subclass_validates_each(self):
+        class Odd(OperatorGuard):
+            def validate(self, value):
+                return value % 2 == 1
+
+        self.assertEquals(Odd(operator.lt, 0).validate_many([1, 2]), [True, False])
+
+
+@skipIf(numpy is None, 'requires numpy')
+class TestValidateManyArrays(TestCase):
+    def test_operator(self):
+        mask = lt(2).validate_many(numpy.array([1, 2, 3]))
+        self.assertEquals(mask.tolist(), [True, False, False])
+
+    def test_value(self):
+        mask = ValueGuard('b').validate_many(numpy.array(['a', 'b']))
+        self.assertEquals(mask.tolist(), [False, True])
+
+    def test_one_of(self):
+        mask = one_of(1, 3).validate_many(numpy.array([1, 2, 3]))
+        self.assertEquals(mask.tolist(), [True, False, True])
+
+    def test_close_to(self):
+        mask = close_to(1.0, 0.5).validate_many(numpy.array([0.4, 1.2, 1.6]))
+        self.assertEquals(mask.tolist(), [False, True, False])
+
+    def test_strings(self):
+        values = numpy.array(['abc', 'bca'])
+        self.assertEquals(begins_with('a').validate_many(values).tolist(), [True, False])
+        self.assertEquals(longer_than(2).validate_many(values).tolist(), [True, True])
+        self.assertEquals(regex('b').validate_many(values).tolist(), [False, True])
+
+    def test_combined(self):
+        mask = gt(0).and_(not_equal_to(2)).or_(ValueGuard(-1)).validate_many(numpy.array([-1, 0, 1, 2]))
+        self.assertEquals(mask.tolist(), [True, False, True, False])
+
+    def test_element_wise(self):
+        self.assertEquals(lt('a').validate_many(numpy.array([1, 2])).tolist(), [False, False])
+        self.assertEquals(type_of(int).validate_many(numpy.array([1, 2])).tolist(), [False, False])
+        self.assertEquals(type_of(numpy.integer).validate_many(numpy.array([1, 2])).tolist(), [True, True])
+        self.assertEquals(lt(2).validate_many(numpy.array([1, 'a'], dtype=object)).tolist(), [True, False])
+
+    def test_same_as_validate(self):
+        values = numpy.array([1, 2, 3])
+        for guard in [type_of(int), type_of(numpy.int64), lt('a'), has_attribute('dtype'), not_none()]:
+            self.assertEquals(guard.validate_many(values).tolist(), [guard.validate(value) for value in values])
@@ -0,0 +1,474 @@
+import operator
+import re
+from bisect import bisect_left
+from numbers import Real
+from .guard import ValueGuard, OneOfGuard, AndGuard, OrGuard, OperatorGuard, CloseToGuard, RegexGuard, \
+    BeginsWithGuard, EndsWithGuard
+
+
+_INFINITY = float('inf')
+
+_BOUNDS = {
+    operator.lt: lambda value: (-_INFINITY, False, value, False),
+    operator.le: lambda value: (-_INFINITY, False, value, True),
+    operator.gt: lambda value: (value, False, _INFINITY, False),
+    operator.ge: lambda value: (value, True, _INFINITY, False),
+    operator.eq: lambda value: (value, True, value, True),
+}
+
+# CloseToGuard tests value - epsilon < v on its upper side, which may round differently than v < value + epsilon.
+_CLOSE_TO_SLACK = 1e-9
+
+
+def _hash_keys(guard):
+    """Returns the frozenset of hashable values which are the only values the Guard could validate or None if the Guard
+    can not be described that way.
+
+    Only the exact Guard types are recognized. Subclasses are free to change the meaning of validate, hence the type
+    checks instead of isinstance.
+    """
+    guard_type = type(guard)
+    try:
+        if guard_type is ValueGuard:
+            return frozenset((guard.value,))
+        elif guard_type is OneOfGuard and guard.values is not None:
+            return guard.values
+        elif guard_type is OneOfGuard and isinstance(guard.iterable, (tuple, list, set, frozenset)):
+            return frozenset(guard.iterable)
+        elif guard_type is AndGuard:
+            first, second = _hash_keys(guard.first), _hash_keys(guard.second)
+            if first is None or second is None:
+                return first if second is None else second
+            return first & second
+        elif guard_type is OrGuard:
+            first, second = _hash_keys(guard.first), _hash_keys(guard.second)
+            if first is None or second is None:
+                return None
+            return first | second
+    except TypeError:
+        pass
+
+    return None
+
+
+def _is_number(value):
+    return isinstance(value, Real) and value == value
+
+
+def _interval(guard):
+    """Returns the interval (low, low closed, high, high closed) outside of which the Guard can not validate a number
+    or None if the Guard can not be described that way. Intervals of CloseToGuard are slightly wider than the Guard."""
+    guard_type = type(guard)
+    if guard_type is OperatorGuard and guard.op in _BOUNDS and _is_number(guard.value):
+        return _BOUNDS[guard.op](guard.value)
+    elif guard_type is CloseToGuard and guard.op is operator.sub and _is_number(guard.value) and \
+            _is_number(guard.epsilon):
+        high = guard.value + guard.epsilon
+        return guard.value - guard.epsilon, False, high + abs(high) * _CLOSE_TO_SLACK, True
+    elif guard_type is AndGuard:
+        first, second = _interval(guard.first), _interval(guard.second)
+        if first is None or second is None:
+            return first if second is None else second
+        low = max(first[:2], second[:2], key=lambda bound: (bound[0], not bound[1]))
+        high = min(first[2:], second[2:], key=lambda bound: (bound[0], bound[1]))
+        return low + high
+
+    return None
+
+
+def _contains(interval, value):
+    low, low_closed, high, high_closed = interval
+    return (low < value or (low_closed and low == value)) and (value < high or (high_closed and value == high))
+
+
+def _alternative(guard):
+    """Returns the source of the RegexGuard rewritten to be matched from its starting position, or None if it can not be
+    fused with other expressions. Expressions which capture groups would have their back references renumbered and
+    expressions with global inline flags can not be nested."""
+    if type(guard) is not RegexGuard or guard.regex.groups:
+        return None
+
+    pattern = guard.regex.pattern
+    prefix = '(?:' if guard.beginning else '(?s:.*?)(?:'
+    if isinstance(pattern, str):
+        source = prefix + pattern + ')'
+    else:
+        source = prefix.encode() + pattern + b')'
+    try:
+        re.compile(source, guard.regex.flags)
+    except re.error:
+        return None
+
+    return source
+
+
+def _slot_guards(clause):
+    """Yields the (slot, Guard) pairs of a GuardedFunction. A slot is either ('arg', i) for the i-th positional argument
+    or ('kw', name) for a key-word argument, mirroring how GuardedFunction.validate pairs arguments with Guards."""
+    for i, guard in enumerate(getattr(clause, 'arg_guards', ())):
+        yield ('arg', i), guard
+    for name, guard in getattr(clause, 'kwarg_guards', {}).items():
+        yield ('kw', name), guard
+
+
+class HashDiscriminator(object):
+    """Narrows the clauses of a proxy by hashing the value supplied for a single argument slot.
+
+    Each bucket holds the indices of the clauses whose Guard on the slot could validate the key together with the indices
+    of every clause whose Guard on the slot can not be hashed, the wildcards. Values not found in the table narrow to the
+    wildcards alone.
+
+    :param slot: The argument slot, ('arg', position) or ('kw', name)
+    :param keys: A list with one entry per clause, either a frozenset of keys or None for a wildcard.
+    """
+
+    def __init__(self, slot, keys):
+        self.slot = slot
+        self.wildcards = frozenset(i for i, k in enumerate(keys) if k is None)
+        buckets = {}
+        for i, clause_keys in enumerate(keys):
+            for key in clause_keys or ():
+                buckets.setdefault(key, set(self.wildcards)).add(i)
+        self.table = dict((key, frozenset(members)) for key, members in buckets.items())
+
+    def __str__(self):
+        return self.__print__(str)
+
+    def __repr__(self):
+        return self.__print__(repr)
+
+    def __print__(self, f):
+        return 'HashDiscriminator(slot=' + f(self.slot) + ', keys=' + f(len(self.table)) + ', wildcards=' + \
+            f(len(self.wildcards)) + ')'
+
+    def buckets(self):
+        """Returns the list of every frozenset of clause indices narrow may return."""
+        return list(self.table.values()) + [self.wildcards]
+
+    def narrow(self, value):
+        """Returns the frozenset of clause indices which could validate the value or None if the value is unhashable."""
+        try:
+            return self.table.get(value, self.wildcards)
+        except TypeError:
+            return None
+
+
+class RangeDiscriminator(object):
+    """Narrows the clauses of a proxy by locating the number supplied for a single argument slot among the sorted
+    boundaries of the numeric comparisons of the clauses, in O(log n) using bisect.
+
+    The boundaries split the number line into regions, each boundary a region of its own along with the open stretches
+    between them. Every region holds the indices of the clauses whose interval covers it together with the wildcards,
+    the clauses whose Guard on the slot is not a numeric comparison. Values which are not real numbers are not
+    narrowed.
+
+    :param slot: The argument slot, ('arg', position) or ('kw', name)
+    :param intervals: A list with one entry per clause, either an interval or None for a wildcard.
+    """
+
+    def __init__(self, slot, intervals):
+        self.slot = slot
+        wildcards = [i for i, interval in enumerate(intervals) if interval is None]
+        self.boundaries = sorted(set(bound for interval in intervals if interval is not None
+                                     for bound in (interval[0], interval[2]) if abs(bound) != _INFINITY))
+        edges = [-_INFINITY] + self.boundaries + [_INFINITY]
+        self.regions = []
+        for i in range(len(self.boundaries) + 1):
+            left, right = edges[i], edges[i + 1]
+            self.regions.append(frozenset(wildcards + [j for j, interval in enumerate(intervals)
+                                                       if interval is not None and interval[0] <= left and
+                                                       interval[2] >= right]))
+            if i < len(self.boundaries):
+                self.regions.append(frozenset(wildcards + [j for j, interval in enumerate(intervals)
+                                                           if interval is not None and _contains(interval, right)]))
+
+    def __str__(self):
+        return self.__print__(str)
+
+    def __repr__(self):
+        return self.__print__(repr)
+
+    def __print__(self, f):
+        return 'RangeDiscriminator(slot=' + f(self.slot) + ', boundaries=' + f(len(self.boundaries)) + ')'
+
+    def buckets(self):
+        """Returns the list of every frozenset of clause indices narrow may return."""
+        return self.regions
+
+    def narrow(self, value):
+        """Returns the frozenset of clause indices which could validate the value or None if it is not a real number."""
+        if type(value) not in (int, float) and not isinstance(value, Real):
+            return None
+        if value != value:
+            return None
+        i = bisect_left(self.boundaries, value)
+        if i < len(self.boundaries) and self.boundaries[i] == value:
+            return self.regions[2 * i + 1]
+
+        return self.regions[2 * i]
+
+
+class RegexDiscriminator(object):
+    """Narrows the clauses of a proxy by matching the string supplied for a single argument slot against all of the
+    RegexGuard of the clauses at once.
+
+    RegexGuard sharing the same flags and starting position are fused into one alternation of named groups, searching
+    expressions being rewritten to match from the starting position. A match reports the first alternative which
+    matches, so all the matching clauses are found by matching again from the alternative after it, each suffix of the
+    alternation being compiled on first use. Clauses whose RegexGuard can not be fused are wildcards, as are the
+    clauses without a RegexGuard on the slot. Values which are not strings of the type of every fused expression are not
+    narrowed, so that validating the clauses raises TypeError just as it would without the index.
+
+    :param slot: The argument slot, ('arg', position) or ('kw', name)
+    :param guards: A list with one entry per clause, either a Guard or None if the clause has none on the slot.
+    """
+
+    def __init__(self, slot, guards):
+        self.slot = slot
+        wildcards = []
+        self.groups = {}
+        for i, guard in enumerate(guards):
+            source = _alternative(guard) if guard is not None else None
+            if source is None:
+                wildcards.append(i)
+            else:
+                key = (guard.regex.flags, guard.pos, type(source))
+                self.groups.setdefault(key, []).append((i, source))
+        self.wildcards = frozenset(wildcards)
+        self.positions = dict((key, dict((i, n) for n, (i, _) in enumerate(alternatives)))
+                              for key, alternatives in self.groups.items())
+        self.suffixes = dict((key, {}) for key in self.groups)
+
+    def __str__(self):
+        return self.__print__(str)
+
+    def __repr__(self):
+        return self.__print__(repr)
+
+    def __print__(self, f):
+        return 'RegexDiscriminator(slot=' + f(self.slot) + ', groups=' + f(len(self.groups)) + ', wildcards=' + \
+            f(len(self.wildcards)) + ')'
+
+    def buckets(self):
+        """Returns an empty list, the clause indices narrow returns being put together on every call."""
+        return []
+
+    def _suffix(self, key, start):
+        """Returns the alternation of the group from its start-th alternative onwards."""
+        suffixes = self.suffixes[key]
+        if start not in suffixes:
+            flags, _, source_type = key
+            alternatives = self.groups[key][start:]
+            if source_type is str:
+                source = '|'.join('(?P<_' + str(i) + '>' + alt + ')' for i, alt in alternatives)
+            else:
+                source = b'|'.join(b'(?P<_' + str(i).encode() + b'>' + alt + b')' for i, alt in alternatives)
+            suffixes[start] = re.compile(source, flags)
+
+        return suffixes[start]
+
+    def narrow(self, value):
+        """Returns the frozenset of clause indices which could validate the value or None if it is not a string of the
+        type of every expression, the RegexGuard then raising TypeError rather than failing to match."""
+        for key in self.groups:
+            if not isinstance(value, key[2]):
+                return None
+
+        matched = set(self.wildcards)
+        for key, alternatives in self.groups.items():
+            start = 0
+            while start < len(alternatives):
+                found = self._suffix(key, start).match(value, key[1])
+                if found is None:
+                    break
+                clause = int(found.lastgroup[1:])
+                matched.add(clause)
+                start = self.positions[key][clause] + 1
+
+        return frozenset(matched)
+
+
+def _phrase(guard, guard_type):
+    """Returns the str phrase of a BeginsWithGuard or EndsWithGuard, matching the guard_type exactly, or None."""
+    if type(guard) is guard_type and isinstance(guard.phrase, str):
+        return guard.phrase
+
+    return None
+
+
+class TrieDiscriminator(object):
+    """Narrows the clauses of a proxy by walking the string supplied for a single argument slot down a character trie
+    of the phrases of its BeginsWithGuard, or of the reversed phrases of its EndsWithGuard. The cost of a call depends on
+    the length of the string rather than the number of clauses.
+
+    Every node holds the indices of the clauses whose phrase ends there or at any node above it together with the
+    wildcards, the clauses without such a Guard on the slot. The deepest node reached is the answer.
+    Values which are not exactly str, subclasses included as they may redefine startswith and endswith, are not narrowed
+    and left to the Guards.
+
+    :param slot: The argument slot, ('arg', position) or ('kw', name)
+    :param phrases: A list with one entry per clause, either a phrase or None for a wildcard.
+    :param reverse: True to match the end of strings, for EndsWithGuard.
+    """
+
+    def __init__(self, slot, phrases, reverse=False):
+        self.slot = slot
+        self.reverse = reverse
+        self.root = {}
+        for i, phrase in enumerate(phrases):
+            if phrase is not None:
+                node = self.root
+                for char in (reversed(phrase) if reverse else phrase):
+                    node = node.setdefault(char, {})
+                node.setdefault(None, set()).add(i)
+
+        wildcards = frozenset(i for i, phrase in enumerate(phrases) if phrase is None)
+        self._accumulate(self.root, wildcards)
+
+    def _accumulate(self, node, above):
+        """Replaces the clauses ending at each node with those ending at or above it."""
+        if None in node:
+            above = node[None] = above | node[None]
+        else:
+            node[None] = above
+        for char, child in node.items():
+            if char is not None:
+                self._accumulate(child, above)
+
+    def __str__(self):
+        return self.__print__(str)
+
+    def __repr__(self):
+        return self.__print__(repr)
+
+    def __print__(self, f):
+        return 'TrieDiscriminator(slot=' + f(self.slot) + ', reverse=' + f(self.reverse) + ')'
+
+    def buckets(self):
+        """Returns the list of every frozenset of clause indices narrow may return."""
+        found, nodes = [], [self.root]
+        while nodes:
+            node = nodes.pop()
+            found.append(node[None])
+            nodes.extend(child for char, child in node.items() if char is not None)
+
+        return found
+
+    def narrow(self, value):
+        """Returns the frozenset of clause indices which could validate the value or None if it is not exactly a str."""
+        if type(value) is not str:
+            return None
+
+        node = self.root
+        found = node[None]
+        for char in (reversed(value) if self.reverse else value):
+            node = node.get(char)
+            if node is None:
+                break
+            found = node[None]
+
+        return found
+
+
+def _discriminators(clauses):
+    slots = {}
+    for i, clause in enumerate(clauses):
+        for slot, guard in _slot_guards(clause):
+            slots.setdefault(slot, {})[i] = guard
+
+    for slot, guards in sorted(slots.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+        keys = [_hash_keys(guards[i]) if i in guards else None for i in range(len(clauses))]
+        if any(k is not None for k in keys):
+            yield HashDiscriminator(slot, keys)
+        intervals = [_interval(guards[i]) if i in guards else None for i in range(len(clauses))]
+        if any(interval is not None for interval in intervals):
+            yield RangeDiscriminator(slot, intervals)
+        regexes = [guards.get(i) for i in range(len(clauses))]
+        if any(_alternative(guard) is not None for guard in regexes if guard is not None):
+            yield RegexDiscriminator(slot, regexes)
+        for guard_type, reverse in ((BeginsWithGuard, False), (EndsWithGuard, True)):
+            phrases = [_phrase(guards[i], guard_type) if i in guards else None for i in range(len(clauses))]
+            if any(phrase is not None for phrase in phrases):
+                yield TrieDiscriminator(slot, phrases, reverse)
+
+
+class ClauseIndex(object):
+    """A discrimination index over the clauses of a proxy. Maps the values of the call arguments straight to the clauses
+    which could possibly match while preserving the order of declaration, and thus first-match semantics.
+
+    The index only ever removes clauses that can not match. Every candidate it returns must still be validated in full.
+    Slots that are not supplied by a call or whose value is not hashable do not narrow the candidates.
+
+    The tuple of candidates of every frozenset of clause indices a discriminator holds is put in order once, when the
+    index is built, so that a call narrowed by a single discriminator does not sort anything.
+
+    :param clauses: The ordered collection of GuardedFunction
+    :param discriminators: A list of discriminators, each narrowing on one argument slot.
+    """
+
+    def __init__(self, clauses, discriminators):
+        self.clauses = clauses
+        self.arg_discriminators = [(d.slot[1], d) for d in discriminators if d.slot[0] == 'arg']
+        self.kw_discriminators = [(d.slot[1], d) for d in discriminators if d.slot[0] == 'kw']
+        self.ordered = dict((bucket, tuple(clauses[i] for i in sorted(bucket)))
+                            for discriminator in discriminators for bucket in discriminator.buckets())
+
+    def __str__(self):
+        return self.__print__(str)
+
+    def __repr__(self):
+        return self.__print__(repr)
+
+    def __print__(self, f):
+        found = [d for _, d in self.arg_discriminators] + [d for _, d in self.kw_discriminators]
+        return 'ClauseIndex(clauses=' + f(len(self.clauses)) + ', discriminators=[' + ', '.join(map(f, found)) + '])'
+
+    def candidates(self, args, kwargs):
+        """Returns the tuple of clauses, in order of declaration, which could match the supplied arguments."""
+        narrowed = self.narrow(args, kwargs)
+        if narrowed is None:
+            return self.clauses
+        ordered = self.ordered.get(narrowed)
+        if ordered is None:
+            clauses = self.clauses
+            ordered = tuple(clauses[i] for i in sorted(narrowed))
+
+        return ordered
+
+    def narrow(self, args, kwargs):
+        """Returns the set of positions among the clauses of those which could match the supplied arguments or None if
+        no discriminator narrows them."""
+        narrowed = None
+        for pos, discriminator in self.arg_discriminators:
+            if pos < len(args):
+                members = discriminator.narrow(args[pos])
+                if members is not None:
+                    narrowed = members if narrowed is None else narrowed & members
+        if kwargs:
+            for name, discriminator in self.kw_discriminators:
+                if name in kwargs:
+                    members = discriminator.narrow(kwargs[name])
+                    if members is not None:
+                        narrowed = members if narrowed is None else narrowed & members
+
+        return narrowed
+
+
+def _prunes(discriminator, count):
+    """Returns a boolean indicating if the discriminator could ever narrow the count clauses down. A discriminator every
+    bucket of which holds all of the clauses never does, one without buckets might."""
+    buckets = discriminator.buckets()
+    return not buckets or any(len(bucket) < count for bucket in buckets)
+
+
+def index_clauses(clauses):
+    """Builds a ClauseIndex over the clauses or returns None if no Guard could be indexed. Hashable ValueGuard and
+    OneOfGuard are indexed by a HashDiscriminator, numeric OperatorGuard and CloseToGuard by a RangeDiscriminator and
+    RegexGuard by a RegexDiscriminator and BeginsWithGuard and EndsWithGuard by a TrieDiscriminator. Discriminators
+    which could never narrow the clauses down are left out."""
+    clauses = tuple(clauses)
+    discriminators = [d for d in _discriminators(clauses) if _prunes(d, len(clauses))]
+    if not discriminators:
+        return None
+
+    return ClauseIndex(clauses, discriminators)
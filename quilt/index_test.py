@@ -0,0 +1,312 @@
+import operator
+import re
+from unittest import TestCase
+from quilt.guard import *
+from quilt.index import *
+from quilt.proxy import defpattern, pattern
+from quilt.exc import MatchError
+
+
+class _Clause(object):
+    def __init__(self, *arg_guards, **kwarg_guards):
+        self.arg_guards = list(arg_guards)
+        self.kwarg_guards = kwarg_guards
+
+
+class TestIndexClauses(TestCase):
+    def test_nothing_to_index(self):
+        self.assertIsNone(index_clauses([_Clause(not_none()), _Clause(PlaceholderGuard())]))
+
+    def test_value(self):
+        clauses = [_Clause(ValueGuard(1)), _Clause(ValueGuard(2)), _Clause(ValueGuard(1))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates((1,), {})), [clauses[0], clauses[2]])
+        self.assertEquals(list(index.candidates((2,), {})), [clauses[1]])
+        self.assertEquals(list(index.candidates((3,), {})), [])
+
+    def test_wildcards_keep_order(self):
+        clauses = [_Clause(ValueGuard(1)), _Clause(not_none()), _Clause(one_of(1, 2))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates((1,), {})), clauses)
+        self.assertEquals(list(index.candidates((2,), {})), [clauses[1], clauses[2]])
+        self.assertEquals(list(index.candidates((7,), {})), [clauses[1]])
+
+    def test_unhashable(self):
+        clauses = [_Clause(ValueGuard(1)), _Clause(ValueGuard([1]))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates(([1],), {})), clauses)
+        self.assertEquals(list(index.candidates((1,), {})), clauses)
+
+    def test_missing_argument(self):
+        clauses = [_Clause(ValueGuard(1)), _Clause(ValueGuard(2))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates((), {})), clauses)
+
+    def test_several_positions(self):
+        clauses = [_Clause(ValueGuard(1), ValueGuard('a')), _Clause(ValueGuard(1), ValueGuard('b')),
+                   _Clause(ValueGuard(2), lt('z'))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates((1, 'b'), {})), [clauses[1]])
+        self.assertEquals(list(index.candidates((2, 'b'), {})), [clauses[2]])
+        self.assertEquals(list(index.candidates((1,), {})), [clauses[0], clauses[1]])
+
+    def test_keywords(self):
+        clauses = [_Clause(x=ValueGuard(1)), _Clause(x=ValueGuard(2))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates((), {'x': 2})), [clauses[1]])
+        self.assertEquals(list(index.candidates((), {'y': 2})), clauses)
+
+    def test_reversed_not_indexed(self):
+        self.assertIsNone(index_clauses([_Clause(not_equal_to(1))]))
+
+    def test_one_of_string(self):
+        self.assertIsNone(index_clauses([_Clause(one_of('abc'))]))
+
+    def test_and_or(self):
+        clauses = [_Clause(ValueGuard(1).and_(lt(5))), _Clause(ValueGuard(2).or_(ValueGuard(3))),
+                   _Clause(ValueGuard(4).or_(lt(0)))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates((1,), {})), [clauses[0], clauses[2]])
+        self.assertEquals(list(index.candidates((3,), {})), [clauses[1], clauses[2]])
+
+
+class TestRangeDiscriminator(TestCase):
+    def test_thresholds(self):
+        clauses = [_Clause(lt(10)), _Clause(lt(100)), _Clause(gte(100))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates((5,), {})), clauses[:2])
+        self.assertEquals(list(index.candidates((10,), {})), [clauses[1]])
+        self.assertEquals(list(index.candidates((99.5,), {})), [clauses[1]])
+        self.assertEquals(list(index.candidates((100,), {})), [clauses[2]])
+        self.assertEquals(list(index.candidates((float('inf'),), {})), [clauses[2]])
+
+    def test_closed_bounds(self):
+        clauses = [_Clause(lte(1)), _Clause(gt(1)), _Clause(OperatorGuard(operator.eq, 1))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates((1,), {})), [clauses[0], clauses[2]])
+        self.assertEquals(list(index.candidates((1.5,), {})), [clauses[1]])
+
+    def test_close_to(self):
+        clauses = [_Clause(close_to(1.0, 0.5)), _Clause(close_to(3.0, 0.5)), _Clause(not_none())]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates((1.2,), {})), [clauses[0], clauses[2]])
+        self.assertEquals(list(index.candidates((2.0,), {})), [clauses[2]])
+        self.assertEquals(list(index.candidates((3.4,), {})), [clauses[1], clauses[2]])
+
+    def test_and(self):
+        clauses = [_Clause(gt(0).and_(lt(10))), _Clause(gte(10))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates((5,), {})), [clauses[0]])
+        self.assertEquals(list(index.candidates((0,), {})), [])
+
+    def test_not_numbers(self):
+        clauses = [_Clause(lt(10)), _Clause(gte(10))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates(('a',), {})), clauses)
+        self.assertEquals(list(index.candidates((float('nan'),), {})), clauses)
+
+    def test_not_pruning_not_indexed(self):
+        self.assertIsNone(index_clauses([_Clause(begins_with('')), _Clause(ends_with(''))]))
+
+    def test_string_bounds_not_indexed(self):
+        self.assertIsNone(index_clauses([_Clause(lt('m'))]))
+
+
+class TestIndexedDispatch(TestCase):
+    def test_def(self):
+        @defpattern(1)
+        def foo(x, y):
+            return 'one'
+
+        @foo.pattern(lt(5), 'b')
+        def foo(x, y):
+            return 'small'
+
+        @foo.pattern(one_of(2, 3))
+        def foo(x, y):
+            return 'two or three'
+
+        self.assertEquals(foo(1, 'a'), 'one')
+        self.assertEquals(foo(2, 'b'), 'small')
+        self.assertEquals(foo(2, 'a'), 'two or three')
+        self.assertEquals(foo(x=3, y='a'), 'two or three')
+        self.assertRaises(MatchError, lambda: foo(9, 'a'))
+
+    def test_rebuilt_on_pattern(self):
+        @defpattern(1)
+        def foo(x):
+            return 1
+
+        self.assertRaises(MatchError, lambda: foo(2))
+
+        @foo.pattern(2)
+        def foo(x):
+            return 2
+
+        self.assertEquals(foo(2), 2)
+
+    def test_few_clauses_not_indexed(self):
+        @defpattern(1)
+        def foo(x):
+            return 1
+
+        for i in range(2, 4):
+            foo.pattern(i)(lambda x: x)
+
+        self.assertEquals(foo(3), 3)
+        self.assertIsNone(foo.snapshot.index)
+
+        foo.pattern(4)(lambda x: x)
+
+        self.assertEquals(foo(4), 4)
+        self.assertIsNotNone(foo.snapshot.index)
+
+    def test_candidates_ordered_once(self):
+        clauses = [_Clause(ValueGuard(1)), _Clause(one_of(2, 3)), _Clause(not_none())]
+        index = index_clauses(clauses)
+
+        self.assertIs(index.candidates((2,), {}), index.candidates((2,), {}))
+        self.assertEquals(index.candidates((2,), {}), (clauses[1], clauses[2]))
+
+    def test_member(self):
+        class Bar(object):
+            @pattern('a')
+            def that(self, x):
+                return 1
+
+            @that.pattern(one_of('b', 'c'))
+            def that(self, x):
+                return 2
+
+        item = Bar()
+        self.assertEquals(item.that('a'), 1)
+        self.assertEquals(item.that('c'), 2)
+        self.assertRaises(MatchError, lambda: item.that('d'))
+
+
+class TestRegexDiscriminator(TestCase):
+    def test_match(self):
+        clauses = [_Clause(regex('/api/v1/')), _Clause(regex('/api/')), _Clause(regex('/static/'))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates(('/api/v1/users',), {})), clauses[:2])
+        self.assertEquals(list(index.candidates(('/api/v2/users',), {})), [clauses[1]])
+        self.assertEquals(list(index.candidates(('/other',), {})), [])
+
+    def test_search(self):
+        clauses = [_Clause(regex('error', beginning=False)), _Clause(regex('^warn')),
+                   _Clause(regex('disk', beginning=False))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates(('disk error\nwarn',), {})), [clauses[0], clauses[2]])
+        self.assertEquals(list(index.candidates(('warn: disk',), {})), clauses[1:])
+
+    def test_flags_and_positions_grouped(self):
+        clauses = [_Clause(regex('abc', flag=re.IGNORECASE)), _Clause(regex('abc')), _Clause(regex('bc', pos=1))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates(('ABC',), {})), [clauses[0]])
+        self.assertEquals(list(index.candidates(('abc',), {})), clauses)
+
+    def test_unfusable_are_wildcards(self):
+        clauses = [_Clause(regex('(a)\\1')), _Clause(regex('(?i)b')), _Clause(regex('c'))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates(('aa',), {})), clauses[:2])
+        self.assertEquals(list(index.candidates(('c',), {})), clauses)
+
+    def test_not_strings(self):
+        clauses = [_Clause(regex('a')), _Clause(regex(b'a'))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates((b'a',), {})), clauses)
+        self.assertEquals(list(index.candidates((1,), {})), clauses)
+
+    def test_not_strings_dispatch(self):
+        @defpattern(regex('a'))
+        def foo(x):
+            return 'a'
+
+        for phrase in ('b', 'c'):
+            foo.pattern(regex(phrase))(lambda x: x)
+
+        @foo.pattern(not_none())
+        def foo(x):
+            return 'anything'
+
+        compiled = foo.compile()
+        self.assertEquals(foo('c'), 'c')
+        self.assertRaises(TypeError, lambda: foo(b'a'))
+        self.assertRaises(TypeError, lambda: compiled(b'a'))
+        self.assertRaises(TypeError, lambda: foo(1))
+        self.assertRaises(TypeError, lambda: compiled(1))
+
+
+class TestTrieDiscriminator(TestCase):
+    def test_prefixes(self):
+        clauses = [_Clause(begins_with('/api/v1/users')), _Clause(begins_with('/api/v1/')), _Clause(begins_with('/api')),
+                   _Clause(begins_with('/static'))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates(('/api/v1/users/1',), {})), clauses[:3])
+        self.assertEquals(list(index.candidates(('/api/v1/items',), {})), clauses[1:3])
+        self.assertEquals(list(index.candidates(('/api',), {})), [clauses[2]])
+        self.assertEquals(list(index.candidates(('/ap',), {})), [])
+
+    def test_suffixes(self):
+        clauses = [_Clause(ends_with('.tar.gz')), _Clause(ends_with('.gz')), _Clause(not_none())]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates(('a.tar.gz',), {})), clauses)
+        self.assertEquals(list(index.candidates(('a.gz',), {})), clauses[1:])
+        self.assertEquals(list(index.candidates(('a.txt',), {})), [clauses[2]])
+
+    def test_empty_phrase(self):
+        clauses = [_Clause(begins_with('')), _Clause(begins_with('a'))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates(('',), {})), [clauses[0]])
+        self.assertEquals(list(index.candidates(('ab',), {})), clauses)
+
+    def test_not_strings(self):
+        clauses = [_Clause(begins_with('a')), _Clause(begins_with('b'))]
+        index = index_clauses(clauses)
+
+        self.assertEquals(list(index.candidates((None,), {})), clauses)
+
+    def test_not_strings_dispatch(self):
+        class Path(str):
+            def startswith(self, prefix):
+                return True
+
+        @defpattern(begins_with('/api'))
+        def foo(x):
+            return 'api'
+
+        for phrase in ('/static', '/img'):
+            foo.pattern(begins_with(phrase))(lambda x: x)
+
+        @foo.pattern(not_none())
+        def foo(x):
+            return 'anything'
+
+        compiled = foo.compile()
+        self.assertEquals(foo('/img/a'), '/img/a')
+        self.assertEquals(foo(Path('/other')), 'api')
+        self.assertEquals(compiled(Path('/other')), 'api')
+        self.assertEquals(foo(1), 'anything')
+        self.assertEquals(compiled(1), 'anything')
+        self.assertRaises(TypeError, lambda: foo(b'/api'))
+        self.assertRaises(TypeError, lambda: compiled(b'/api'))
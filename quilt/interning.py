@@ -0,0 +1,125 @@
+from collections import OrderedDict
+from threading import Lock
+from weakref import WeakValueDictionary
+from .guard import ReverseGuard, AndGuard, OrGuard, OperatorGuard, ValueGuard, OneOfGuard, ContainsGuard, \
+    ContainsNOfGuard, LengthGuard, TypeOfGuard, CloseToGuard, NotNoneGuard, RegexGuard, BeginsWithGuard, EndsWithGuard, \
+    HasAttributeGuard, PatternGuard
+
+
+_interned = WeakValueDictionary()
+_interning = Lock()
+_slot_names = {}
+
+
+def _value(value):
+    """Returns the value together with its type, so that 1, 1.0 and True are told apart. Raises TypeError if the value
+    is unhashable."""
+    hash(value)
+    return type(value), value
+
+
+def _copy(guard):
+    """Returns a shallow copy of the Guard, filling in its slots directly since copy goes the long way round through
+    __reduce_ex__."""
+    guard_type = type(guard)
+    names = _slot_names.get(guard_type)
+    if names is None:
+        names = _slot_names[guard_type] = tuple(name for cls in guard_type.__mro__ for name in cls.__dict__.get(
+            '__slots__', ()) if name != '__weakref__')
+    duplicate = object.__new__(guard_type)
+    for name in names:
+        setattr(duplicate, name, getattr(guard, name))
+
+    return duplicate
+
+
+def _nested(guard):
+    """Returns the key of a Guard nested within another, the Guard itself if it has none so that it is compared by
+    identity."""
+    key = guard_key(guard)
+    return guard if key is None else key
+
+
+def guard_key(guard):
+    """Returns a hashable key which is the same for structurally equal Guards, those of the same class, with the same
+    values and at the same argument, or None if the Guard can not be described that way.
+
+    Only the exact Guard types are recognized. Subclasses are free to change the meaning of validate, hence the type
+    checks instead of isinstance. PlaceholderGuard, bound or not, has no key and is only ever equal to itself, as is
+    any Guard without a key nested within another.
+    """
+    guard_type = type(guard)
+    try:
+        if guard_type is ReverseGuard:
+            fields = (_nested(guard.inner),)
+        elif guard_type is AndGuard or guard_type is OrGuard:
+            fields = (_nested(guard.first), _nested(guard.second))
+        elif guard_type is PatternGuard:
+            fields = tuple(_nested(nested) for nested in guard.guards)
+        elif guard_type is OperatorGuard:
+            fields = (guard.op, _value(guard.value))
+        elif guard_type is ValueGuard:
+            fields = (_value(guard.value),)
+        elif guard_type is OneOfGuard or guard_type is ContainsGuard:
+            fields = (_value(guard.iterable),)
+        elif guard_type is ContainsNOfGuard:
+            fields = (guard.number, _value(guard.iterable))
+        elif guard_type is LengthGuard:
+            fields = (guard.op, _value(guard.length))
+        elif guard_type is TypeOfGuard:
+            fields = (guard.obj_type,)
+        elif guard_type is CloseToGuard:
+            fields = (guard.op, _value(guard.value), _value(guard.epsilon))
+        elif guard_type is NotNoneGuard:
+            fields = ()
+        elif guard_type is RegexGuard:
+            fields = (guard.regex, guard.pos, guard.beginning)
+        elif guard_type is BeginsWithGuard or guard_type is EndsWithGuard:
+            fields = (_value(guard.phrase),)
+        elif guard_type is HasAttributeGuard:
+            fields = (guard.attr,)
+        else:
+            return None
+        key = (guard_type, guard.arg_name, guard.arg_pos) + fields
+        hash(key)
+    except TypeError:
+        return None
+
+    return key
+
+
+def intern_guard(guard):
+    """Returns the one shared Guard structurally equal to the Guard, see guard_key, or the Guard itself if it has no
+    key.
+
+    The shared Guard is a copy of the first Guard seen, so that it is never one a caller holds on to and might go on to
+    rename in another pattern. It lives for as long as any clause uses it.
+    """
+    key = guard_key(guard)
+    if key is None:
+        return guard
+
+    with _interning:
+        try:
+            shared = _interned.get(key)
+            if shared is None:
+                shared = _copy(guard)
+                _interned[key] = shared
+        except TypeError:
+            return guard
+
+    return shared
+
+
+def shared_guards(clauses):
+    """Returns an OrderedDict from every Guard validating an argument of more than one of the GuardedFunction to the
+    list of those GuardedFunction, in order of declaration."""
+    users = OrderedDict()
+    for clause in clauses:
+        seen = set()
+        for guard in clause.guards if hasattr(clause, 'arg_guards') else ():
+            if id(guard) not in seen:
+                seen.add(id(guard))
+                users.setdefault(guard, []).append(clause)
+
+    return OrderedDict((guard, users[guard]) for guard in users if len(users[guard]) > 1)
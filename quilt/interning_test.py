@@ -0,0 +1,150 @@
+from unittest import TestCase
+from quilt.guard import *
+from quilt.interning import guard_key, intern_guard, shared_guards
+from quilt.proxy import defpattern, pattern
+
+
+def _positive(value):
+    return value > 0
+
+
+class TestGuardKey(TestCase):
+    def test_equal(self):
+        self.assertEquals(guard_key(gt(0)), guard_key(gt(0)))
+        self.assertEquals(guard_key(one_of('a', 'b')), guard_key(one_of('a', 'b')))
+        self.assertEquals(guard_key(begins_with('/api')), guard_key(begins_with('/api')))
+        self.assertEquals(guard_key(gt(0).and_(lt(10))), guard_key(gt(0).and_(lt(10))))
+
+    def test_not_equal(self):
+        self.assertNotEqual(guard_key(gt(0)), guard_key(gt(1)))
+        self.assertNotEqual(guard_key(gt(0)), guard_key(lt(0)))
+        self.assertNotEqual(guard_key(ValueGuard(1)), guard_key(ValueGuard(True)))
+        self.assertNotEqual(guard_key(begins_with('/api')), guard_key(ends_with('/api')))
+        self.assertNotEqual(guard_key(ValueGuard(1, arg_pos=0)), guard_key(ValueGuard(1, arg_pos=1)))
+        self.assertNotEqual(guard_key(ValueGuard(1, arg_name='x')), guard_key(ValueGuard(1, arg_name='y')))
+
+    def test_no_key(self):
+        self.assertIsNone(guard_key(PlaceholderGuard()))
+        self.assertIsNone(guard_key(PlaceholderGuard(_positive)))
+        self.assertIsNone(guard_key(ValueGuard([1])))
+        self.assertIsNone(guard_key(one_of([1], [2])))
+
+    def test_placeholder_identity(self):
+        bound, other = PlaceholderGuard(_positive), PlaceholderGuard(_positive)
+
+        self.assertEquals(guard_key(not_none().and_(bound)), guard_key(not_none().and_(bound)))
+        self.assertNotEqual(guard_key(not_none().and_(bound)), guard_key(not_none().and_(other)))
+
+
+class TestInternGuard(TestCase):
+    def test_shared(self):
+        first, second = gt(0), gt(0)
+        shared = intern_guard(first)
+
+        self.assertIs(intern_guard(second), shared)
+        self.assertIsNot(shared, first)
+        self.assertEquals(str(shared), str(first))
+
+    def test_no_key(self):
+        holder = PlaceholderGuard()
+
+        self.assertIs(intern_guard(holder), holder)
+
+
+class TestPatternInterning(TestCase):
+    def test_defpattern(self):
+        @defpattern(gt(0), one_of('a', 'b'))
+        def foo(x, y):
+            return 'first'
+
+        @foo.pattern(gt(0), one_of('c'))
+        def foo(x, y):
+            return 'second'
+
+        first, second = foo.proxy_cache
+
+        self.assertIs(first.arg_guards[0], second.arg_guards[0])
+        self.assertIsNot(first.arg_guards[1], second.arg_guards[1])
+        self.assertEquals(foo(1, 'c'), 'second')
+
+    def test_different_arguments(self):
+        @defpattern(gt(0))
+        def foo(x):
+            return 'x'
+
+        @foo.pattern(gt(0))
+        def foo(y):
+            return 'y'
+
+        @foo.pattern(y=gt(0))
+        def foo(x, y):
+            return 'x, y'
+
+        guards = [clause.arg_guards[-1] for clause in foo.proxy_cache]
+
+        self.assertEquals(len(set(map(id, guards))), 3)
+        self.assertEquals(foo(-1, 1), 'x, y')
+
+    def test_placeholders(self):
+        class Foo(object):
+            @pattern()
+            def bar(self, x):
+                return 'first'
+
+            @bar.pattern()
+            def bar(self, x):
+                return 'second'
+
+            @bar.x
+            def small(self, value):
+                return value < 10
+
+        first, second = Foo.__dict__['bar'].proxy_cache
+
+        self.assertIsNone(first.x.wrapped_func)
+        self.assertIsNotNone(second.x.wrapped_func)
+        self.assertEquals(Foo().bar(20), 'first')
+
+    def test_shared_guards(self):
+        @defpattern(gt(0), 1)
+        def foo(x, y):
+            return 'first'
+
+        @foo.pattern(gt(0), 2)
+        def foo(x, y):
+            return 'second'
+
+        @foo.pattern(lt(0), 2)
+        def foo(x, y):
+            return 'third'
+
+        shared = shared_guards(foo.proxy_cache)
+
+        first, second, third = foo.proxy_cache
+
+        self.assertEquals(list(shared), [first.arg_guards[0], second.arg_guards[1]])
+        self.assertEquals(list(shared.values()), [[first, second], [second, third]])
+
+    def test_failed_check_shared(self):
+        calls = []
+        bound = PlaceholderGuard()
+
+        @bound
+        def counted(value):
+            calls.append(value)
+            return False
+
+        @defpattern(type_of(int), not_none().and_(bound))
+        def foo(x, y):
+            return 'first'
+
+        @foo.pattern(type_of(int), not_none().and_(bound))
+        def foo(x, y):
+            return 'second'
+
+        @foo.pattern(type_of(int))
+        def foo(x, y):
+            return 'third'
+
+        self.assertEquals(foo(1, 2), 'third')
+        self.assertEquals(calls, [2])
@@ -0,0 +1,110 @@
+from collections import OrderedDict, namedtuple
+from threading import RLock
+from time import monotonic
+from .guard import PlaceholderGuard
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+_KWD_MARK = object()
+
+
+def make_key(args, kwargs):
+    """Builds a hashable key from the call arguments. The argument types are part of the key so that a TypeOfGuard never
+    sees the result of an equal value of another type, 1 and 1.0 for instance."""
+    key = args + tuple(type(value) for value in args)
+    if kwargs:
+        items = tuple(kwargs.items())
+        key += (_KWD_MARK,) + items + tuple(type(value) for _, value in items)
+
+    return key
+
+
+class MemoizedProxy(object):
+    """Callable wrapper around a DefProxy caching results keyed on the call arguments, with least recently used eviction
+    and an optional time to live.
+
+    The cache is cleared whenever the clauses of the wrapped DefProxy change or any PlaceholderGuard is bound. Calls
+    with unhashable arguments and calls raising an exception, MatchError included, are never cached. As with
+    functools.lru_cache, only pure functions should be memoized.
+
+    MemoizedProxy should not be constructed on its own, see DefProxy.cached. All other attributes are those of the
+    wrapped DefProxy.
+
+    :param proxy: The wrapped DefProxy
+    :param maxsize: The maximum number of results kept, None for no bound.
+    :param ttl: The number of seconds a result is kept, None for no expiry.
+    :param timer: A function returning the current time in seconds, defaults to time.monotonic
+    """
+
+    def __init__(self, proxy, maxsize=128, ttl=None, timer=monotonic):
+        self.proxy = proxy
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.generation = (proxy.version, PlaceholderGuard.bindings)
+        self.lock = RLock()
+
+    def __getattr__(self, item):
+        return getattr(self.proxy, item)
+
+    def __str__(self):
+        return self.__print__(str)
+
+    def __repr__(self):
+        return self.__print__(repr)
+
+    def __print__(self, f):
+        return 'MemoizedProxy(proxy=' + f(self.proxy) + ', maxsize=' + f(self.maxsize) + ', ttl=' + f(self.ttl) + ')'
+
+    def cache_info(self):
+        """Returns the hits, misses, maxsize and current size of the cache."""
+        with self.lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self.results))
+
+    def cache_clear(self):
+        """Empties the cache and resets its statistics."""
+        with self.lock:
+            self.results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __call__(self, *args, **kwargs):
+        generation = (self.proxy.version, PlaceholderGuard.bindings)
+        if generation != self.generation:
+            with self.lock:
+                self.results.clear()
+                self.generation = generation
+
+        try:
+            key = make_key(args, kwargs)
+            hash(key)
+        except TypeError:
+            return self.proxy(*args, **kwargs)
+
+        with self.lock:
+            found = self.results.get(key)
+            if found is not None and (found[0] is None or found[0] > self.timer()):
+                self.results.move_to_end(key)
+                self.hits += 1
+                return found[1]
+            self.misses += 1
+
+        result = self.proxy(*args, **kwargs)
+        if self.maxsize == 0:
+            return result
+
+        expires = None if self.ttl is None else self.timer() + self.ttl
+        with self.lock:
+            if generation != self.generation:
+                return result
+            self.results[key] = (expires, result)
+            self.results.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self.results) > self.maxsize:
+                    self.results.popitem(last=False)
+
+        return result
@@ -0,0 +1,139 @@
+from unittest import TestCase
+from quilt.guard import *
+from quilt.proxy import defpattern
+from quilt.exc import MatchError
+
+
+class _Clock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMemoizedProxy(TestCase):
+    def setUp(self):
+        self.calls = []
+
+        @defpattern(lt(0))
+        def foo(x):
+            self.calls.append(x)
+            return 'negative'
+
+        @foo.pattern(type_of(float))
+        def foo(x):
+            self.calls.append(x)
+            return 'float'
+
+        @foo.pattern(gte(0))
+        def foo(x):
+            self.calls.append(x)
+            return 'positive'
+
+        self.foo = foo
+
+    def tearDown(self):
+        self.foo = None
+
+    def test_hit(self):
+        cached = self.foo.cached()
+
+        self.assertEquals(cached(1), 'positive')
+        self.assertEquals(cached(1), 'positive')
+        self.assertEquals(self.calls, [1])
+        self.assertEquals(cached.cache_info(), (1, 1, 128, 1))
+
+    def test_types_kept_apart(self):
+        cached = self.foo.cached()
+
+        self.assertEquals(cached(1), 'positive')
+        self.assertEquals(cached(1.0), 'float')
+
+    def test_keywords(self):
+        cached = self.foo.cached()
+
+        self.assertEquals(cached(x=-1), 'negative')
+        self.assertEquals(cached(-1), 'negative')
+        self.assertEquals(cached(x=-1), 'negative')
+        self.assertEquals(self.calls, [-1, -1])
+
+    def test_lru(self):
+        cached = self.foo.cached(maxsize=2)
+        cached(1)
+        cached(2)
+        cached(1)
+        cached(3)
+        cached(1)
+        cached(2)
+
+        self.assertEquals(self.calls, [1, 2, 3, 2])
+        self.assertEquals(cached.cache_info().currsize, 2)
+
+    def test_ttl(self):
+        cached = self.foo.cached(ttl=10)
+        cached.timer = clock = _Clock()
+        cached(1)
+        clock.now = 5.0
+        cached(1)
+        clock.now = 10.0
+        cached(1)
+
+        self.assertEquals(self.calls, [1, 1])
+
+    def test_clear(self):
+        cached = self.foo.cached()
+        cached(1)
+        cached.cache_clear()
+        cached(1)
+
+        self.assertEquals(self.calls, [1, 1])
+        self.assertEquals(cached.cache_info(), (0, 1, 128, 1))
+
+    def test_unhashable(self):
+        cached = self.foo.cached()
+
+        self.assertRaises(MatchError, lambda: cached([1]))
+        self.assertEquals(cached.cache_info().currsize, 0)
+
+    def test_miss_not_cached(self):
+        cached = self.foo.cached()
+
+        self.assertRaises(MatchError, lambda: cached('a'))
+        self.assertEquals(cached.cache_info().currsize, 0)
+
+    def test_invalidated_by_pattern(self):
+        cached = self.foo.cached()
+        self.assertEquals(cached(0), 'positive')
+
+        @self.foo.pattern(0)
+        def foo(x):
+            return 'zero'
+
+        @self.foo.pattern(-5)
+        def foo(x):
+            return 'never'
+
+        self.assertEquals(cached(0), 'positive')
+        self.assertEquals(self.calls, [0, 0])
+
+    def test_invalidated_by_placeholder(self):
+        @defpattern(0)
+        def bar(x, y):
+            return 'zero'
+
+        @bar.pattern(1)
+        def bar(x, y):
+            return 'one'
+
+        cached = bar.cached()
+        self.assertEquals(cached(1, 5), 'one')
+
+        @bar.y
+        def limit(value):
+            return value < 3
+
+        self.assertRaises(MatchError, lambda: cached(1, 5))
+
+    def test_attributes(self):
+        self.assertEquals(self.foo.cached().__name__, 'foo')
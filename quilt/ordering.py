@@ -0,0 +1,136 @@
+import json
+import os
+from inspect import Parameter, signature
+from tempfile import NamedTemporaryFile
+from .index import _hash_keys, _interval, _contains, _is_number
+
+
+def _overlap(first, second):
+    """Returns a boolean indicating if two intervals (low, low closed, high, high closed) share any number."""
+    low = max(first[:2], second[:2], key=lambda bound: (bound[0], not bound[1]))
+    high = min(first[2:], second[2:], key=lambda bound: (bound[0], bound[1]))
+    return low[0] < high[0] or (low[0] == high[0] and low[1] and high[1])
+
+
+def _disjoint(first_keys, first_interval, second_keys, second_interval):
+    """Returns a boolean indicating if no value lies both in the first hash keys or interval and in the second, see
+    disjoint_guards."""
+    if first_keys is not None and second_keys is not None:
+        return first_keys.isdisjoint(second_keys)
+
+    if first_interval is not None and second_interval is not None:
+        return not _overlap(first_interval, second_interval)
+    elif first_keys is not None and second_interval is not None:
+        keys, interval = first_keys, second_interval
+    elif second_keys is not None and first_interval is not None:
+        keys, interval = second_keys, first_interval
+    else:
+        return False
+
+    return all(_is_number(key) and not _contains(interval, key) for key in keys)
+
+
+def disjoint_guards(first, second):
+    """Returns a boolean indicating if no value can be validated by both Guards, True only if that can be proven from
+    their hashable values or numeric intervals. As with the clause index, values are assumed to compare sanely."""
+    return _disjoint(_hash_keys(first), _interval(first), _hash_keys(second), _interval(second))
+
+
+def _required(clause):
+    """Returns the set of names of the arguments every call to the function of the GuardedFunction must supply."""
+    try:
+        parameters = signature(clause.underlying_func).parameters.values()
+    except (TypeError, ValueError):
+        return set()
+
+    return set(parameter.name for parameter in parameters if parameter.default is Parameter.empty and
+               parameter.kind in (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD))
+
+
+def _described(clause):
+    """Returns the list of (name, hash keys, interval) of the positional Guards of the GuardedFunction, in order, with
+    None for those whose argument has no name or may be left out. Anything without Guards to inspect describes none."""
+    if not hasattr(clause, 'arg_guards'):
+        return []
+
+    required = _required(clause)
+    return [(guard.arg_name, _hash_keys(guard), _interval(guard)) if guard.arg_name in required else None
+            for guard in clause.arg_guards]
+
+
+def _disjoint_described(first, second):
+    """Returns a boolean indicating if no call can be matched by both GuardedFunction described by _described."""
+    for first_guard, second_guard in zip(first, second):
+        if first_guard is not None and second_guard is not None and first_guard[0] == second_guard[0] and \
+                _disjoint(first_guard[1], first_guard[2], second_guard[1], second_guard[2]):
+            return True
+
+    return False
+
+
+def disjoint(first, second):
+    """Returns a boolean indicating if no call can be matched by both GuardedFunction.
+
+    Two GuardedFunction are disjoint if they guard the same required argument, at the same position and under the same
+    name, with disjoint Guards. The argument is then validated by both whether it is passed by position or by name.
+    Anything without Guards to inspect is never disjoint.
+    """
+    return _disjoint_described(_described(first), _described(second))
+
+
+def reorder_clauses(clauses, wins):
+    """Returns the clauses ordered by descending number of wins as far as that can not change which clause matches any
+    call. Ties keep their current order.
+
+    Each clause in turn moves ahead of the clauses placed before it with fewer wins, for as long as it is disjoint from
+    each of them. Only clauses whose relative order changes, and the one a clause stops behind, are ever compared, and
+    the Guards and signature of every clause are only inspected once.
+
+    :param clauses: The ordered collection of GuardedFunction
+    :param wins: A dict from GuardedFunction to the number of calls it won
+    """
+    ordered = []
+    for clause in clauses:
+        won, described = wins.get(clause, 0), _described(clause)
+        i = len(ordered)
+        while i and ordered[i - 1][0] < won and _disjoint_described(ordered[i - 1][1], described):
+            i -= 1
+        ordered.insert(i, (won, described, clause))
+
+    return [clause for _, _, clause in ordered]
+
+
+def profile_key(proxy):
+    """Returns the name a proxy is saved under in a profile file, the module and qualified name of its functions, or
+    None if it has no clause left to be named after."""
+    most_recent = proxy.most_recent
+    if most_recent is None:
+        return None
+
+    func = most_recent.underlying_func
+    return func.__module__ + '.' + func.__qualname__
+
+
+def clause_key(clause):
+    """Returns the name a GuardedFunction is saved under in a profile file, the line its function was defined on, or None
+    if it has none."""
+    code = getattr(getattr(clause, 'underlying_func', None), '__code__', None)
+    return None if code is None else str(code.co_firstlineno)
+
+
+def load_profiles(path):
+    """Returns the dict of proxy name to dict of clause name to wins saved in the file, empty if there is no file."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_profiles(path, profiles):
+    """Writes the dict of proxy name to dict of clause name to wins to the file, replacing it in one step so that readers
+    never see a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    with NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False) as f:
+        json.dump(profiles, f, indent=1, sort_keys=True)
+    os.replace(f.name, path)
@@ -0,0 +1,140 @@
+import os
+from tempfile import mkdtemp
+from unittest import TestCase
+from quilt.guard import *
+from quilt.ordering import disjoint_guards, disjoint, reorder_clauses
+from quilt.proxy import defpattern
+from quilt.exc import MatchError
+
+
+def _guarded(*guards):
+    @defpattern(*guards)
+    def foo(x, y):
+        return guards
+
+    return foo.most_recent
+
+
+class TestDisjoint(TestCase):
+    def test_values(self):
+        self.assertTrue(disjoint_guards(ValueGuard(1), one_of(2, 3)))
+        self.assertFalse(disjoint_guards(ValueGuard(1), one_of(1.0, 3)))
+
+    def test_intervals(self):
+        self.assertTrue(disjoint_guards(lt(0), gte(0)))
+        self.assertFalse(disjoint_guards(lte(0), gte(0)))
+        self.assertTrue(disjoint_guards(gt(0).and_(lt(10)), close_to(20, 1)))
+
+    def test_values_and_intervals(self):
+        self.assertTrue(disjoint_guards(one_of(-1, -2), gt(0)))
+        self.assertFalse(disjoint_guards(one_of(-1, 2), gt(0)))
+        self.assertFalse(disjoint_guards(ValueGuard('a'), gt(0)))
+
+    def test_unknown(self):
+        self.assertFalse(disjoint_guards(type_of(int), type_of(str)))
+        self.assertFalse(disjoint_guards(not_equal_to(1), ValueGuard(1)))
+
+    def test_clauses(self):
+        self.assertTrue(disjoint(_guarded(1), _guarded(2)))
+        self.assertTrue(disjoint(_guarded(1, 1), _guarded(1, 2)))
+        self.assertFalse(disjoint(_guarded(1, 1), _guarded(lt(5), 1)))
+
+    def test_optional_argument(self):
+        @defpattern(1)
+        def foo(x=1):
+            return 1
+
+        @foo.pattern(2)
+        def foo(x=2):
+            return 2
+
+        self.assertFalse(disjoint(*foo.proxy_cache))
+
+
+class TestReorder(TestCase):
+    def test_by_wins(self):
+        clauses = [_guarded(1), _guarded(2), _guarded(3)]
+        wins = {clauses[1]: 5, clauses[2]: 10}
+
+        self.assertEquals(reorder_clauses(clauses, wins), [clauses[2], clauses[1], clauses[0]])
+
+    def test_overlap_kept_in_order(self):
+        clauses = [_guarded(lt(10)), _guarded(lt(5)), _guarded(gte(10))]
+        wins = {clauses[1]: 5, clauses[2]: 10}
+
+        self.assertEquals(reorder_clauses(clauses, wins), [clauses[2], clauses[0], clauses[1]])
+
+    def test_blocked_behind_overlap(self):
+        clauses = [_guarded(lt(10)), _guarded(1), _guarded(lt(5)), _guarded(20)]
+        wins = {clauses[1]: 1, clauses[2]: 5, clauses[3]: 10}
+
+        self.assertEquals(reorder_clauses(clauses, wins), [clauses[3], clauses[0], clauses[1], clauses[2]])
+
+    def test_many(self):
+        clauses = [_guarded(i) for i in range(300)]
+        wins = dict((clause, i) for i, clause in enumerate(clauses))
+
+        self.assertEquals(reorder_clauses(clauses, wins), clauses[::-1])
+
+
+class TestProfiledProxy(TestCase):
+    def setUp(self):
+        @defpattern(lt(0))
+        def foo(x):
+            return 'negative'
+
+        @foo.pattern(0)
+        def foo(x):
+            return 'zero'
+
+        @foo.pattern(gt(0))
+        def foo(x):
+            return 'positive'
+
+        self.foo = foo
+        self.path = os.path.join(mkdtemp(), 'profile.json')
+
+    def tearDown(self):
+        self.foo = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        os.rmdir(os.path.dirname(self.path))
+
+    def test_profile(self):
+        self.foo.profile()
+        self.foo(1)
+        self.foo(2)
+        self.foo.profile(False)
+        self.foo(3)
+
+        self.assertEquals(list(self.foo.wins.values()), [2])
+
+    def test_reorder(self):
+        self.foo.profile()
+        for x in [1, 2, 0]:
+            self.foo(x)
+        self.foo.reorder()
+
+        self.assertEquals([clause.underlying_func(1) for clause in self.foo.proxy_cache],
+                          ['positive', 'zero', 'negative'])
+        self.assertEquals([self.foo(x) for x in [-1, 0, 1]], ['negative', 'zero', 'positive'])
+        self.assertRaises(MatchError, lambda: self.foo('a'))
+
+    def test_save_and_load(self):
+        self.foo.profile()
+        self.foo(1)
+        self.foo.save_profile(self.path)
+
+        @defpattern(lt(0))
+        def foo(x):
+            return 'negative'
+
+        @foo.pattern(gt(0))
+        def foo(x):
+            return 'positive'
+
+        foo.load_profile(self.path)
+        self.assertEquals(foo.proxy_cache[0].underlying_func(1), 'negative')
+
+        self.foo.load_profile(self.path)
+        self.assertEquals(self.foo.proxy_cache[0].underlying_func(1), 'positive')
@@ -1,8 +1,45 @@
 from .guard import PlaceholderGuard
 from .exc import MatchError
+from .interning import intern_guard
 from itertools import chain, tee
-from inspect import getargspec
-from functools import update_wrapper
+from inspect import signature, Parameter
+from threading import RLock
+from types import FunctionType, MethodType
+
+
+_POSITIONAL = (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)
+_finalizing = RLock()
+
+
+def arg_names(func):
+    """Returns the list of names of the positional parameters of the function, those getargspec used to return. They
+    are read straight from the code object of plain functions and only inspected for other callables."""
+    code = getattr(func, '__code__', None)
+    if code is not None:
+        return list(code.co_varnames[:code.co_argcount])
+
+    return [name for name, parameter in signature(func).parameters.items() if parameter.kind in _POSITIONAL]
+
+
+def _clause_frame(function, func, name=None):
+    """Returns a copy of the function whose frames are named after the function func, the line it is declared on and
+    name, defaulting to the name of the function, so that profilers attribute the time spent validating to the clause
+    rather than to GuardedFunction as a whole."""
+    code = getattr(function, '__code__', None)
+    target = getattr(func, '__code__', None)
+    if code is None or target is None or not hasattr(code, 'replace'):
+        return function
+
+    name = getattr(func, '__qualname__', func.__name__) + ':' + str(target.co_firstlineno) + '.' + \
+        (name or function.__name__)
+    changes = {'co_name': name}
+    if hasattr(code, 'co_qualname'):
+        changes['co_qualname'] = name
+    framed = FunctionType(code.replace(**changes), function.__globals__, name, function.__defaults__,
+                          function.__closure__)
+    framed.__qualname__ = name
+
+    return framed
 
 
 class Pattern(object):
@@ -11,7 +48,11 @@ class Pattern(object):
 
     Pattern should not be used on its own. It is designed to be used as a base class with inheriting classes defining
     the scope of useage. Instances of Pattern are designed to be returned from a decorator function/class and used once
-    due to the side-effecting nature of the __call__ method.
+    due to the side-effecting nature of the finalize method.
+
+    Calling a Pattern only wraps the function. Naming and positioning the Guards, creating the PlaceholderGuard and
+    interning the Guards are left to finalize, which the GuardedFunction calls when it is first used, so that declaring
+    many patterns costs little until they are called.
 
     :param arg_guards: A sorted list of Guard that have had the arg_pos variable set to something other than None.
     Sorting is by arg_pos.
@@ -40,12 +81,20 @@ class Pattern(object):
         return self.__name__ + '(guards=[' + ', '.join(map(f, self.guards)) + '])'
 
     def __call__(self, func):
-        (arg_names, varg_name, kwarg_name, _) = getargspec(func)
+        return GuardedFunction(func, pattern=self)
+
+    def arg_names(self, func):
+        return arg_names(func)
+
+    def finalize(self, guarded):
+        """Completes the GuardedFunction of the function wrapped by this Pattern."""
+        func = guarded.underlying_func
+        names = self.arg_names(func)
         found_names = set()
-        found_names.update(self._name_arg_guards(arg_names))
-        found_names.update(self._position_kwarg_guards(arg_names))
+        found_names.update(self._name_arg_guards(names))
+        found_names.update(self._position_kwarg_guards(names))
 
-        return self._create_guarded(arg_names, found_names, func)
+        self._create_guarded(names, found_names, func, guarded)
 
     def _name_arg_guards(self, arg_names):
         """Assigns the argument name to the arg_guards list in the order of appearance in the function's argument list.
@@ -67,37 +116,75 @@ class Pattern(object):
 
         return names
 
-    def _create_guarded(self, arg_names, found_names, func):
-        """Creates the GuardedFunction. For any function argument not found within the arg_guards or kwarg_guards lists
-        creates and sets a new PlaceholderGuard on a attribute with matching name."""
-        guarded = GuardedFunction(func)
+    def _create_guarded(self, arg_names, found_names, func, guarded):
+        """Completes the GuardedFunction. For any function argument not found within the arg_guards or kwarg_guards lists
+        creates a new PlaceholderGuard looked up as the attribute with matching name. Every other Guard is interned, so
+        that structurally equal Guards of different clauses are one and the same."""
         held_guards = []
         for i, name in enumerate(arg_names):
             if name not in found_names:
-                holder = PlaceholderGuard(arg_name=name, arg_pos=i)
-                setattr(guarded, name, holder)
-                held_guards.append(holder)
-
-        (arg, kw) = tee(chain(self.arg_guards, self.kwarg_guards, held_guards))
-        guarded.arg_guards = sorted((x for x in arg if x.arg_pos is not None), key=lambda x: x.arg_pos)
-        guarded.kwarg_guards = dict((g.arg_name, g) for g in kw if g.arg_name is not None)
-        update_wrapper(guarded, func)
+                held_guards.append(PlaceholderGuard(arg_name=name, arg_pos=i))
+        if held_guards:
+            guarded.placeholders = dict((holder.arg_name, holder) for holder in held_guards)
 
-        return guarded
+        (arg, kw) = tee(chain(map(intern_guard, chain(self.arg_guards, self.kwarg_guards)), held_guards))
+        guarded.complete(sorted((x for x in arg if x.arg_pos is not None), key=lambda x: x.arg_pos),
+                         dict((g.arg_name, g) for g in kw if g.arg_name is not None))
 
 
 class MemberFunctionPattern(Pattern):
     def __init__(self, arg_guards, kwarg_guards):
         super(MemberFunctionPattern, self).__init__(arg_guards, kwarg_guards)
 
-    def __call__(self, func):
-        (arg_names, varg_name, kwarg_name, _) = getargspec(func)
-        arg_names = arg_names[1:]
-        found_names = set()
-        found_names.update(self._name_arg_guards(arg_names))
-        found_names.update(self._position_kwarg_guards(arg_names))
+    def arg_names(self, func):
+        return arg_names(func)[1:]
+
+
+def _validate(self, *args, **kwargs):
+    for value, guard in zip(args, self.arg_guards):
+        if not guard.validate(value):
+            return False
+    if kwargs:
+        for kw, guard in self.kwarg_guards.items():
+            if kw in kwargs and not guard.validate(kwargs[kw]):
+                return False
+
+    return True
+
+
+def _validate_instance(self, instance=None, owner=None, *args, **kwargs):
+    for value, guard in zip(args, self.arg_guards):
+        if not guard.validate_instance(value, instance, owner):
+            return False
+    if kwargs:
+        for kw, guard in self.kwarg_guards.items():
+            if kw in kwargs and not guard.validate_instance(kwargs[kw], instance, owner):
+                return False
+
+    return True
 
-        return self._create_guarded(arg_names, found_names, func)
+
+_VALIDATORS = {'validate': _validate, 'validate_instance': _validate_instance}
+
+
+class _FunctionAttribute(object):
+    """Descriptor reading the named attribute of the wrapped function of a GuardedFunction. Read on the class, gives the
+    value of the class itself, so that GuardedFunction keeps its docstring. The class __module__ is read by type without
+    going through the descriptor."""
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self.value
+        return getattr(instance.underlying_func, self.name, None)
+
+
+def _guarded(underlying_func, arg_guards, kwarg_guards):
+    """Unpickles a GuardedFunction. GuardedFunction is not pickled itself as its __module__ is that of its function."""
+    return GuardedFunction(underlying_func, arg_guards, kwarg_guards)
 
 
 class GuardedFunction(object):
@@ -105,11 +192,68 @@ class GuardedFunction(object):
     the wrapped function.
 
     GuardedFunction can be used on it's own, although it is recommended not to expose
+
+    Each GuardedFunction validates through its own copy of validate and validate_instance named after the wrapped
+    function, so that profilers such as cProfile and py-spy tell the clauses apart. Each copy is made the first time it
+    is looked up.
+
+    A GuardedFunction created by a Pattern is pending until finalize is called, which happens implicitly the first time
+    an attribute only set by finalize, such as arg_guards or a PlaceholderGuard, is looked up.
+
+    GuardedFunction has no __dict__. The __name__, __doc__, __module__ and every other attribute of the wrapped function,
+    including those set on it by other decorators, are looked up on it rather than copied, and __wrapped__ is the
+    wrapped function itself.
+
+    :param underlying_func: The wrapped function
+    :param arg_guards: The list of Guard by argument position, defaults to none
+    :param kwarg_guards: The dict of Guard by argument name, defaults to none
+    :param pattern: The Pattern to finalize the GuardedFunction with, defaults to None for a complete GuardedFunction
     """
-    def __init__(self, underlying_func, arg_guards=None, kwarg_guards=None):
+    __slots__ = ('underlying_func', 'arg_guards', 'kwarg_guards', 'placeholders', 'validate', 'validate_instance',
+                 '_pending')
+    __doc__ = _FunctionAttribute('__doc__', __doc__)
+    __module__ = _FunctionAttribute('__module__', __name__)
+
+    def __init__(self, underlying_func, arg_guards=None, kwarg_guards=None, pattern=None):
         self.underlying_func = underlying_func
-        self.arg_guards = arg_guards or []
-        self.kwarg_guards = kwarg_guards or dict()
+        self.placeholders = None
+        self._pending = pattern
+        if pattern is None:
+            self.complete(arg_guards or [], kwarg_guards or dict())
+
+    def complete(self, arg_guards, kwarg_guards):
+        self.arg_guards = arg_guards
+        self.kwarg_guards = kwarg_guards
+
+    def finalize(self):
+        """Completes the GuardedFunction with its Pattern if it is still pending. Threads finalizing at once wait for
+        one another, and the pending Pattern is only dropped once everything is in place."""
+        if self._pending is not None:
+            with _finalizing:
+                pattern = self._pending
+                if pattern is not None:
+                    pattern.finalize(self)
+                    self._pending = None
+
+        return self
+
+    def __getattr__(self, item):
+        if self._pending is not None:
+            return getattr(self.finalize(), item)
+        if item in _VALIDATORS:
+            validate = MethodType(_clause_frame(_VALIDATORS[item], self.underlying_func, item), self)
+            setattr(self, item, validate)
+            return validate
+        if self.placeholders is not None and item in self.placeholders:
+            return self.placeholders[item]
+        if item == '__wrapped__':
+            return self.underlying_func
+
+        return getattr(self.underlying_func, item)
+
+    @property
+    def __name__(self):
+        return self.underlying_func.__name__
 
     @property
     def __class__(self):
@@ -128,16 +272,22 @@ class GuardedFunction(object):
     def guards(self):
         return chain(self.arg_guards, self.kwarg_guards.values())
 
-    def validate(self, *args, **kwargs):
-        return all(guard.validate(value) for value, guard in zip(args, self.arg_guards)) and \
-            all(guard.validate(kwargs[kw]) for kw, guard in self.kwarg_guards.items() if kw in kwargs)
-
-    def validate_instance(self, instance=None, owner=None, *args, **kwargs):
-        return all(guard.validate_instance(value, instance, owner) for value, guard in zip(args, self.arg_guards)) and \
-            all(guard.validate_instance(kwargs[kw], instance, owner) for kw, guard in self.kwarg_guards.items()
-                if kw in kwargs)
+    def guard_pairs(self, args, kwargs):
+        """Yields the (value, Guard) pairs validate checks for the arguments, in the order it checks them, each positional
+        argument with the Guard at its position followed by each keyword argument with the Guard of its name."""
+        for pair in zip(args, self.arg_guards):
+            yield pair
+        if kwargs:
+            for kw, guard in self.kwarg_guards.items():
+                if kw in kwargs:
+                    yield kwargs[kw], guard
+
+    def __reduce__(self):
+        self.finalize()
+        return _guarded, (self.underlying_func, self.arg_guards, self.kwarg_guards), \
+            (None, {'placeholders': self.placeholders})
 
     def __call__(self, *args, **kwargs):
         if self.validate(*args, **kwargs):
             return self.underlying_func(*args, **kwargs)
-        raise MatchError(*args, **kwargs)
\ No newline at end of file
+        raise MatchError(*args, **kwargs)
@@ -130,6 +130,7 @@ class TestMemberFuncPattern(TestCase):
         def that(x, foo):
             return 1
 
+        that.finalize()
         self.assertEquals(self.guard.arg_pos, 0)
         self.assertEquals(that(1, 1), 1)
         self.assertEquals(that(x=2, foo=1), 1)
@@ -236,8 +237,80 @@ class TestFunctionProxy(TestCase):
         proxy = FunctionProxy([one, two])
         self.assertEquals(proxy(1), 1)
 
+    def test_fields(self):
+        proxy = FunctionProxy([], 1, int)
+
+        self.assertEquals(proxy.proxy_cache, [])
+        self.assertEquals(proxy.instance, 1)
+        self.assertEquals(proxy.owner, int)
+
+    def test_bound_equality(self):
+        class Bar(object):
+            @pattern()
+            def that(self, x):
+                return x
+
+        item = Bar()
+        self.assertIsInstance(item.that, FunctionProxy)
+        self.assertEquals(item.that, item.that)
+        self.assertNotEqual(item.that, Bar().that)
+        self.assertEquals(hash(item.that), hash(item.that))
+
+    def test_not_a_tuple(self):
+        class Bar(object):
+            __hash__ = None
+
+            def __eq__(self, other):
+                return True
+
+            @pattern()
+            def that(self, x):
+                return x
+
+            def counted(self, x):
+                return x
+            counted.index = 'delegated'
+            that = that.pattern()(counted)
+
+        item = Bar()
+        self.assertEquals(hash(item.that), hash(item.that))
+        self.assertNotEqual(item.that, Bar().that)
+        self.assertNotIsInstance(item.that, tuple)
+        self.assertRaises(TypeError, lambda: len(item.that))
+        self.assertEquals(item.that.index, 'delegated')
+
 
 class TestGuardedFunction(TestCase):
+    def test_function_attributes(self):
+        def f(x):
+            """Doubles x."""
+            return x * 2
+        f.route = '/x'
+        guard = GuardedFunction(f)
+
+        for name in ('__name__', '__qualname__', '__doc__', '__module__', '__code__', '__defaults__', 'route'):
+            self.assertEquals(getattr(guard, name), getattr(f, name))
+        self.assertIs(guard.__wrapped__, f)
+        self.assertRaises(AttributeError, lambda: guard.missing)
+
+    def test_defpattern_attributes(self):
+        def route(path):
+            def decorate(func):
+                func.route = path
+                return func
+            return decorate
+
+        @defpattern(gt(0))
+        @route('/x')
+        def foo(x):
+            """Positive x."""
+            return x
+
+        self.assertEquals(foo.route, '/x')
+        self.assertEquals(foo.most_recent.__doc__, 'Positive x.')
+        self.assertEquals(foo.most_recent.__module__, __name__)
+        self.assertEquals(foo.__module__, __name__)
+
     def test_unguarded(self):
         def f(x):
             return x
@@ -288,3 +361,14 @@ class TestGuardedFunction(TestCase):
         self.assertRaises(MatchError, lambda: guard(2, y=1))
         self.assertRaises(MatchError, lambda: guard(x=1, y=2))
         self.assertRaises(MatchError, lambda: guard(x=2, y=1))
+
+    def test_guard_pairs(self):
+        def f(x, y):
+            return x+y
+        value1 = ValueGuard(1, arg_name='x', arg_pos=0)
+        value2 = ValueGuard(1, arg_name='y', arg_pos=1)
+        guard = GuardedFunction(f, [value1, value2], {value1.arg_name: value1, value2.arg_name: value2})
+
+        self.assertEquals(list(guard.guard_pairs((3, 4), {})), [(3, value1), (4, value2)])
+        self.assertEquals(list(guard.guard_pairs((3,), {'y': 4})), [(3, value1), (4, value2)])
+        self.assertEquals(list(guard.guard_pairs((), {'y': 4, 'z': 5})), [(4, value2)])
@@ -0,0 +1,87 @@
+import pickle
+from unittest import TestCase
+from quilt.guard import *
+from quilt.proxy import defpattern, pattern
+from quilt.exc import MatchError
+
+
+@defpattern()
+def sign(x):
+    return 'negative'
+
+
+@sign.x
+def negative(value):
+    return -10 < value < 0
+
+
+@sign.pattern(gte(0))
+def sign(x):
+    return 'positive'
+
+
+def double(x):
+    return 2 * x
+
+
+class Shape(object):
+    @pattern(0)
+    def area(self, x):
+        return 'empty'
+
+    @area.pattern()
+    def area(self, x):
+        return x * x
+
+
+def _round_trip(obj):
+    return pickle.loads(pickle.dumps(obj))
+
+
+class TestPickleGuards(TestCase):
+    def test_guards(self):
+        guards = [(ValueGuard(1), 1), (lt(5), 1), (one_of(1, 2), 1), (contains('a'), 'abc'),
+                  (has_n_of(1, 'a', 'b'), 'abc'), (longer_than(2), 'abc'), (close_to(1.0, 0.1), 1), (not_none(), 1),
+                  (regex('a+'), 'abc'), (begins_with('a'), 'abc'), (ends_with('z'), 'abc'), (type_of(int), 1),
+                  (lt(0).or_(gt(10)), 1), (gt(0).and_(lt(10)), 1)]
+
+        for guard, value in guards:
+            copy = _round_trip(guard)
+            self.assertEquals(type(copy), type(guard))
+            self.assertEquals(copy.validate(value), guard.validate(value))
+
+    def test_reverse(self):
+        guard = not_one_of(1, 2)
+        guard.arg_name, guard.arg_pos = 'x', 0
+        copy = _round_trip(guard)
+
+        self.assertEquals(copy.inner.values, frozenset([1, 2]))
+        self.assertEquals((copy.arg_name, copy.arg_pos), ('x', 0))
+        self.assertTrue(copy.validate(3))
+        self.assertFalse(copy.validate(1))
+
+    def test_bound_placeholder(self):
+        copy = _round_trip(sign.proxy_cache[0].arg_guards[0])
+
+        self.assertTrue(copy.wrapped_func is negative)
+        self.assertTrue(copy.validate(-1))
+        self.assertFalse(copy.validate(-20))
+
+
+class TestPickleProxies(TestCase):
+    def test_by_reference(self):
+        self.assertTrue(_round_trip(sign) is sign)
+        self.assertEquals(_round_trip(Shape.area), Shape.area)
+        self.assertTrue(_round_trip(Shape.area.proxy_cache) is Shape.area.proxy_cache)
+
+    def test_by_value(self):
+        foo = defpattern(1)(double)
+        copy = _round_trip(foo)
+
+        self.assertFalse(copy is foo)
+        self.assertEquals(copy(1), 2)
+        self.assertRaises(MatchError, lambda: copy(2))
+
+    def test_map_parallel(self):
+        self.assertEquals(sign.map_parallel([(-1,), (1,), (0,)], processes=2), ['negative', 'positive', 'positive'])
+        self.assertRaises(MatchError, lambda: sign.map_parallel([(-1,), (-20,)], processes=1))
@@ -0,0 +1,104 @@
+from collections import deque
+from .guard import PlaceholderGuard
+
+
+def _cancel(futures):
+    for future in futures:
+        future.cancel()
+
+
+class PooledSearch(object):
+    """Searches the clauses of a proxy for the first match, submitting the bound PlaceholderGuard of the clauses to a
+    concurrent.futures executor so that slow ones run at the same time.
+
+    The other Guards of a clause are validated first, in the calling thread. If they pass, its bound PlaceholderGuard
+    are submitted and the clause enters a window of at most lookahead clauses in flight. Clauses are then resolved in
+    order of declaration and the results of each clause in order of its Guards, so the first matching clause wins as
+    it would without an executor, and an exception raised by a Guard is raised by the call. Anything still pending
+    once the outcome is decided is cancelled.
+
+    An exception raised by the Guards of a clause validated ahead of its turn is held back until every clause before
+    it has been resolved, and is only raised if none of them matches. No further clauses are started after it.
+
+    :param executor: A concurrent.futures.Executor
+    :param lookahead: The number of clauses whose Guards may be in flight at once, defaults to 1
+    """
+
+    def __init__(self, executor, lookahead=1):
+        self.executor = executor
+        self.lookahead = max(1, lookahead)
+
+    def __str__(self):
+        return self.__print__(str)
+
+    def __repr__(self):
+        return self.__print__(repr)
+
+    def __print__(self, f):
+        return 'PooledSearch(executor=' + f(self.executor) + ', lookahead=' + f(self.lookahead) + ')'
+
+    def search(self, clauses, args, kwargs, instance=None, owner=None):
+        """Returns the first of the clauses which validates the arguments or None if there is none."""
+        bound = instance is not None or owner is not None
+        clauses = iter(clauses)
+        window = deque()
+        futures = []
+        try:
+            while True:
+                for clause in clauses:
+                    try:
+                        started = self._start(clause, args, kwargs, instance, owner, bound)
+                    except Exception as error:
+                        window.append((clause, [], error))
+                        clauses = iter(())
+                        break
+                    if started is not None:
+                        window.append(started + (None,))
+                        if len(window) >= self.lookahead:
+                            break
+                if not window:
+                    return None
+
+                clause, futures, error = window.popleft()
+                if error is not None:
+                    raise error
+                if self._resolve(futures):
+                    return clause
+        finally:
+            _cancel(futures)
+            for _, pending, _ in window:
+                _cancel(pending)
+
+    def _start(self, clause, args, kwargs, instance, owner, bound):
+        """Validates all but the bound PlaceholderGuard of the clause and, if they pass, returns the clause together with
+        the futures of its bound PlaceholderGuard. Returns None if the clause does not match."""
+        if not hasattr(clause, 'arg_guards'):
+            if bound:
+                valid = clause.validate_instance(instance, owner, *args, **kwargs)
+            else:
+                valid = clause.validate(*args, **kwargs)
+            return (clause, []) if valid else None
+
+        slow = []
+        for value, guard in clause.guard_pairs(args, kwargs):
+            if type(guard) is PlaceholderGuard and guard.wrapped_func is not None:
+                slow.append((value, guard))
+            elif not (guard.validate_instance(value, instance, owner) if bound else guard.validate(value)):
+                return None
+
+        submit = self.executor.submit
+        if bound:
+            futures = [submit(guard.validate_instance, value, instance, owner) for value, guard in slow]
+        else:
+            futures = [submit(guard.validate, value) for value, guard in slow]
+
+        return clause, futures
+
+    def _resolve(self, futures):
+        """Returns a boolean indicating if every future results in a true value, in order, cancelling the rest as soon as
+        one does not."""
+        for i, future in enumerate(futures):
+            if not future.result():
+                _cancel(futures[i + 1:])
+                return False
+        return True
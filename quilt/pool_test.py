@@ -0,0 +1,143 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Barrier, Event
+from unittest import TestCase
+from quilt.pool import PooledSearch
+from quilt.proxy import defpattern, pattern
+from quilt.exc import MatchError
+from quilt.guard import regex
+
+
+class TestPooledSearch(TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(4)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_guards_concurrent(self):
+        barrier = Barrier(3, timeout=1)
+
+        @defpattern()
+        def foo(x, y, z):
+            return 'all'
+
+        @foo.x
+        def first(value):
+            return barrier.wait() is not None
+
+        @foo.y
+        def second(value):
+            return barrier.wait() is not None
+
+        @foo.z
+        def third(value):
+            return barrier.wait() is not None
+
+        foo.use_executor(self.executor)
+        self.assertEquals(foo(1, 2, 3), 'all')
+
+    def test_lookahead(self):
+        second_started = Event()
+
+        @defpattern()
+        def foo(x):
+            return 'first'
+
+        @foo.x
+        def waits(value):
+            return not second_started.wait(1)
+
+        @foo.pattern()
+        def foo(x):
+            return 'second'
+
+        @foo.x
+        def starts(value):
+            second_started.set()
+            return True
+
+        foo.use_executor(self.executor, lookahead=2)
+        self.assertEquals(foo(1), 'second')
+
+    def test_first_match(self):
+        @defpattern(1)
+        def foo(x, y):
+            return 'small'
+
+        @foo.y
+        def small(value):
+            return value < 10
+
+        @foo.pattern(1)
+        def foo(x, y):
+            return 'any'
+
+        @foo.pattern(2)
+        def foo(x, y):
+            return 'two'
+
+        foo.use_executor(self.executor, lookahead=3)
+        self.assertEquals(foo(1, 5), 'small')
+        self.assertEquals(foo(1, 50), 'any')
+        self.assertEquals(foo(2, 5), 'two')
+        self.assertRaises(MatchError, lambda: foo(3, 5))
+
+    def test_exception(self):
+        @defpattern()
+        def foo(x):
+            return 'never'
+
+        @foo.x
+        def fails(value):
+            raise KeyError(value)
+
+        foo.use_executor(self.executor)
+        self.assertRaises(KeyError, lambda: foo(1))
+
+    def test_exception_ahead(self):
+        @defpattern()
+        def foo(x):
+            return 'first'
+
+        @foo.x
+        def passes(value):
+            return True
+
+        @foo.pattern(regex('a'))
+        def foo(x):
+            return 'second'
+
+        self.assertEquals(foo(1), 'first')
+        foo.use_executor(self.executor, lookahead=2)
+        self.assertEquals(foo(1), 'first')
+
+        foo.proxy_cache[0].x(lambda value: False)
+        self.assertRaises(TypeError, lambda: foo(1))
+
+    def test_member(self):
+        class Bar(object):
+            def __init__(self, limit):
+                self.limit = limit
+
+            @pattern()
+            def that(self, x):
+                return 'under'
+
+            @that.x
+            def under(self, value):
+                return value < self.limit
+
+            @that.pattern()
+            def that(self, x):
+                return 'over'
+
+        Bar.that.use_executor(self.executor, lookahead=2)
+        self.assertEquals(Bar(5).that(1), 'under')
+        self.assertEquals(Bar(5).that(7), 'over')
+
+    def test_resolve_cancels(self):
+        decided, pending = Future(), Future()
+        decided.set_result(False)
+
+        self.assertFalse(PooledSearch(self.executor)._resolve([decided, pending]))
+        self.assertTrue(pending.cancelled())
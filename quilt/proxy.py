@@ -1,6 +1,114 @@
+import sys
+from collections import OrderedDict
+from functools import partial
+from threading import Lock
 from .exc import MatchError
-from .pattern import MemberFunctionPattern, Pattern
-from .guard import Guard, ValueGuard, PatternGuard
+from .pattern import MemberFunctionPattern, Pattern, GuardedFunction
+from .guard import Guard, ValueGuard, PatternGuard, PlaceholderGuard, nested_guards
+from .index import index_clauses
+from .codegen import compile_clauses
+from .memo import MemoizedProxy, make_key
+from .selection import SelectionCache, UNKNOWN
+from .signature import SignatureCache, has_type_guards
+from .vector import dispatch_array
+from .ordering import reorder_clauses, profile_key, clause_key, load_profiles, save_profiles
+from .pool import PooledSearch
+from .stats import DispatchStats, BUCKETS
+from .tracing import Tracing
+
+
+_UNBUILT = object()
+
+# Below this many clauses, trying each of them in turn costs less than narrowing them down with a ClauseIndex.
+_INDEXED = 4
+
+
+def _index(snapshot):
+    """Returns the ClauseIndex of the Snapshot, building it on first use, or None if it has too few clauses to be worth
+    indexing."""
+    index = snapshot.index
+    if index is _UNBUILT:
+        clauses = snapshot.clauses
+        index = snapshot.index = index_clauses(clauses) if len(clauses) >= _INDEXED else None
+
+    return index
+
+
+def _signatures(snapshot):
+    """Returns the SignatureCache of the Snapshot, building it on first use."""
+    signatures = snapshot.signatures
+    if signatures is _UNBUILT:
+        clauses = snapshot.clauses
+        signatures = snapshot.signatures = SignatureCache(clauses) if has_type_guards(clauses) else None
+
+    return signatures
+
+
+def _narrow(snapshot, args):
+    """Returns the positions of the clauses of the Snapshot the ClauseIndex narrows the positional arguments down to,
+    or None if there is no ClauseIndex or it does not narrow them."""
+    index = _index(snapshot)
+    return None if index is None else index.narrow(args, None)
+
+
+def _validate_batch(guarded_func, calls, bound, instance, owner):
+    """Returns the list of booleans indicating if the GuardedFunction validates each tuple of positional arguments,
+    validating each of its Guards over all of the calls at once."""
+    if not hasattr(guarded_func, 'arg_guards'):
+        if bound:
+            return [guarded_func.validate_instance(instance, owner, *args) for args in calls]
+        return [guarded_func.validate(*args) for args in calls]
+
+    valid = [True] * len(calls)
+    for pos, guard in enumerate(guarded_func.arg_guards):
+        rows = [i for i, args in enumerate(calls) if valid[i] and pos < len(args)]
+        if not rows:
+            continue
+        values = [calls[i][pos] for i in rows]
+        if bound and any(type(nested) is PlaceholderGuard and nested.wrapped_func is not None
+                         for nested in nested_guards(guard)):
+            results = [guard.validate_instance(value, instance, owner) for value in values]
+        else:
+            results = guard.validate_many(values)
+        for i, result in zip(rows, results):
+            if not result:
+                valid[i] = False
+
+    return valid
+
+
+def _findable(obj, module, qualname):
+    """Returns a boolean indicating if the object can be imported from the module under the qualified name, so that it
+    can be pickled by reference."""
+    target = sys.modules.get(module)
+    for name in qualname.split('.'):
+        target = getattr(target, name, None)
+
+    return target is obj
+
+
+def _rebuild(proxy_type, clauses, most_recent, fallback=None):
+    """Unpickles a proxy pickled by value."""
+    proxy = proxy_type(clauses[0] if clauses else None)
+    proxy.snapshot = Snapshot(clauses, 0, most_recent)
+    proxy._fallback = fallback
+
+    return proxy
+
+
+def _rebuild_def(clauses, most_recent, fallback=None):
+    """Unpickles a DefProxy pickled by value. DefProxy is not pickled itself as its __module__ is that of its
+    functions."""
+    return _rebuild(DefProxy, clauses, most_recent, fallback)
+
+
+def _class_attribute(owner, name):
+    """Unpickles a ProxyCache pickled by reference to the class attribute holding it."""
+    return vars(owner)[name]
+
+
+def _call(proxy, args):
+    return proxy(*args)
 
 
 def _guard_type(guard):
@@ -66,6 +174,43 @@ def pattern(*args, **kwargs):
     return _wrapped
 
 
+class Snapshot(object):
+    """An immutable set of clauses together with everything derived from them.
+
+    The tuple of clauses, the ClauseIndex and the SignatureCache are built on first use. Threads racing to build one
+    both build the same thing and either may be kept.
+
+    Successive appends share one list which only ever grows, each Snapshot seeing the first count items of it, so
+    that declaring n clauses does not copy the clauses n times over.
+
+    :param clauses: The ordered collection of GuardedFunction
+    :param version: The number of changes made to the clauses of the proxy so far
+    :param most_recent: The GuardedFunction most recently appended and still registered
+    :param count: The number of items of the clauses list seen, if it is shared, defaults to None for a copy
+    """
+    __slots__ = ('items', 'count', 'version', 'most_recent', '_clauses', 'index', 'signatures')
+
+    def __init__(self, clauses, version, most_recent, count=None):
+        if count is None:
+            clauses = list(clauses)
+            count = len(clauses)
+        self.items = clauses
+        self.count = count
+        self.version = version
+        self.most_recent = most_recent
+        self._clauses = None
+        self.index = _UNBUILT
+        self.signatures = _UNBUILT
+
+    @property
+    def clauses(self):
+        clauses = self._clauses
+        if clauses is None:
+            clauses = self._clauses = tuple(self.items[:self.count])
+
+        return clauses
+
+
 class _Proxy(object):
     """Strictly internal mixin class which augments inheriting classes with the ability to further add additional
     pattern matching.
@@ -75,13 +220,46 @@ class _Proxy(object):
     pattern matching. Module based functions can continue to use the callable proxy directly but modification to the
     module are no longer required.
 
+    The clauses are held in an immutable Snapshot. Appending, unregistering or reordering builds a new Snapshot under
+    a lock shared only by writers and publishes it by replacing the snapshot attribute in one step. Calls read that
+    attribute once and never take a lock, so a call running while the clauses change sees either the old or the new
+    set of clauses, never a mix of both. Binding a PlaceholderGuard is not a change of the clauses and is seen by
+    calls straight away.
+
     :param proxy_cache: initial list of GuardedFunction
     :pattern_type: A reference to the Pattern class used to instantiate GuardedFunction.
     """
+    __slots__ = ('snapshot', 'pattern_type', 'wins', '_writer', '_selection', '_pool', '_profiling', '_stats', '_tracing',
+                 '_fallback', '_direct')
+    _member = False
 
     def __init__(self, proxy_cache, pattern_type):
-        self.proxy_cache = proxy_cache
+        self.snapshot = Snapshot(proxy_cache, 0, proxy_cache[-1] if proxy_cache else None)
         self.pattern_type = pattern_type
+        self._writer = Lock()
+        self._selection = None
+        self._pool = None
+        self._profiling = False
+        self._stats = None
+        self._tracing = None
+        self._fallback = None
+        self._direct = True
+        self.wins = {}
+
+    @property
+    def proxy_cache(self):
+        """The tuple of GuardedFunction in the order they are tried."""
+        return self.snapshot.clauses
+
+    @property
+    def version(self):
+        """The number of changes made to the clauses, letting anything derived from them tell that it has gone stale."""
+        return self.snapshot.version
+
+    @property
+    def most_recent(self):
+        """The GuardedFunction most recently appended and still registered, or None if there is none."""
+        return self.snapshot.most_recent
 
     def pattern(self, *args, **kwargs):
         """Used as a decorator. Creates a new pattern match statement that will invoke the wrapped function iff no other
@@ -92,11 +270,356 @@ class _Proxy(object):
 
         def _wrapper(func):
             inner = decor(func)
-            self.proxy_cache.append(inner)
+            self.append(inner)
 
             return self
         return _wrapper
 
+    def fallback(self, func):
+        """Used as a decorator. Sets the function invoked, without evaluating any Guard, whenever no GuardedFunction
+        matches the arguments, instead of raising a MatchError. Replacing the fallback counts as a change of the clauses,
+        so that anything caching results by version, such as a MemoizedProxy, sees it."""
+        with self._writer:
+            snapshot = self.snapshot
+            changed = Snapshot(snapshot.items, snapshot.version + 1, snapshot.most_recent, snapshot.count)
+            changed._clauses, changed.index, changed.signatures = snapshot._clauses, snapshot.index, snapshot.signatures
+            self._fallback = func
+            self.snapshot = changed
+
+        return self
+
+    def append(self, value):
+        """Adds a GuardedFunction as the last clause to be tried."""
+        with self._writer:
+            snapshot = self.snapshot
+            items = snapshot.items
+            if len(items) != snapshot.count:
+                items = items[:snapshot.count]
+            items.append(value)
+            self.snapshot = Snapshot(items, snapshot.version + 1, value, len(items))
+
+    def unregister(self, guarded_func):
+        """Removes a GuardedFunction so that it is no longer tried. Raises a ValueError if it is not registered."""
+        with self._writer:
+            snapshot = self.snapshot
+            if guarded_func not in snapshot.clauses:
+                raise ValueError('GuardedFunction is not registered')
+            clauses = tuple(clause for clause in snapshot.clauses if clause is not guarded_func)
+            most_recent = snapshot.most_recent
+            if most_recent is guarded_func:
+                most_recent = clauses[-1] if clauses else None
+            self.snapshot = Snapshot(clauses, snapshot.version + 1, most_recent)
+
+    def candidates(self, args, kwargs):
+        """Returns the GuardedFunction, in order of declaration, which could possibly match the arguments."""
+        snapshot = self.snapshot
+        index = _index(snapshot)
+        if index is None:
+            return snapshot.clauses
+
+        return index.candidates(args, kwargs)
+
+    def signature_candidates(self, args):
+        """Returns the list of (GuardedFunction, checks) from the SignatureCache for the positional arguments, among
+        the candidates of the ClauseIndex, or None if there is no SignatureCache or the arguments can not use it."""
+        snapshot = self.snapshot
+        signatures = _signatures(snapshot)
+        if signatures is None:
+            return None
+
+        return signatures.lookup(args, _narrow(snapshot, args))
+
+    def warmup(self):
+        """Finalizes every GuardedFunction and builds the ClauseIndex and SignatureCache of the clauses now rather than
+        on the first call, see Pattern."""
+        snapshot = self.snapshot
+        for guarded_func in snapshot.clauses:
+            if type(guarded_func) is GuardedFunction:
+                guarded_func.finalize()
+        _index(snapshot)
+        _signatures(snapshot)
+
+        return self
+
+    def cache_selection(self, maxsize=1024):
+        """Remembers which GuardedFunction matched each set of hashable arguments, so that repeated calls skip every
+        Guard. Guards are assumed to be pure functions of the arguments, except for the bound PlaceholderGuard of
+        member functions which are detected and never remembered. A maxsize of 0 or None turns the cache off again.
+
+        :param maxsize: The maximum number of remembered selections.
+        """
+        self._selection = SelectionCache(maxsize) if maxsize else None
+        self._configure()
+
+        return self
+
+    def use_executor(self, executor, lookahead=1):
+        """Validates the bound PlaceholderGuard of the clauses concurrently on a concurrent.futures executor, for
+        PlaceholderGuard calling slow services. None goes back to validating everything in the calling thread.
+
+        :param executor: A concurrent.futures.Executor or None
+        :param lookahead: The number of clauses whose PlaceholderGuard may be in flight at once, see PooledSearch.
+        """
+        self._pool = PooledSearch(executor, lookahead) if executor is not None else None
+        self._configure()
+
+        return self
+
+    def _configure(self):
+        """Notes whether calls can go straight to _search, none of the selection cache, the executor, profiling, stats
+        or tracing being in use."""
+        self._direct = self._selection is None and self._pool is None and not self._profiling and \
+            self._stats is None and self._tracing is None
+
+    def is_stateful(self, guarded_func):
+        """Returns a boolean indicating if the outcome of validating the GuardedFunction may depend on anything other
+        than the arguments. Anything without Guards to inspect is assumed to be."""
+        return not hasattr(guarded_func, 'arg_guards')
+
+    def match(self, args, kwargs, instance=None, owner=None):
+        """Returns the first GuardedFunction which validates the arguments or None if there is none."""
+        selection = self._selection
+        tracing = self._tracing
+        if tracing is not None and tracing.sampled():
+            guarded_func = tracing.match(self, args, kwargs, instance, owner)
+        elif self._stats is not None:
+            guarded_func = self._stats.match(self, args, kwargs, instance, owner)
+        elif selection is None:
+            guarded_func = self._find(args, kwargs, instance, owner)
+        else:
+            key, guarded_func = selection.lookup(self, args, kwargs)
+            if guarded_func is UNKNOWN:
+                guarded_func = self._find(args, kwargs, instance, owner)
+                selection.store(key, guarded_func)
+
+        if self._profiling and guarded_func is not None:
+            self.wins[guarded_func] = self.wins.get(guarded_func, 0) + 1
+
+        return guarded_func
+
+    def _search(self, args, kwargs, instance=None, owner=None):
+        """Returns the first GuardedFunction which validates the arguments or None if there is none, going through the
+        SignatureCache or the ClauseIndex when there is one. Member functions validate through validate_instance."""
+        member = self._member
+        snapshot = self.snapshot
+        index, signatures = snapshot.index, snapshot.signatures
+        if index is _UNBUILT or signatures is _UNBUILT:
+            index, signatures = _index(snapshot), _signatures(snapshot)
+        entry = None
+        if signatures is not None and not kwargs:
+            entry = signatures.lookup(args, None if index is None else index.narrow(args, None))
+        if entry is not None:
+            shared, failed = signatures.shared, []
+            for guarded_func, checks in entry:
+                if checks is None:
+                    if member and guarded_func.validate_instance(instance, owner, *args) or \
+                            not member and guarded_func.validate(*args):
+                        return guarded_func
+                    continue
+                for check in checks:
+                    if failed and check in failed:
+                        break
+                    guard, value = check[1], args[check[0]]
+                    if not (guard.validate_instance(value, instance, owner) if member else guard.validate(value)):
+                        if check in shared:
+                            failed.append(check)
+                        break
+                else:
+                    return guarded_func
+            return None
+
+        clauses = snapshot.clauses if index is None else index.candidates(args, kwargs)
+        if member:
+            for guarded_func in clauses:
+                if guarded_func.validate_instance(instance, owner, *args, **kwargs):
+                    return guarded_func
+        else:
+            for guarded_func in clauses:
+                if guarded_func.validate(*args, **kwargs):
+                    return guarded_func
+        return None
+
+    def _find(self, args, kwargs, instance, owner):
+        pool = self._pool
+        if pool is None:
+            return self._search(args, kwargs, instance, owner)
+
+        return pool.search(self.candidates(args, kwargs), args, kwargs, instance, owner)
+
+    def asynchronous(self):
+        """Returns an AsyncProxy, a coroutine function dispatching like this proxy which awaits awaitable Guards and
+        matched functions."""
+        from .asynchronous import AsyncProxy
+        return AsyncProxy(self)
+
+    def profile(self, enabled=True):
+        """Starts counting, in the wins dict, how many calls each GuardedFunction matches. False stops counting again.
+        """
+        self._profiling = enabled
+        self._configure()
+
+        return self
+
+    def collect_stats(self, enabled=True, buckets=BUCKETS):
+        """Starts counting attempts and wins of every GuardedFunction, evaluations, passes and time of every Guard,
+        calls matching nothing and a histogram of dispatch latencies, see DispatchStats. False stops counting and
+        discards the counts.
+
+        :param buckets: The upper bounds, in seconds, of the buckets of the latency histogram
+        """
+        self._stats = DispatchStats(buckets) if enabled else None
+        self._configure()
+
+        return self
+
+    def stats(self, reset=False):
+        """Returns a snapshot of the counts collected so far as a dict of plain values, see DispatchStats.snapshot and
+        stats.to_json and stats.to_prometheus for exporting it. Returns None if stats are not being collected.
+
+        :param reset: Sets the counts back to zero once the snapshot is taken
+        """
+        stats = self._stats
+        if stats is None:
+            return None
+
+        snapshot = stats.snapshot(self)
+        if reset:
+            stats.reset()
+        return snapshot
+
+    def trace(self, tracer=None, rate=1.0, history=256, enabled=True):
+        """Starts tracing a sample of the calls, calling the hooks of the tracer for each of them and keeping the most
+        recent decisions for postmortems, see Tracing. False stops tracing and discards the decisions.
+
+        :param tracer: A Tracer, or None to only keep decisions
+        :param rate: The fraction of calls traced, between 0 and 1
+        :param history: The number of decisions kept, 0 for none
+        """
+        self._tracing = Tracing(tracer, rate, history) if enabled else None
+        self._configure()
+
+        return self
+
+    def decisions(self):
+        """Returns the list of the most recent traced Decision, oldest first, or an empty list if none are kept."""
+        tracing = self._tracing
+        if tracing is None or tracing.log is None:
+            return []
+
+        return tracing.log.recent()
+
+    def reorder(self):
+        """Moves the GuardedFunction with the most wins ahead of the others, as far as static analysis of their Guards
+        proves that no call could match a different GuardedFunction than before. See ordering.reorder_clauses."""
+        with self._writer:
+            snapshot = self.snapshot
+            clauses = reorder_clauses(snapshot.clauses, self.wins)
+            self.snapshot = Snapshot(clauses, snapshot.version + 1, snapshot.most_recent)
+
+        return self
+
+    def save_profile(self, path):
+        """Saves the wins of every GuardedFunction to the JSON profile file, alongside those of any other proxy in it.
+        """
+        key = profile_key(self)
+        if key is None:
+            return
+        profiles = load_profiles(path)
+        wins = dict((clause_key(clause), self.wins.get(clause, 0)) for clause in self.proxy_cache)
+        wins.pop(None, None)
+        profiles[key] = wins
+        save_profiles(path, profiles)
+
+    def load_profile(self, path):
+        """Adds the wins saved in the JSON profile file, if any, to those counted so far and reorders accordingly."""
+        saved = load_profiles(path).get(profile_key(self), {})
+        for clause in self.proxy_cache:
+            key = clause_key(clause)
+            if key in saved:
+                self.wins[clause] = self.wins.get(clause, 0) + saved[key]
+
+        return self.reorder()
+
+    def explain(self, args, kwargs, instance=None, owner=None):
+        """Returns an OrderedDict from every GuardedFunction, in order of declaration, to the list of (Guard, value)
+        pairs rejecting the arguments. Every Guard of every GuardedFunction is evaluated, so this is only meant for
+        finding out why a call matches nothing. A GuardedFunction listing no pair matches the arguments. Anything
+        without Guards to inspect lists the pair (None, args) if it does not validate.
+
+        :param args: The positional arguments
+        :param kwargs: The keyword arguments
+        :param instance: The instance to validate member functions against, defaults to None
+        :param owner: The class to validate member functions against, defaults to None
+        """
+        bound = instance is not None or owner is not None
+        explanation = OrderedDict()
+        for guarded_func in self.proxy_cache:
+            if not hasattr(guarded_func, 'arg_guards'):
+                if bound:
+                    valid = guarded_func.validate_instance(instance, owner, *args, **kwargs)
+                else:
+                    valid = guarded_func.validate(*args, **kwargs)
+                explanation[guarded_func] = [] if valid else [(None, args)]
+                continue
+
+            explanation[guarded_func] = [(guard, value) for value, guard in guarded_func.guard_pairs(args, kwargs)
+                                         if not (guard.validate_instance(value, instance, owner) if bound
+                                                 else guard.validate(value))]
+
+        return explanation
+
+    def partition(self, iterable, instance=None, owner=None):
+        """Groups a batch of calls by the GuardedFunction each would invoke, without invoking any of them.
+
+        Returns an OrderedDict from every GuardedFunction, in order of declaration, to the list of argument tuples it
+        matches, followed by the key None for the argument tuples nothing matches. Equal hashable argument tuples are
+        only validated once per batch.
+
+        Rather than dispatching call by call, each Guard validates the argument of every call not yet assigned at once
+        through Guard.validate_many, as dispatch_array does. Bound PlaceholderGuard of member functions and objects
+        without Guards are validated call by call. Nothing is counted towards profiling, stats or tracing as nothing is
+        invoked.
+
+        :param iterable: An iterable of positional argument tuples
+        :param instance: The instance to validate member functions against, defaults to None
+        :param owner: The class to validate member functions against, defaults to None
+        """
+        clauses = self.snapshot.clauses
+        bound = instance is not None or owner is not None
+        calls = [tuple(args) for args in iterable]
+        unique, rows, seen = [], [], {}
+        for args in calls:
+            try:
+                key = make_key(args, None)
+                if key not in seen:
+                    seen[key] = len(unique)
+                    unique.append(args)
+                rows.append(seen[key])
+            except TypeError:
+                rows.append(len(unique))
+                unique.append(args)
+
+        assigned = [None] * len(unique)
+        remaining = list(range(len(unique)))
+        for guarded_func in clauses:
+            if not remaining:
+                break
+            matched = _validate_batch(guarded_func, [unique[i] for i in remaining], bound, instance, owner)
+            left = []
+            for i, valid in zip(remaining, matched):
+                if valid:
+                    assigned[i] = guarded_func
+                else:
+                    left.append(i)
+            remaining = left
+
+        groups = OrderedDict((guarded_func, []) for guarded_func in clauses)
+        groups[None] = []
+        for args, row in zip(calls, rows):
+            groups.setdefault(assigned[row], []).append(args)
+
+        return groups
+
 
 class FunctionProxy(object):
     """Callable object that proxies an iterable collection of related GuardedFunctions associated with an instance
@@ -107,15 +630,32 @@ class FunctionProxy(object):
     to the provided arguments and returning the evaluation of that function. From the perspective of the caller, it
     should be transparent and unseen.
 
+    Much like a bound method, a FunctionProxy is created on every attribute access. It is therefore a slotted object
+    which ProxyCache creates without any Python level __init__. Like bound methods, two FunctionProxy compare equal
+    when they bind the same ProxyCache to the very same instance and owner, and hash accordingly.
+
     :param proxy_cache: an iterable collection of GuardedFunction.
     :param instance: An instance of an object. Defaults to None.
     :param owner: An instance of an owning class. Defaults to None.
     """
 
-    def __init__(self, proxy_cache, instance=None, owner=None):
-        self.proxy_cache = proxy_cache
-        self.instance = instance
-        self.owner = owner
+    __slots__ = ('proxy_cache', 'instance', 'owner')
+
+    def __new__(cls, proxy_cache, instance=None, owner=None):
+        return _new_proxy(cls, proxy_cache, instance, owner)
+
+    def __reduce__(self):
+        return FunctionProxy, (self.proxy_cache, self.instance, self.owner)
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.proxy_cache is other.proxy_cache and \
+            self.instance is other.instance and self.owner is other.owner
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self.proxy_cache), id(self.instance), id(self.owner)))
 
     def __getattr__(self, item):
         return getattr(self.proxy_cache, item)
@@ -130,15 +670,67 @@ class FunctionProxy(object):
         return 'FunctionProxy(underlying=[' + ', '.join(map(f, self.proxy_cache)) + '], instance=' + f(self.instance) \
             + ', owner=' + f(self.owner) + ')'
 
+    def partition(self, iterable):
+        """Groups a batch of calls by the GuardedFunction each would invoke on the bound instance, see _Proxy.partition.
+        """
+        cache, instance, owner = self.proxy_cache, self.instance, self.owner
+        return cache.partition(iterable, instance, owner)
+
+    def asynchronous(self):
+        """Returns an AsyncProxy dispatching on the bound instance, see _Proxy.asynchronous."""
+        from .asynchronous import AsyncProxy
+        cache, instance, owner = self.proxy_cache, self.instance, self.owner
+        return AsyncProxy(cache, instance, owner)
+
+    def explain_miss(self, *args, **kwargs):
+        """Returns why each GuardedFunction rejects the arguments on the bound instance, see _Proxy.explain."""
+        cache, instance, owner = self.proxy_cache, self.instance, self.owner
+        return cache.explain(args, kwargs, instance, owner)
+
+    def try_dispatch(self, *args, default=None, **kwargs):
+        """Calls the bound functions like __call__ but returns default instead of raising a MatchError when nothing,
+        fallback included, matches the arguments."""
+        cache, instance, owner = self.proxy_cache, self.instance, self.owner
+        guarded_func = cache.match(args, kwargs, instance, owner)
+        if guarded_func is not None:
+            return guarded_func.underlying_func.__get__(instance, owner)(*args, **kwargs)
+        if cache._fallback is not None:
+            return cache._fallback.__get__(instance, owner)(*args, **kwargs)
+        return default
+
     def __call__(self, *args, **kwargs):
         """Calls each GuardedFunction until the first function validates against the provided arguments. If nothing
-        validates, an exception is raised."""
-        for guarded_func in self.proxy_cache:
-            if guarded_func.validate_instance(self.instance, self.owner, *args, **kwargs):
-                return guarded_func.underlying_func.__get__(self.instance, self.owner)(*args, **kwargs)
+        validates, the fallback is called if there is one, otherwise an exception is raised."""
+        cache, instance, owner = self.proxy_cache, self.instance, self.owner
+        if isinstance(cache, _Proxy):
+            if cache._direct:
+                guarded_func = cache._search(args, kwargs, instance, owner)
+            else:
+                guarded_func = cache.match(args, kwargs, instance, owner)
+            if guarded_func is None:
+                if cache._fallback is None:
+                    raise MatchError(*args, **kwargs)
+                return cache._fallback.__get__(instance, owner)(*args, **kwargs)
+            return guarded_func.underlying_func.__get__(instance, owner)(*args, **kwargs)
+        for guarded_func in cache:
+            if guarded_func.validate_instance(instance, owner, *args, **kwargs):
+                return guarded_func.underlying_func.__get__(instance, owner)(*args, **kwargs)
         raise MatchError(*args, **kwargs)
 
 
+_object_new = object.__new__
+
+
+def _new_proxy(cls, proxy_cache, instance, owner):
+    """Creates a FunctionProxy without running any Python level __new__ or __init__."""
+    proxy = _object_new(cls)
+    proxy.proxy_cache = proxy_cache
+    proxy.instance = instance
+    proxy.owner = owner
+
+    return proxy
+
+
 class ProxyCache(_Proxy):
     """Descriptor object for holding a reference to all GuardedFunction that have been assigned to the named class
     attribute. Proxies the attributes of the most recently added GuardedFunction for use with PlaceholderGuard.
@@ -153,19 +745,43 @@ class ProxyCache(_Proxy):
 
     :param initial_func: The first GuardedFunction
     """
+    __slots__ = ('attribute',)
+    _member = True
+
     def __init__(self, initial_func):
         super(ProxyCache, self).__init__([initial_func], MemberFunctionPattern)
-        self.most_recent = initial_func
+        self.attribute = None
+
+    def __set_name__(self, owner, name):
+        self.attribute = (owner, name)
+
+    def __reduce__(self):
+        """Pickles by reference to the class attribute holding this ProxyCache, or by value if there is none."""
+        if self.attribute is not None and vars(self.attribute[0]).get(self.attribute[1]) is self:
+            return _class_attribute, self.attribute
+        return _rebuild, (ProxyCache, self.proxy_cache, self.most_recent, self._fallback)
 
     def __getattr__(self, item):
         return getattr(self.most_recent, item)
 
     def __get__(self, instance=None, owner=None):
-        return FunctionProxy(self, instance, owner)
+        proxy = _object_new(FunctionProxy)
+        proxy.proxy_cache = self
+        proxy.instance = instance
+        proxy.owner = owner
+
+        return proxy
 
     def __iter__(self):
         return iter(self.proxy_cache)
 
+    def is_stateful(self, guarded_func):
+        if super(ProxyCache, self).is_stateful(guarded_func):
+            return True
+
+        return any(isinstance(guard, PlaceholderGuard) and guard.wrapped_func is not None
+                   for top in guarded_func.guards for guard in nested_guards(top))
+
     def __str__(self):
         return self.__print__(str)
 
@@ -176,15 +792,11 @@ class ProxyCache(_Proxy):
         return 'ProxyCache(cached=[' + ', '.join(map(f, self.proxy_cache)) + '], most_recent=' + f(self.most_recent) \
            + ')'
 
-    def append(self, value):
-        self.proxy_cache.append(value)
-        self.most_recent = value
-
 
 class DefProxy(_Proxy):
     """Callable object that proxies an iterable collection of related GuardedFunctions associated with a named family of
-    pattern matched function declarations within a module. If no GuardedFunction matches the arguments, raises a
-    MatchError.
+    pattern matched function declarations within a module. If no GuardedFunction matches the arguments, calls the
+    fallback if there is one and raises a MatchError otherwise.
 
     DefProxy should not be constructed or used on it's own. It is an internal class used by the library. Like
     FunctionProxy its primary responsibility is to determine the first matching function to a set of provided arguments
@@ -196,12 +808,16 @@ class DefProxy(_Proxy):
     attributes. Accessing the __closure__ property always will return None. No attribute accessed this way is
     assignable.
 
+    DefProxy pickles by reference when it can be imported from its module under the name of its functions, and by
+    value otherwise. Only GuardedFunction whose functions can themselves be pickled can be pickled by value.
+
     :param init_function: an iterable collection of GuardeFunction
     """
+    __slots__ = ('_module',)
 
     def __init__(self, init_function):
         super(DefProxy, self).__init__([init_function], Pattern)
-        self.most_recent = init_function
+        self._module = getattr(getattr(init_function, 'underlying_func', init_function), '__module__', None)
 
     @property
     def __name__(self):
@@ -209,7 +825,13 @@ class DefProxy(_Proxy):
 
     @property
     def __module__(self):
-        return self.most_recent.__module__
+        return self._module
+
+    def __reduce__(self):
+        qualname = getattr(self.most_recent, '__qualname__', None)
+        if qualname is not None and _findable(self, self.__module__, qualname):
+            return qualname
+        return _rebuild_def, (self.proxy_cache, self.most_recent, self._fallback)
 
     @property
     def __closure__(self):
@@ -231,8 +853,64 @@ class DefProxy(_Proxy):
     def __print__(self, f):
         return 'DefProxy(name=' + self.__name__ + ', cached=[' + ', '.join(map(f, self.proxy_cache)) + '])'
 
+    def compile(self):
+        """Returns a single function which dispatches exactly like this DefProxy with every Guard compiled into
+        straight-line Python.
+
+        The returned function is a snapshot. Patterns added or PlaceholderGuard bound afterwards require compile to be
+        called again.
+        """
+        return compile_clauses(self.proxy_cache, self.__name__, self._fallback)
+
+    def cached(self, maxsize=128, ttl=None):
+        """Returns a MemoizedProxy caching the results of this DefProxy. Only suitable for pure functions.
+
+        :param maxsize: The maximum number of results kept, least recently used first out. None for no bound.
+        :param ttl: The number of seconds a result is kept, None for no expiry.
+        """
+        return MemoizedProxy(self, maxsize, ttl)
+
+    def map_parallel(self, iterable, processes=None, chunksize=1):
+        """Calls this DefProxy on every positional argument tuple of the iterable in a pool of worker processes and
+        returns the list of results in order. The DefProxy must be picklable, see above.
+
+        :param iterable: An iterable of positional argument tuples
+        :param processes: The number of worker processes, defaults to the number of processors
+        :param chunksize: The number of calls sent to a worker process at a time
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(processes) as executor:
+            return list(executor.map(partial(_call, self), iterable, chunksize=chunksize))
+
+    def dispatch_array(self, *arrays):
+        """Calls this DefProxy on every row of the given NumPy arrays, row i being the positional arguments
+        (a[i] for a in arrays), and returns the array of results. Requires numpy.
+
+        Guards are evaluated as boolean masks over the whole arrays where possible and each matched function is called
+        once with the sub-arrays of its rows, or row by row if it can not handle arrays. Raises a MatchError for the first
+        row without a match.
+        """
+        return dispatch_array(self.proxy_cache, arrays, self._fallback)
+
+    def explain_miss(self, *args, **kwargs):
+        """Returns why each GuardedFunction rejects the arguments, see _Proxy.explain."""
+        return self.explain(args, kwargs)
+
+    def try_dispatch(self, *args, default=None, **kwargs):
+        """Calls this DefProxy like __call__ but returns default instead of raising a MatchError when nothing, fallback
+        included, matches the arguments."""
+        guarded_func = self.match(args, kwargs)
+        if guarded_func is not None:
+            return guarded_func.underlying_func(*args, **kwargs)
+        if self._fallback is not None:
+            return self._fallback(*args, **kwargs)
+        return default
+
     def __call__(self, *args, **kwargs):
-        for guarded_func in self.proxy_cache:
-            if guarded_func.validate(*args, **kwargs):
-                return guarded_func.underlying_func(*args, **kwargs)
-        raise MatchError(*args, **kwargs)
\ No newline at end of file
+        guarded_func = self._search(args, kwargs) if self._direct else self.match(args, kwargs)
+        if guarded_func is None:
+            if self._fallback is None:
+                raise MatchError(*args, **kwargs)
+            return self._fallback(*args, **kwargs)
+
+        return guarded_func.underlying_func(*args, **kwargs)
\ No newline at end of file
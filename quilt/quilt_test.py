@@ -1,6 +1,9 @@
+import operator
+from threading import Event, Thread
 from unittest import TestCase
 from quilt.guard import *
 from quilt.proxy import *
+from quilt.proxy import _UNBUILT
 from quilt.exc import MatchError
 
 
@@ -29,6 +32,23 @@ class ProxyCacheTest(TestCase):
         cache = ProxyCache(item)
         self.assertEquals(cache.x, 1)
 
+    def test_direct(self):
+        class Foo(object):
+            @pattern(gt(0))
+            def bar(self, x):
+                return x
+
+        cache = Foo.__dict__['bar']
+        self.assertTrue(cache._direct)
+
+        cache.profile()
+        self.assertEquals(Foo().bar(1), 1)
+        self.assertFalse(cache._direct)
+        self.assertEquals(list(cache.wins.values()), [1])
+
+        cache.profile(False)
+        self.assertTrue(cache._direct)
+
 
 class FooPattern(object):
     @pattern(lt(0))
@@ -155,4 +175,260 @@ class PlaceholderTest(TestCase):
     def test_stacked(self):
         self.assertEquals(self.that.bar(1, 2), 3)
         self.assertEquals(self.that.bar(0, 4), 0)
-        self.assertRaises(MatchError, lambda: self.that.bar(1, 0))
\ No newline at end of file
+        self.assertRaises(MatchError, lambda: self.that.bar(1, 0))
+
+
+class PartitionTest(TestCase):
+    def test_def(self):
+        @defpattern(lt(0))
+        def foo(x, y):
+            return 'negative'
+
+        @foo.pattern(type_of(int))
+        def foo(x, y):
+            return 'int'
+
+        first, second = foo.proxy_cache
+        groups = foo.partition([(-1, 0), (2, 0), ('a', 0), (2, 0), ([1], 0)])
+
+        self.assertEquals(list(groups), [first, second, None])
+        self.assertEquals(groups[first], [(-1, 0)])
+        self.assertEquals(groups[second], [(2, 0), (2, 0)])
+        self.assertEquals(groups[None], [('a', 0), ([1], 0)])
+
+    def test_batched(self):
+        batches = []
+
+        class Counted(OperatorGuard):
+            def validate_many(self, values):
+                batches.append(list(values))
+                return super(Counted, self).validate_many(values)
+
+        @defpattern(Counted(operator.gt, 0))
+        def foo(x):
+            return 'positive'
+
+        @foo.pattern(Counted(operator.lt, 0))
+        def foo(x):
+            return 'negative'
+
+        first, second = foo.proxy_cache
+        groups = foo.partition([(1,), (-2,), (3,), (1,), (0,)])
+
+        self.assertEquals(groups[first], [(1,), (3,), (1,)])
+        self.assertEquals(groups[second], [(-2,)])
+        self.assertEquals(groups[None], [(0,)])
+        self.assertEquals(batches, [[1, -2, 3, 0], [-2, 0]])
+
+    def test_not_counted(self):
+        @defpattern(gt(0))
+        def foo(x):
+            return 'positive'
+
+        foo.profile()
+        foo.collect_stats()
+        foo.partition([(1,), (2,), (3,), (-1,)])
+
+        self.assertEquals(foo.wins, {})
+        self.assertEquals(foo.stats()['calls'], 0)
+        self.assertEquals(foo.stats()['misses'], 0)
+
+    def test_bound(self):
+        first, second = Place.bar.proxy_cache
+        groups = Place(1).bar.partition([(1, 2), (0, 4), (1, 0)])
+
+        self.assertEquals(groups[first], [(1, 2)])
+        self.assertEquals(groups[second], [(0, 4)])
+        self.assertEquals(groups[None], [(1, 0)])
+
+
+class RegistryTest(TestCase):
+    def setUp(self):
+        @defpattern(1)
+        def foo(x):
+            return 'one'
+
+        self.one = foo.most_recent
+
+        @foo.pattern(2)
+        def foo(x):
+            return 'two'
+
+        self.foo = foo
+
+    def tearDown(self):
+        self.foo = None
+
+    def test_snapshot(self):
+        snapshot = self.foo.snapshot
+
+        @self.foo.pattern(3)
+        def foo(x):
+            return 'three'
+
+        self.assertEquals(len(snapshot.clauses), 2)
+        self.assertEquals(len(self.foo.proxy_cache), 3)
+        self.assertEquals(self.foo.version, snapshot.version + 1)
+
+    def test_unregister(self):
+        self.foo.unregister(self.one)
+
+        self.assertRaises(MatchError, lambda: self.foo(1))
+        self.assertEquals(self.foo(2), 'two')
+        self.assertRaises(ValueError, lambda: self.foo.unregister(self.one))
+
+    def test_unregister_most_recent(self):
+        self.foo.unregister(self.foo.most_recent)
+
+        self.assertIs(self.foo.most_recent, self.one)
+        self.assertRaises(MatchError, lambda: self.foo(2))
+
+    def test_unregister_member(self):
+        class Bar(object):
+            @pattern(1)
+            def that(self, x):
+                return 'one'
+
+            @that.pattern(2)
+            def that(self, x):
+                return 'two'
+
+        Bar.that.unregister(next(iter(Bar.that.proxy_cache)))
+        self.assertRaises(MatchError, lambda: Bar().that(1))
+        self.assertEquals(Bar().that(2), 'two')
+
+    def test_concurrent(self):
+        self.foo.cache_selection()
+        errors = []
+        done = Event()
+
+        def call():
+            while not done.is_set():
+                try:
+                    if self.foo(2) != 'two':
+                        errors.append('wrong clause')
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for i in range(200):
+            @self.foo.pattern(i + 3)
+            def foo(x):
+                return 'other'
+
+            self.foo.unregister(self.foo.most_recent)
+        done.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEquals(errors, [])
+        self.assertEquals(len(self.foo.proxy_cache), 2)
+
+
+class MissTest(TestCase):
+    def setUp(self):
+        @defpattern(lt(0), 'a')
+        def foo(x, y):
+            return 'negative'
+
+        @foo.pattern(gt(0))
+        def foo(x, y):
+            return 'positive'
+
+        self.foo = foo
+
+    def test_fallback(self):
+        self.assertRaises(MatchError, lambda: self.foo(0, 'a'))
+
+        @self.foo.fallback
+        def foo(x, y):
+            return 'other'
+
+        self.assertEquals(foo(0, 'a'), 'other')
+        self.assertEquals(foo(1, 'a'), 'positive')
+        self.assertEquals(foo.compile()(0, 'a'), 'other')
+
+    def test_fallback_replaced(self):
+        self.foo.fallback(lambda x, y: 'fb')
+        cached = self.foo.cached()
+        self.assertEquals(cached(0, 'a'), 'fb')
+
+        self.foo.fallback(lambda x, y: 'fb2')
+        self.assertEquals(self.foo(0, 'a'), 'fb2')
+        self.assertEquals(cached(0, 'a'), 'fb2')
+
+    def test_try_dispatch(self):
+        self.assertEquals(self.foo.try_dispatch(1, 'b'), 'positive')
+        self.assertEquals(self.foo.try_dispatch(0, 'b'), None)
+        self.assertEquals(self.foo.try_dispatch(0, y='b', default='missing'), 'missing')
+
+    def test_explain_miss(self):
+        negative, positive = self.foo.proxy_cache
+        explanation = self.foo.explain_miss(0, 'b')
+
+        self.assertEquals(list(explanation), [negative, positive])
+        self.assertEquals([(guard.arg_name, value) for guard, value in explanation[negative]], [('x', 0), ('y', 'b')])
+        self.assertEquals([(guard.arg_name, value) for guard, value in explanation[positive]], [('x', 0)])
+        self.assertEquals(self.foo.explain_miss(1, 'b')[positive], [])
+
+    def test_member(self):
+        class Bar(object):
+            @pattern(1)
+            def that(self, x):
+                return 'one'
+
+            @that.fallback
+            def that(self, x):
+                return self
+
+        bar = Bar()
+        self.assertEquals(bar.that(1), 'one')
+        self.assertTrue(bar.that(2) is bar)
+        self.assertTrue(bar.that.try_dispatch(2) is bar)
+        self.assertEquals(list(bar.that.explain_miss(2).values())[0][0][1], 2)
+
+
+class LazyTest(TestCase):
+    def test_pending_until_called(self):
+        @defpattern(1)
+        def foo(x):
+            return 'one'
+
+        @foo.pattern(x=2)
+        def foo(x):
+            return 'two'
+
+        self.assertTrue(all(clause._pending is not None for clause in foo.proxy_cache))
+        self.assertEquals(foo(2), 'two')
+        self.assertFalse(any(clause._pending is not None for clause in foo.proxy_cache))
+
+    def test_placeholder(self):
+        @defpattern()
+        def foo(x):
+            return 'small'
+
+        @foo.x
+        def small(value):
+            return value < 10
+
+        self.assertEquals(foo(1), 'small')
+        self.assertRaises(MatchError, lambda: foo(11))
+
+    def test_warmup(self):
+        @defpattern(1)
+        def foo(x):
+            return 'one'
+
+        foo.warmup()
+        self.assertTrue(foo.most_recent._pending is None)
+        self.assertFalse(foo.snapshot.index is _UNBUILT or foo.snapshot.signatures is _UNBUILT)
+
+    def test_keyword_only(self):
+        @defpattern(1)
+        def foo(x, *args, y=2, **kwargs):
+            return y
+
+        self.assertEquals(foo(1), 2)
+        self.assertEquals(foo.most_recent.kwarg_guards['x'].arg_pos, 0)
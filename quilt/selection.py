@@ -0,0 +1,98 @@
+from .guard import PlaceholderGuard
+from .memo import make_key
+
+
+UNKNOWN = object()
+
+
+class _Generation(object):
+    """The selections remembered for one version of the clauses of a proxy and one count of PlaceholderGuard bindings.
+    """
+
+    def __init__(self, generation, stateless, complete):
+        self.generation = generation
+        self.stateless = stateless
+        self.complete = complete
+        self.selected = {}
+
+
+class SelectionCache(object):
+    """Remembers which GuardedFunction of a proxy matched a given set of hashable arguments so that a repeated call skips
+    every Guard and goes straight to the matched function. A miss is remembered as None.
+
+    A selection is only remembered when every clause up to and including the matched one is stateless, as decided by
+    the proxy. Clauses of a ProxyCache with a bound PlaceholderGuard depend on the state of the instance and are never
+    remembered, nor is anything after them. Everything is forgotten whenever the clauses of the proxy change or any
+    PlaceholderGuard is bound. The cache holds at most maxsize selections, the oldest ones being forgotten first.
+
+    Each generation of selections is replaced as a whole, and a selection found under one generation is only ever
+    remembered in that same generation, so that threads calling while the clauses change never remember a stale one.
+
+    :param maxsize: The maximum number of remembered selections.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.current = _Generation(None, frozenset(), False)
+
+    @property
+    def selected(self):
+        return self.current.selected
+
+    def __str__(self):
+        return self.__print__(str)
+
+    def __repr__(self):
+        return self.__print__(repr)
+
+    def __print__(self, f):
+        return 'SelectionCache(maxsize=' + f(self.maxsize) + ', currsize=' + f(len(self.selected)) + ')'
+
+    def refresh(self, proxy):
+        """Returns the current generation of selections, starting a new one if the clauses of the proxy or any
+        PlaceholderGuard changed since the last call."""
+        snapshot = proxy.snapshot
+        generation = (snapshot.version, PlaceholderGuard.bindings)
+        current = self.current
+        if generation == current.generation:
+            return current
+
+        clauses = snapshot.clauses
+        stateless = []
+        for clause in clauses:
+            if proxy.is_stateful(clause):
+                break
+            stateless.append(id(clause))
+        current = self.current = _Generation(generation, frozenset(stateless), len(stateless) == len(clauses))
+
+        return current
+
+    def lookup(self, proxy, args, kwargs):
+        """Returns the key of the arguments and the remembered GuardedFunction, None for a remembered miss or UNKNOWN.
+        The key, to be passed back to store, is None for unhashable arguments."""
+        current = self.refresh(proxy)
+        try:
+            key = make_key(args, kwargs)
+            return (current, key), current.selected.get(key, UNKNOWN)
+        except TypeError:
+            return None, UNKNOWN
+
+    def store(self, key, guarded_func):
+        """Remembers the GuardedFunction, or None for a miss, selected for the key if that can be relied upon."""
+        if key is None:
+            return
+        current, key = key
+        if current is not self.current:
+            return
+        if guarded_func is None and not current.complete:
+            return
+        if guarded_func is not None and id(guarded_func) not in current.stateless:
+            return
+
+        selected = current.selected
+        if len(selected) >= self.maxsize:
+            try:
+                del selected[next(iter(selected))]
+            except (KeyError, RuntimeError, StopIteration):
+                pass
+        selected[key] = guarded_func
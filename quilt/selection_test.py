@@ -0,0 +1,123 @@
+from unittest import TestCase
+from quilt.guard import *
+from quilt.proxy import defpattern, pattern
+from quilt.exc import MatchError
+
+
+class _Counted(Guard):
+    def __init__(self, inner):
+        super(_Counted, self).__init__()
+        self.inner = inner
+        self.count = 0
+
+    def validate(self, value):
+        self.count += 1
+        return self.inner.validate(value)
+
+
+class TestDefSelection(TestCase):
+    def setUp(self):
+        self.first = _Counted(lt(0))
+        self.second = _Counted(gt(10))
+
+        @defpattern(self.first)
+        def foo(x):
+            return 'negative'
+
+        @foo.pattern(self.second)
+        def foo(x):
+            return 'large'
+
+        self.foo = foo.cache_selection(maxsize=2)
+
+    def tearDown(self):
+        self.foo = None
+
+    def test_skips_guards(self):
+        self.assertEquals(self.foo(11), 'large')
+        self.assertEquals(self.foo(11), 'large')
+        self.assertEquals((self.first.count, self.second.count), (1, 1))
+
+    def test_miss_remembered(self):
+        self.assertRaises(MatchError, lambda: self.foo(5))
+        self.assertRaises(MatchError, lambda: self.foo(5))
+        self.assertEquals((self.first.count, self.second.count), (1, 1))
+
+    def test_bounded(self):
+        for x in [11, 12, 13]:
+            self.foo(x)
+
+        self.assertEquals(len(self.foo._selection.selected), 2)
+
+    def test_unhashable(self):
+        self.assertRaises(MatchError, lambda: self.foo([1]))
+        self.assertRaises(MatchError, lambda: self.foo([1]))
+        self.assertEquals(self.first.count, 2)
+
+    def test_cleared_by_pattern(self):
+        self.assertRaises(MatchError, lambda: self.foo(5))
+
+        @self.foo.pattern(5)
+        def foo(x):
+            return 'five'
+
+        self.assertEquals(self.foo(5), 'five')
+
+    def test_cleared_by_placeholder(self):
+        @defpattern(0)
+        def bar(x, y):
+            return 'zero'
+
+        @bar.pattern(1)
+        def bar(x, y):
+            return 'one'
+
+        bar.cache_selection()
+        self.assertEquals(bar(1, 5), 'one')
+
+        @bar.y
+        def limit(value):
+            return value < 3
+
+        self.assertRaises(MatchError, lambda: bar(1, 5))
+
+    def test_off(self):
+        self.foo.cache_selection(None)
+        self.foo(11)
+        self.foo(11)
+
+        self.assertEquals(self.second.count, 2)
+
+
+class Limited(object):
+    def __init__(self, limit):
+        self.limit = limit
+
+    @pattern(0)
+    def check(self, x, y):
+        return 'zero'
+
+    @check.pattern(1)
+    def check(self, x, y):
+        return 'under'
+
+    @check.y
+    def under_limit(self, value):
+        return value < self.limit
+
+    @check.pattern(1)
+    def check(self, x, y):
+        return 'over'
+
+    check.cache_selection()
+
+
+class TestMemberSelection(TestCase):
+    def test_stateful_not_remembered(self):
+        self.assertEquals(Limited(10).check(1, 5), 'under')
+        self.assertEquals(Limited(1).check(1, 5), 'over')
+        self.assertEquals(Limited(10).check(1, 5), 'under')
+
+    def test_stateless_remembered(self):
+        self.assertEquals(Limited(10).check(0, 5), 'zero')
+        self.assertEquals(len(Limited.check._selection.selected), 1)
@@ -0,0 +1,106 @@
+from .guard import TypeOfGuard
+
+
+def has_type_guards(clauses):
+    """Returns a boolean indicating if any clause guards a positional argument with a TypeOfGuard."""
+    return any(type(guard) is TypeOfGuard for clause in clauses for guard in getattr(clause, 'arg_guards', ()))
+
+
+class _Entry(list):
+    """The list of (GuardedFunction, checks) of one signature. at maps the position of each GuardedFunction among the
+    clauses to its pair."""
+    __slots__ = ('at',)
+
+
+class SignatureCache(object):
+    """A polymorphic inline cache keyed on the types of the positional arguments of a call.
+
+    For every type signature seen, the cache works out once which clauses could match at all because each of their
+    positional TypeOfGuard accepts the type of its argument. The remaining Guards of those clauses, the checks, are
+    all that is left to validate on later calls with the same signature. Clauses without Guards to inspect are kept
+    with no checks and are to be validated in full.
+
+    A check made by more than one clause of a signature, the same Guard at the same position as happens once Guards are
+    interned, is one and the same tuple and is kept in shared. A shared check which fails need not be made again for
+    the same call.
+
+    The clauses must be those a ClauseIndex, if there is one, was built over, so that lookup can be limited to the
+    candidates it narrows the call down to.
+
+    Only calls without key-word arguments are handled. Signatures whose arguments disguise their class are never
+    cached since isinstance would not agree with the type of the argument.
+
+    :param clauses: The ordered collection of GuardedFunction
+    :param maxsize: The maximum number of signatures kept. The cache is emptied when full.
+    """
+
+    def __init__(self, clauses, maxsize=256):
+        self.clauses = tuple(clauses)
+        self.maxsize = maxsize
+        self.entries = {}
+        self.shared = set()
+
+    def __str__(self):
+        return self.__print__(str)
+
+    def __repr__(self):
+        return self.__print__(repr)
+
+    def __print__(self, f):
+        return 'SignatureCache(clauses=' + f(len(self.clauses)) + ', signatures=' + f(len(self.entries)) + ')'
+
+    def lookup(self, args, members=None):
+        """Returns the list of (GuardedFunction, checks) which could match the arguments, in order of declaration, or None
+        if the signature of the arguments can not be cached. The checks are None for a GuardedFunction which must be
+        validated in full, otherwise a tuple of (argument position, Guard) pairs.
+
+        :param args: The positional arguments of the call
+        :param members: The set of positions among the clauses of those left to consider, as given by
+        ClauseIndex.narrow, defaults to None for all of them
+        """
+        types = tuple(map(type, args))
+        entry = self.entries.get(types)
+        if entry is None:
+            if any(arg.__class__ is not arg_type for arg, arg_type in zip(args, types)):
+                return None
+            if len(self.entries) >= self.maxsize:
+                self.entries = {}
+                self.shared = set()
+            entry = self.entries[types] = self._build(types)
+
+        if members is None:
+            return entry
+        at = entry.at
+        return [at[i] for i in sorted(members) if i in at]
+
+    def _build(self, types):
+        entry = _Entry()
+        entry.at = {}
+        made = {}
+        for i, clause in enumerate(self.clauses):
+            if not hasattr(clause, 'arg_guards'):
+                entry.append((clause, None))
+                entry.at[i] = entry[-1]
+                continue
+
+            checks = []
+            for pos, guard in enumerate(clause.arg_guards[:len(types)]):
+                if type(guard) is TypeOfGuard:
+                    try:
+                        if issubclass(types[pos], guard.obj_type):
+                            continue
+                        break
+                    except TypeError:
+                        pass
+                check = (pos, guard)
+                if check in made:
+                    check = made[check]
+                    self.shared.add(check)
+                else:
+                    made[check] = check
+                checks.append(check)
+            else:
+                entry.append((clause, tuple(checks)))
+                entry.at[i] = entry[-1]
+
+        return entry
@@ -0,0 +1,122 @@
+from unittest import TestCase
+from quilt.guard import *
+from quilt.signature import SignatureCache, has_type_guards
+from quilt.proxy import defpattern, pattern
+from quilt.exc import MatchError
+
+
+class _Clause(object):
+    def __init__(self, *arg_guards):
+        self.arg_guards = list(arg_guards)
+        self.kwarg_guards = {}
+
+
+class _Spoof(object):
+    @property
+    def __class__(self):
+        return int
+
+
+class TestSignatureCache(TestCase):
+    def test_has_type_guards(self):
+        self.assertTrue(has_type_guards([_Clause(lt(0)), _Clause(type_of(int))]))
+        self.assertFalse(has_type_guards([_Clause(lt(0)), _Clause(not_none())]))
+
+    def test_narrowed(self):
+        clauses = [_Clause(type_of(str)), _Clause(type_of(int), lt(0)), _Clause(type_of(object))]
+        cache = SignatureCache(clauses)
+
+        self.assertEquals(cache.lookup((1, 2)), [(clauses[1], ((1, clauses[1].arg_guards[1]),)), (clauses[2], ())])
+        self.assertEquals(cache.lookup(('a', 2)), [(clauses[0], ()), (clauses[2], ())])
+
+    def test_subclass(self):
+        clauses = [_Clause(type_of(int))]
+        cache = SignatureCache(clauses)
+
+        self.assertEquals(cache.lookup((True,)), [(clauses[0], ())])
+
+    def test_reused(self):
+        cache = SignatureCache([_Clause(type_of(int))])
+
+        self.assertIs(cache.lookup((1,)), cache.lookup((2,)))
+
+    def test_spoofed_class(self):
+        cache = SignatureCache([_Clause(type_of(int))])
+
+        self.assertIsNone(cache.lookup((_Spoof(),)))
+
+    def test_bounded(self):
+        cache = SignatureCache([_Clause(type_of(int))], maxsize=2)
+        cache.lookup((1,))
+        cache.lookup(('a',))
+        cache.lookup((1.0,))
+
+        self.assertEquals(len(cache.entries), 1)
+
+
+    def test_members(self):
+        clauses = [_Clause(type_of(int), lt(0)), _Clause(type_of(str)), _Clause(not_none())]
+        cache = SignatureCache(clauses)
+
+        self.assertEquals(cache.lookup((1,), {2}), [(clauses[2], ((0, clauses[2].arg_guards[0]),))])
+        self.assertEquals(cache.lookup((1,), {1}), [])
+        self.assertEquals(cache.lookup((1,), set()), [])
+
+
+class TestTypeDispatch(TestCase):
+    def test_def(self):
+        @defpattern(type_of(int), type_of(int))
+        def add(x, y):
+            return 'ints'
+
+        @add.pattern(type_of(str), lt('m'))
+        def add(x, y):
+            return 'early string'
+
+        @add.pattern(type_of(str))
+        def add(x, y):
+            return 'string'
+
+        self.assertEquals(add(1, 2), 'ints')
+        self.assertEquals(add('a', 'b'), 'early string')
+        self.assertEquals(add('a', 'x'), 'string')
+        self.assertEquals(add('a', y='b'), 'early string')
+        self.assertRaises(MatchError, lambda: add(1, 'a'))
+
+    def test_indexed(self):
+        @defpattern(0)
+        def f(x):
+            return 0
+
+        for i in range(1, 50):
+            f.pattern(i)(lambda x, i=i: i)
+
+        @f.pattern(type_of(str))
+        def f(x):
+            return 'string'
+
+        self.assertEquals(f.signature_candidates((49,)), [(f.proxy_cache[49], ((0, f.proxy_cache[49].arg_guards[0]),))])
+        self.assertEquals(f(49), 49)
+        self.assertEquals(f('a'), 'string')
+        self.assertRaises(MatchError, lambda: f(50))
+
+    def test_member(self):
+        class Bar(object):
+            def __init__(self, limit):
+                self.limit = limit
+
+            @pattern(type_of(int))
+            def that(self, x, y):
+                return 'int'
+
+            @that.y
+            def small(self, value):
+                return value < self.limit
+
+            @that.pattern(type_of(float))
+            def that(self, x, y):
+                return 'float'
+
+        self.assertEquals(Bar(5).that(1, 1), 'int')
+        self.assertEquals(Bar(5).that(1.0, 1), 'float')
+        self.assertRaises(MatchError, lambda: Bar(0).that(1, 1))
@@ -0,0 +1,208 @@
+import json
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+from .ordering import clause_key, profile_key
+
+
+BUCKETS = (0.000001, 0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0)
+
+
+def _label(clause):
+    """Names a clause after its function and the line it is declared on."""
+    name = getattr(clause, '__qualname__', None) or getattr(clause, '__name__', None) or type(clause).__name__
+    line = clause_key(clause)
+
+    return name if line is None else name + ':' + line
+
+
+def _unique_guards(clause):
+    """Returns the Guards of a clause in order of its arguments, each Guard only once."""
+    seen = set()
+    guards = []
+    for guard in clause.guards if hasattr(clause, 'arg_guards') else ():
+        if id(guard) not in seen:
+            seen.add(id(guard))
+            guards.append(guard)
+    return guards
+
+
+def _ratio(part, whole):
+    return float(part) / whole if whole else 0.0
+
+
+class DispatchStats(object):
+    """Counts how the calls to a proxy are dispatched: how often each clause is tried and wins, how often each Guard is
+    evaluated and passes and how long it takes, how many calls match nothing and a histogram of dispatch latencies.
+
+    While collecting, calls are dispatched by validating the Guards of every candidate clause one by one, bypassing the
+    SelectionCache, the SignatureCache and any executor so that every Guard is counted and timed. Counts of one call
+    are gathered locally and added to the totals under a lock once the call is dispatched.
+
+    DispatchStats should not be constructed on its own, see _Proxy.collect_stats.
+
+    :param buckets: The upper bounds, in seconds, of the buckets of the latency histogram
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = Lock()
+        self.reset()
+
+    def __str__(self):
+        return self.__print__(str)
+
+    def __repr__(self):
+        return self.__print__(repr)
+
+    def __print__(self, f):
+        return 'DispatchStats(calls=' + f(self.calls) + ', misses=' + f(self.misses) + ')'
+
+    def reset(self):
+        """Sets every count back to zero."""
+        with self._lock:
+            self.calls = 0
+            self.misses = 0
+            self.seconds = 0.0
+            self.latencies = [0] * (len(self.buckets) + 1)
+            self.clauses = {}
+            self.guards = {}
+
+    def match(self, proxy, args, kwargs, instance=None, owner=None):
+        """Returns the first GuardedFunction of the proxy which validates the arguments, or None, counting everything
+        along the way."""
+        bound = instance is not None or owner is not None
+        tried = []
+        evaluated = []
+        matched = None
+        start = perf_counter()
+        for clause in proxy.candidates(args, kwargs):
+            tried.append(clause)
+            if self._validate(clause, args, kwargs, instance, owner, bound, evaluated):
+                matched = clause
+                break
+        elapsed = perf_counter() - start
+
+        with self._lock:
+            self.calls += 1
+            self.seconds += elapsed
+            self.latencies[bisect_left(self.buckets, elapsed)] += 1
+            if matched is None:
+                self.misses += 1
+            for clause in tried:
+                counts = self.clauses.setdefault(clause, [0, 0])
+                counts[0] += 1
+                if clause is matched:
+                    counts[1] += 1
+            for key, passed, seconds in evaluated:
+                counts = self.guards.setdefault(key, [0, 0, 0.0])
+                counts[0] += 1
+                counts[1] += passed
+                counts[2] += seconds
+
+        return matched
+
+    def _validate(self, clause, args, kwargs, instance, owner, bound, evaluated):
+        if not hasattr(clause, 'arg_guards'):
+            if bound:
+                return bool(clause.validate_instance(instance, owner, *args, **kwargs))
+            return bool(clause.validate(*args, **kwargs))
+
+        for value, guard in clause.guard_pairs(args, kwargs):
+            start = perf_counter()
+            passed = bool(guard.validate_instance(value, instance, owner) if bound else guard.validate(value))
+            evaluated.append(((clause, id(guard)), passed, perf_counter() - start))
+            if not passed:
+                return False
+        return True
+
+    def snapshot(self, proxy):
+        """Returns a dict of plain values, suitable for JSON, holding the counts so far for the clauses of the proxy.
+
+        The clauses are listed in the order they are tried, each with its attempts, wins and failures, a failure being
+        an attempt rejected by one of its Guards. The Guards of each clause follow in order of its arguments with their
+        evaluations, passes, pass rate and cumulative seconds. Latency buckets are cumulative, as in Prometheus.
+        """
+        with self._lock:
+            clauses = dict((clause, list(counts)) for clause, counts in self.clauses.items())
+            guards = dict((key, list(counts)) for key, counts in self.guards.items())
+            calls, misses, seconds, latencies = self.calls, self.misses, self.seconds, list(self.latencies)
+
+        clause_stats = []
+        guard_stats = []
+        for clause in proxy.proxy_cache:
+            attempts, wins = clauses.get(clause, (0, 0))
+            label = _label(clause)
+            clause_stats.append({'clause': label, 'attempts': attempts, 'wins': wins, 'failures': attempts - wins})
+            for guard in _unique_guards(clause):
+                evaluations, passes, guard_seconds = guards.get((clause, id(guard)), (0, 0, 0.0))
+                guard_stats.append({'clause': label, 'argument': guard.arg_name, 'guard': str(guard),
+                                    'evaluations': evaluations, 'passes': passes,
+                                    'pass_rate': _ratio(passes, evaluations), 'seconds': guard_seconds})
+
+        cumulative = []
+        total = 0
+        for count in latencies[:-1]:
+            total += count
+            cumulative.append(total)
+
+        return {'dispatcher': profile_key(proxy), 'calls': calls, 'misses': misses,
+                'miss_rate': _ratio(misses, calls), 'seconds': seconds,
+                'latency': {'buckets': list(self.buckets), 'counts': cumulative},
+                'clauses': clause_stats, 'guards': guard_stats}
+
+
+def to_json(stats, **kwargs):
+    """Returns the snapshot returned by stats() as a JSON string. Keyword arguments are passed on to json.dumps."""
+    return json.dumps(stats, **kwargs)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _sample(name, labels, value):
+    return name + '{' + ','.join(key + '="' + _escape(label) + '"' for key, label in labels) + '} ' + repr(value)
+
+
+def to_prometheus(stats, prefix='quilt'):
+    """Returns the snapshot returned by stats() in the Prometheus text exposition format.
+
+    :param stats: A snapshot returned by stats()
+    :param prefix: The prefix of every metric name
+    """
+    dispatcher = (('dispatcher', stats['dispatcher'] or ''),)
+    lines = []
+
+    def metric(name, kind, text, samples):
+        lines.append('# HELP ' + prefix + name + ' ' + text)
+        lines.append('# TYPE ' + prefix + name + ' ' + kind)
+        lines.extend(_sample(prefix + sample, labels, value) for sample, labels, value in samples)
+
+    metric('_dispatch_calls_total', 'counter', 'Calls dispatched.',
+           [('_dispatch_calls_total', dispatcher, stats['calls'])])
+    metric('_dispatch_misses_total', 'counter', 'Calls matching no clause.',
+           [('_dispatch_misses_total', dispatcher, stats['misses'])])
+
+    latency = stats['latency']
+    buckets = [('_dispatch_seconds_bucket', dispatcher + (('le', repr(bound)),), count)
+               for bound, count in zip(latency['buckets'], latency['counts'])]
+    buckets.append(('_dispatch_seconds_bucket', dispatcher + (('le', '+Inf'),), stats['calls']))
+    buckets.append(('_dispatch_seconds_sum', dispatcher, stats['seconds']))
+    buckets.append(('_dispatch_seconds_count', dispatcher, stats['calls']))
+    metric('_dispatch_seconds', 'histogram', 'Time spent selecting a clause.', buckets)
+
+    for field, text in [('attempts', 'Times a clause was tried.'), ('wins', 'Times a clause matched.'),
+                        ('failures', 'Times a clause was rejected by a Guard.')]:
+        metric('_clause_' + field + '_total', 'counter', text,
+               [('_clause_' + field + '_total', dispatcher + (('clause', clause['clause']),), clause[field])
+                for clause in stats['clauses']])
+
+    for field, text in [('evaluations', 'Times a Guard was evaluated.'), ('passes', 'Times a Guard passed.'),
+                        ('seconds', 'Time spent evaluating a Guard.')]:
+        name = '_guard_' + field + '_total'
+        metric(name, 'counter', text,
+               [(name, dispatcher + (('clause', guard['clause']), ('argument', guard['argument'])), guard[field])
+                for guard in stats['guards']])
+
+    return '\n'.join(lines) + '\n'
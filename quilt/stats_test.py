@@ -0,0 +1,112 @@
+import json
+from unittest import TestCase
+from quilt.proxy import defpattern, pattern
+from quilt.stats import to_json, to_prometheus
+from quilt.exc import MatchError
+
+
+class TestStats(TestCase):
+    def setUp(self):
+        @defpattern()
+        def foo(x):
+            return 'negative'
+
+        @foo.x
+        def negative(value):
+            return value < 0
+
+        @foo.pattern()
+        def foo(x, y):
+            return 'one'
+
+        @foo.y
+        def one(value):
+            return value == 1
+
+        @foo.pattern()
+        def foo(x, y):
+            return 'small'
+
+        @foo.x
+        def small(value):
+            return value < 100
+
+        self.foo = foo.collect_stats()
+
+    def test_off(self):
+        self.foo.collect_stats(False)
+        self.foo(-1)
+
+        self.assertEquals(self.foo.stats(), None)
+
+    def test_clauses(self):
+        for args in [(-1,), (1, 1), (1, 2), (2, 2)]:
+            self.foo(*args)
+        self.assertRaises(MatchError, lambda: self.foo(200, 2))
+        stats = self.foo.stats()
+
+        self.assertEquals((stats['calls'], stats['misses'], stats['miss_rate']), (5, 1, 0.2))
+        self.assertEquals([(clause['attempts'], clause['wins'], clause['failures']) for clause in stats['clauses']],
+                          [(5, 1, 4), (4, 1, 3), (3, 2, 1)])
+        self.assertEquals(stats['latency']['counts'][-1], 5)
+
+    def test_guards(self):
+        self.foo(1, 1)
+        self.foo(1, 2)
+        self.assertRaises(MatchError, lambda: self.foo(200, 2))
+        guards = self.foo.stats()['guards']
+
+        self.assertEquals([(guard['argument'], guard['evaluations'], guard['passes']) for guard in guards],
+                          [('x', 3, 0), ('x', 3, 3), ('y', 3, 1), ('x', 2, 1), ('y', 1, 1)])
+        self.assertEquals(guards[3]['pass_rate'], 0.5)
+        self.assertTrue(all(guard['seconds'] >= 0 for guard in guards))
+
+    def test_reset(self):
+        self.foo(-1)
+        self.assertEquals(self.foo.stats(reset=True)['calls'], 1)
+        self.assertEquals(self.foo.stats()['calls'], 0)
+
+    def test_export(self):
+        self.foo(-1)
+        stats = self.foo.stats()
+
+        self.assertEquals(json.loads(to_json(stats)), stats)
+        text = to_prometheus(stats)
+        self.assertTrue('# TYPE quilt_dispatch_seconds histogram' in text)
+        self.assertTrue('quilt_dispatch_calls_total{dispatcher="' in text)
+        self.assertTrue('quilt_dispatch_seconds_bucket{dispatcher="' + stats['dispatcher'] + '",le="+Inf"} 1' in text)
+
+    def test_no_clauses(self):
+        for clause in self.foo.proxy_cache:
+            self.foo.unregister(clause)
+        self.assertRaises(MatchError, lambda: self.foo(1))
+        stats = self.foo.stats()
+
+        self.assertIsNone(stats['dispatcher'])
+        self.assertEquals((stats['calls'], stats['misses'], stats['clauses']), (1, 1, []))
+        self.assertTrue('quilt_dispatch_calls_total{dispatcher=""} 1' in to_prometheus(stats))
+
+
+class TestMemberStats(TestCase):
+    def test_bound(self):
+        class Bar(object):
+            def __init__(self, limit):
+                self.limit = limit
+
+            @pattern()
+            def that(self, x):
+                return 'under'
+
+            @that.x
+            def under(self, value):
+                return value < self.limit
+
+            @that.pattern()
+            def that(self, x):
+                return 'over'
+
+        Bar.that.collect_stats()
+        self.assertEquals([Bar(5).that(x) for x in [1, 7]], ['under', 'over'])
+        stats = Bar(5).that.stats()
+        self.assertEquals([clause['wins'] for clause in stats['clauses']], [1, 1])
+        self.assertEquals(stats['guards'][0]['passes'], 1)
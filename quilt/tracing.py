@@ -0,0 +1,131 @@
+from collections import namedtuple
+from itertools import count
+from operator import attrgetter
+from random import random
+from time import perf_counter, time
+
+
+Decision = namedtuple('Decision', ['sequence', 'timestamp', 'args', 'kwargs', 'clause', 'seconds'])
+
+
+class Tracer(object):
+    """Base class of the hooks called while a traced proxy dispatches a call. Every hook does nothing, so that
+    subclasses only define the hooks they need. Any object with the same methods will do.
+
+    Hooks run in the calling thread, in the middle of dispatching, and an exception they raise is raised by the call.
+    """
+
+    def on_dispatch_start(self, proxy, args, kwargs):
+        """Called before any clause is tried."""
+
+    def on_guard(self, proxy, clause, guard, value, passed):
+        """Called after each Guard is evaluated, with the value it was evaluated on and whether it passed."""
+
+    def on_match(self, proxy, clause, args, kwargs, seconds):
+        """Called once the clause to invoke is found, with the time it took to find it."""
+
+    def on_miss(self, proxy, args, kwargs, seconds):
+        """Called when no clause matches, before the MatchError is raised."""
+
+
+class DecisionLog(object):
+    """Ring buffer of the most recent dispatch decisions, for postmortems.
+
+    Appending takes no lock. Every Decision draws the next sequence number from a shared counter and overwrites the
+    slot of that number modulo size, both atomic steps, so that concurrent appends never lose more than the oldest
+    entries. The Decision keep references to the arguments of the calls.
+
+    :param size: The number of decisions kept
+    """
+
+    def __init__(self, size=256):
+        self.size = size
+        self.entries = [None] * size
+        self._sequence = count()
+
+    def __str__(self):
+        return self.__print__(str)
+
+    def __repr__(self):
+        return self.__print__(repr)
+
+    def __print__(self, f):
+        return 'DecisionLog(size=' + f(self.size) + ')'
+
+    def append(self, args, kwargs, clause, seconds):
+        sequence = next(self._sequence)
+        self.entries[sequence % self.size] = Decision(sequence, time(), args, kwargs, clause, seconds)
+
+    def recent(self):
+        """Returns the list of Decision kept, oldest first."""
+        return sorted((entry for entry in list(self.entries) if entry is not None), key=attrgetter('sequence'))
+
+
+class Tracing(object):
+    """Dispatches a sample of the calls to a proxy while calling the hooks of a Tracer and logging every decision.
+
+    Traced calls validate the Guards of every candidate clause one by one, bypassing the SelectionCache, the
+    SignatureCache and any executor, and are not counted by DispatchStats. The other calls dispatch as usual and cost a
+    single random number.
+
+    Tracing should not be constructed on its own, see _Proxy.trace.
+
+    :param tracer: A Tracer, or None to only log decisions
+    :param rate: The fraction of calls traced, between 0 and 1
+    :param history: The number of decisions kept in the DecisionLog, 0 for none
+    """
+
+    def __init__(self, tracer=None, rate=1.0, history=256):
+        self.tracer = tracer if tracer is not None else Tracer()
+        self.rate = rate
+        self.log = DecisionLog(history) if history else None
+
+    def __str__(self):
+        return self.__print__(str)
+
+    def __repr__(self):
+        return self.__print__(repr)
+
+    def __print__(self, f):
+        return 'Tracing(tracer=' + f(self.tracer) + ', rate=' + f(self.rate) + ', log=' + f(self.log) + ')'
+
+    def sampled(self):
+        """Returns a boolean indicating if the next call is traced."""
+        return self.rate >= 1 or random() < self.rate
+
+    def match(self, proxy, args, kwargs, instance=None, owner=None):
+        """Returns the first GuardedFunction of the proxy which validates the arguments, or None, calling the hooks along
+        the way."""
+        tracer = self.tracer
+        tracer.on_dispatch_start(proxy, args, kwargs)
+        bound = instance is not None or owner is not None
+        matched = None
+        start = perf_counter()
+        for clause in proxy.candidates(args, kwargs):
+            if self._validate(proxy, clause, args, kwargs, instance, owner, bound):
+                matched = clause
+                break
+        seconds = perf_counter() - start
+
+        if self.log is not None:
+            self.log.append(args, kwargs, matched, seconds)
+        if matched is None:
+            tracer.on_miss(proxy, args, kwargs, seconds)
+        else:
+            tracer.on_match(proxy, matched, args, kwargs, seconds)
+
+        return matched
+
+    def _validate(self, proxy, clause, args, kwargs, instance, owner, bound):
+        if not hasattr(clause, 'arg_guards'):
+            if bound:
+                return bool(clause.validate_instance(instance, owner, *args, **kwargs))
+            return bool(clause.validate(*args, **kwargs))
+
+        on_guard = self.tracer.on_guard
+        for value, guard in clause.guard_pairs(args, kwargs):
+            passed = bool(guard.validate_instance(value, instance, owner) if bound else guard.validate(value))
+            on_guard(proxy, clause, guard, value, passed)
+            if not passed:
+                return False
+        return True
@@ -0,0 +1,115 @@
+import cProfile
+import pstats
+from threading import Thread
+from unittest import TestCase
+from quilt.proxy import defpattern, pattern
+from quilt.tracing import Tracer, DecisionLog
+from quilt.exc import MatchError
+
+
+class Recorder(Tracer):
+    def __init__(self):
+        self.events = []
+
+    def on_dispatch_start(self, proxy, args, kwargs):
+        self.events.append(('start', args))
+
+    def on_guard(self, proxy, clause, guard, value, passed):
+        self.events.append(('guard', guard.arg_name, value, passed))
+
+    def on_match(self, proxy, clause, args, kwargs, seconds):
+        self.events.append(('match', clause.__name__))
+
+    def on_miss(self, proxy, args, kwargs, seconds):
+        self.events.append(('miss', args))
+
+
+class TestTracing(TestCase):
+    def setUp(self):
+        @defpattern()
+        def foo(x):
+            return 'negative'
+
+        @foo.x
+        def negative(value):
+            return value is not None and value < 0
+
+        @foo.pattern()
+        def foo(x):
+            return 'other'
+
+        @foo.x
+        def other(value):
+            return value is not None
+
+        self.foo = foo
+
+    def test_hooks(self):
+        recorder = Recorder()
+        self.foo.trace(recorder)
+        self.foo(1)
+        self.assertRaises(MatchError, lambda: self.foo(None))
+
+        self.assertEquals(recorder.events, [('start', (1,)), ('guard', 'x', 1, False), ('guard', 'x', 1, True),
+                                            ('match', 'foo'), ('start', (None,)), ('guard', 'x', None, False),
+                                            ('guard', 'x', None, False), ('miss', (None,))])
+
+    def test_sampling(self):
+        recorder = Recorder()
+        self.foo.trace(recorder, rate=0)
+        self.foo(1)
+
+        self.assertEquals(recorder.events, [])
+        self.assertEquals(self.foo.decisions(), [])
+
+    def test_decisions(self):
+        self.foo.trace(history=2)
+        for x in [-1, 1, -2]:
+            self.foo(x)
+        decisions = self.foo.decisions()
+
+        self.assertEquals([(decision.args, decision.clause.underlying_func(0)) for decision in decisions],
+                          [((1,), 'other'), ((-2,), 'negative')])
+        self.assertEquals(self.foo.trace(enabled=False).decisions(), [])
+
+    def test_member(self):
+        class Bar(object):
+            @pattern(0)
+            def that(self, x):
+                return 'zero'
+
+        recorder = Recorder()
+        Bar.that.trace(recorder)
+        self.assertEquals(Bar().that(0), 'zero')
+        self.assertEquals(recorder.events[-1], ('match', 'that'))
+
+    def test_clause_frames(self):
+        profile = cProfile.Profile()
+        profile.runcall(self.foo, 1)
+        names = [name for _, _, name in pstats.Stats(profile).stats]
+
+        self.assertTrue(any(name.endswith('.validate') and 'setUp.<locals>.foo:' in name for name in names))
+
+
+class TestDecisionLog(TestCase):
+    def test_wraps(self):
+        log = DecisionLog(3)
+        for i in range(5):
+            log.append((i,), {}, None, 0.0)
+
+        self.assertEquals([decision.args for decision in log.recent()], [(2,), (3,), (4,)])
+
+    def test_concurrent(self):
+        log = DecisionLog(1000)
+
+        def append():
+            for i in range(100):
+                log.append((i,), {}, None, 0.0)
+
+        threads = [Thread(target=append) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEquals([decision.sequence for decision in log.recent()], list(range(400)))
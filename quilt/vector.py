@@ -0,0 +1,95 @@
+from .exc import MatchError
+
+numpy = None
+
+
+def _import_numpy():
+    """Imports numpy on first use, so that importing Quilt does not."""
+    global numpy
+    if numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError('dispatch_array requires numpy')
+
+
+def _call(func, arrays, rows, columns):
+    """Calls the function once on the selected rows of every array. Falls back to calling it on every row, with plain
+    Python values, if that fails or does not return one result per row."""
+    try:
+        result = numpy.asarray(func(*[array[rows] for array in arrays]))
+        if result.shape == (len(rows),):
+            return result
+    except (TypeError, ValueError):
+        pass
+
+    return numpy.array([func(*[column[row] for column in columns]) for row in rows])
+
+
+def _kind(values):
+    """Returns the kind of the dtype of the array, all numbers being of one kind since NumPy promotes them safely.
+    Booleans are a kind of their own, so that True is not turned into 1 alongside numbers."""
+    kind = values.dtype.kind
+    return 'number' if kind in 'iufc' else kind
+
+
+def dispatch_array(clauses, arrays, fallback=None):
+    """Dispatches every row of the one dimensional arrays, row i being the positional arguments (a[i] for a in arrays),
+    to the first GuardedFunction whose Guards accept it and returns the array of results in row order.
+
+    Each Guard validates all of the rows still unassigned at once through Guard.validate_many, which masks the whole
+    array with NumPy where it can and otherwise validates its NumPy scalars. Objects without Guards are validated row
+    by row, also with NumPy scalars, just as calling the DefProxy on each row would. Each function is then called once
+    with the sub-arrays of the rows assigned to it. Rows no GuardedFunction accepts go to the fallback, or raise a
+    MatchError for the first of them if there is none.
+
+    Numbers are promoted to one dtype, as are results of any other one kind. Results of different kinds, such as
+    strings from one function and numbers from another or booleans and numbers, are kept as the plain Python values in
+    an array of objects.
+
+    :param clauses: The ordered collection of GuardedFunction
+    :param arrays: A sequence of array-like, all of the same length
+    :param fallback: The function called with the rows no GuardedFunction accepts, defaults to None
+    """
+    _import_numpy()
+    arrays = [numpy.asarray(array) for array in arrays]
+    if not arrays or any(array.ndim != 1 for array in arrays) or len(set(map(len, arrays))) != 1:
+        raise ValueError('dispatch_array requires one or more one dimensional arrays of the same length')
+
+    columns = [array.tolist() for array in arrays]
+    remaining = numpy.ones(len(arrays[0]), dtype=bool)
+    pieces = []
+    for clause in clauses:
+        rows = numpy.flatnonzero(remaining)
+        if not len(rows):
+            break
+        if hasattr(clause, 'arg_guards'):
+            for array, guard in zip(arrays, clause.arg_guards):
+                rows = rows[guard.validate_many(array[rows])]
+        else:
+            rows = rows[[bool(clause.validate(*[array[row] for array in arrays])) for row in rows]]
+        if len(rows):
+            remaining[rows] = False
+            pieces.append((rows, _call(clause.underlying_func, arrays, rows, columns)))
+
+    if remaining.any():
+        rows = numpy.flatnonzero(remaining)
+        if fallback is None:
+            raise MatchError(*[column[rows[0]] for column in columns])
+        pieces.append((rows, _call(fallback, arrays, rows, columns)))
+
+    if not pieces:
+        return numpy.array([])
+
+    if len(set(_kind(values) for _, values in pieces)) > 1:
+        result = numpy.empty(len(remaining), dtype=object)
+        for rows, values in pieces:
+            for row, value in zip(rows.tolist(), values.tolist()):
+                result[row] = value
+        return result
+
+    result = numpy.empty(len(remaining), dtype=numpy.result_type(*[values for _, values in pieces]))
+    for rows, values in pieces:
+        result[rows] = values
+
+    return result
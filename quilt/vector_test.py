@@ -0,0 +1,103 @@
+from unittest import TestCase, skipIf
+from quilt.guard import *
+from quilt.proxy import defpattern
+from quilt.vector import dispatch_array
+from quilt.exc import MatchError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@skipIf(numpy is None, 'requires numpy')
+class TestDispatchArray(TestCase):
+    def setUp(self):
+        @defpattern(lt(0))
+        def sign(x, y):
+            return -x * y
+
+        @sign.pattern(one_of(0, 1))
+        def sign(x, y):
+            return 0 * y
+
+        @sign.pattern(type_of(numpy.integer))
+        def sign(x, y):
+            return x if x < 10 else y
+
+        self.sign = sign
+
+    def tearDown(self):
+        self.sign = None
+
+    def test_dispatch(self):
+        result = self.sign.dispatch_array(numpy.array([-2, 0, 5, 1, 20]), numpy.array([3, 3, 3, 3, 3]))
+        self.assertEquals(result.tolist(), [6, 0, 5, 0, 3])
+
+    def test_miss(self):
+        self.assertRaises(MatchError, lambda: self.sign.dispatch_array(numpy.array([1.0, 2.5]), numpy.array([1, 1])))
+
+    def test_fallback(self):
+        @self.sign.fallback
+        def sign(x, y):
+            return x + y
+
+        result = sign.dispatch_array(numpy.array([1.0, 2.5, -1.0]), numpy.array([1, 1, 1]))
+        self.assertEquals(result.tolist(), [0.0, 3.5, 1.0])
+
+    def test_mixed_results(self):
+        @defpattern(lt(0))
+        def describe(x):
+            return 'negative'
+
+        @describe.pattern(gte(0))
+        def describe(x):
+            return 0
+
+        result = describe.dispatch_array(numpy.array([-1, 2]))
+        self.assertEquals(result.tolist(), ['negative', 0])
+        self.assertEquals([type(value) for value in result], [str, int])
+        self.assertEquals(result.tolist(), [describe(-1), describe(2)])
+
+    def test_booleans_and_numbers(self):
+        @defpattern(lt(0))
+        def flag(x):
+            return x < -5
+
+        @flag.pattern(gte(0))
+        def flag(x):
+            return 0
+
+        result = flag.dispatch_array(numpy.array([-9, -1, 2]))
+        self.assertEquals([type(value) for value in result], [bool, bool, int])
+        self.assertEquals(result.tolist(), [True, False, 0])
+        self.assertEquals(flag.dispatch_array(numpy.array([-9, -1])).dtype, numpy.dtype(bool))
+
+    def test_scalars_validated(self):
+        seen = []
+
+        class Duck(object):
+            def __init__(self):
+                self.underlying_func = lambda x: x
+
+            def validate(self, x):
+                seen.append(type(x))
+                return True
+
+        @defpattern(has_attribute('dtype'))
+        def scalar(x):
+            return 1
+
+        @scalar.pattern(not_none())
+        def scalar(x):
+            return 2
+
+        self.assertEquals(scalar.dispatch_array(numpy.array([1, 2])).tolist(), [1, 1])
+        self.assertEquals(dispatch_array([Duck()], [numpy.array([1])]).tolist(), [1])
+        self.assertEquals(seen, [numpy.int64])
+
+    def test_empty(self):
+        self.assertEquals(self.sign.dispatch_array([], []).tolist(), [])
+
+    def test_lengths(self):
+        self.assertRaises(ValueError, lambda: self.sign.dispatch_array([1, 2], [1]))